@@ -19,7 +19,7 @@ def get_signature_args(fd):
     """
     Extract signature arguments from function definition
     """
-    return set([a.arg for a in fd.args.args if a.arg != "self"])
+    return set([a.arg for a in fd.args.args if a.arg not in ("self", "cls")])
 
 
 def check_args(doc_args, sig_args, file_name, func_name, class_name=None):
@@ -20,8 +20,9 @@ from .scraamp import scraamp, prescraamp  # noqa: F401
 from .stumpi import stumpi  # noqa: F401
 from .mpdist import mpdist, mpdisted  # noqa: F401
 from .aampdist import aampdist, aampdisted  # noqa: F401
-from .motifs import motifs, match  # noqa: F401
-from .aamp_motifs import aamp_motifs, aamp_match  # noqa: F401
+from .motifs import motifs, match, match_many  # noqa: F401
+from .aamp_motifs import aamp_motifs, aamp_match, aamp_match_many  # noqa: F401
+from .search_index import search_index  # noqa: F401
 from .mmotifs import mmotifs  # noqa: F401
 from .aamp_mmotifs import aamp_mmotifs  # noqa: F401
 from .snippets import snippets  # noqa: F401
@@ -311,6 +311,7 @@ def aamp_match(
     atol=1e-8,
     query_idx=None,
     p=2.0,
+    early_abandon=False,
 ):
     """
     Find all matches of a query `Q` in a time series `T`, i.e. the indices
@@ -360,6 +361,16 @@ def aamp_match(
     p : float, default 2.0
         The p-norm to apply for computing the Minkowski distance.
 
+    early_abandon : bool, default False
+        By default, the full distance profile is computed. When set to `True`, the
+        distances are instead computed by scanning `T` directly and any subsequence
+        is abandoned as soon as a lower bound of its distance to `Q` exceeds
+        `max_distance`. If `None`, then the faster option is automatically chosen
+        based on the length of `T`, the length of `Q`, and `max_distance`. Early
+        abandoning is only supported when `max_distance` is a float and `Q` is
+        1-dimensional, and a `ValueError` is raised if it is explicitly requested
+        otherwise. Both options return the same matches.
+
     Returns
     -------
     out : numpy.ndarray
@@ -384,12 +395,33 @@ def aamp_match(
     if len(T_subseq_isfinite.shape) == 1:
         T_subseq_isfinite = T_subseq_isfinite[np.newaxis, :]
 
+    if not isinstance(max_distance, float) or d > 1:
+        if early_abandon:
+            raise ValueError(
+                "`early_abandon=True` requires `max_distance` to be a float and `Q` "
+                "to be 1-dimensional. Set `early_abandon=False` instead."
+            )
+        early_abandon = False
+    if early_abandon is None:
+        # Estimate the typical contribution of a single value to the distance
+        T_finite = T[0][np.isfinite(T[0])]
+        T_mean = np.mean(T_finite) if T_finite.shape[0] > 0 else 0.0
+        term = np.mean(np.power(np.abs(Q[0] - T_mean), p))
+        early_abandon = term > 0.0 and core._is_early_abandon_faster(
+            n, m, np.power(max_distance + atol, p) / term
+        )
+
     D = np.empty((d, n - m + 1))
-    for i in range(d):
-        D[i, :] = core.mass_absolute(Q[i], T[i], T_subseq_isfinite[i], p=p)
+    if early_abandon:
+        D[0, :] = core._mass_absolute_early_abandon(
+            Q[0], T[0], T_subseq_isfinite[0], max_distance + atol, p
+        )
+    else:
+        for i in range(d):
+            D[i, :] = core.mass_absolute(Q[i], T[i], T_subseq_isfinite[i], p=p)
     D = np.mean(D, axis=0)
 
-    return core._find_matches(
+    distances, indices = core._find_matches(
         D,
         excl_zone,
         max_distance=max_distance,
@@ -397,3 +429,85 @@ def aamp_match(
         query_idx=query_idx,
         atol=atol,
     )
+
+    return core._matches_to_array(distances, indices)
+
+
+def aamp_match_many(
+    Q,
+    Ts,
+    max_distance=None,
+    max_matches=None,
+    atol=1e-8,
+    p=2.0,
+):
+    """
+    Find all matches of a query `Q` across a collection of time series, `Ts`, i.e.
+    the subsequences whose distances to `Q` are less or equal to `max_distance`,
+    sorted by distance (lowest to highest).
+
+    Within each time series, an exclusion zone is applied around each occurrence
+    before searching for the next.
+
+    Parameters
+    ----------
+    Q : numpy.ndarray
+        The query sequence. It doesn't have to be a subsequence of any time series
+
+    Ts : list
+        A list of 1-dimensional time series of interest. The time series may have
+        different lengths.
+
+    max_distance : float or function, default None
+        Maximum distance between `Q` and a subsequence `S` for `S` to be considered a
+        match. If a function, then it has to be a function of one argument `D`, which
+        will be the distance profile of `Q` with all of the concatenated time series
+        (where subsequences that straddle two time series have a distance of
+        `np.inf`). If None, defaults to
+        `np.nanmax([np.nanmean(D) - 2 * np.nanstd(D), np.nanmin(D)])` (i.e. at
+        least the closest match will be returned).
+
+    max_matches : int, default None
+        The maximum amount of similar occurrences to be returned across all of the
+        time series. The resulting occurrences are sorted by distance, so a value of
+        `10` means that the `10` most similar subsequences are returned. If `None`,
+        then all occurrences are returned.
+
+    atol : float, default 1e-8
+        The absolute tolerance parameter. This value will be added to `max_distance`
+        when comparing distances between subsequences.
+
+    p : float, default 2.0
+        The p-norm to apply for computing the Minkowski distance.
+
+    Returns
+    -------
+    out : numpy.ndarray
+        The first column consists of distances of subsequences whose distances to `Q`
+        are less than or equal to `max_distance`, sorted by distance (lowest to
+        highest). The second column consists of the corresponding indices in `Ts`
+        (i.e., which time series) and the third column consists of the corresponding
+        start indices within that time series.
+    """
+    Q = core._preprocess(Q)
+    if np.any(np.isnan(Q)) or np.any(np.isinf(Q)):  # pragma: no cover
+        raise ValueError("Q contains illegal values (NaN or inf)")
+
+    m = Q.shape[0]
+    excl_zone = int(np.ceil(m / config.STUMPY_EXCL_ZONE_DENOM))
+
+    T, T_starts, T_subseq_isvalid = core._concatenate_series(Ts, m)
+    T, T_subseq_isfinite, _ = core.preprocess_non_normalized(T, m)
+
+    D = core.mass_absolute(Q, T, T_subseq_isfinite & T_subseq_isvalid, p=p)
+
+    distances, series_indices, indices = core._find_series_matches(
+        D,
+        excl_zone,
+        T_starts,
+        max_distance=max_distance,
+        max_matches=max_matches,
+        atol=atol,
+    )
+
+    return core._matches_to_array(distances, series_indices, indices)
@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from . import core, aamp, aamped
+from . import core, aamp
 
 
 def _aamp_across_series_nearest_neighbors(
@@ -129,6 +129,97 @@ def _get_aamp_central_motif(
     return bsf_radius, bsf_Ts_idx, bsf_subseq_idx
 
 
+def _aamp_ostinato_series(
+    Ts,
+    j,
+    P,
+    m,
+    Ts_subseq_isfinite,
+    p=2.0,
+    bsf_radius=np.inf,
+    share_bsf_radius=None,
+):
+    """
+    Find the subsequence in `Ts[j]` with the smallest non-normalized (i.e., without
+    z-normalization) radius that is below the best-so-far radius
+
+    Parameters
+    ----------
+    Ts : list
+        A list of time series for which to find the consensus motif
+
+    j : int
+        The index of the time series in `Ts` whose subsequences are the candidates
+
+    P : numpy.ndarray
+        The (AB-join) matrix profile of `Ts[j]` with respect to the next time series
+        in `Ts` (i.e., `Ts[(j + 1) % len(Ts)]`)
+
+    m : int
+        Window size
+
+    Ts_subseq_isfinite : list
+        A list of rolling window `T_subseq_isfinite` for each time series in `Ts`
+
+    p : float, default 2.0
+        The p-norm to apply for computing the Minkowski distance.
+
+    bsf_radius : float, default np.inf
+        The best-so-far radius. Only candidates with a smaller radius are returned.
+
+    share_bsf_radius : function, default None
+        A function (e.g., `core._shared_bsf_radius`) that is called with the
+        best-so-far radius before each candidate is evaluated and that returns a
+        best-so-far radius that is shared with other (concurrent) searches. Candidates
+        with a radius greater than the shared radius are pruned.
+
+    Returns
+    -------
+    bsf_radius : float
+        The updated best-so-far radius
+
+    bsf_subseq_idx : int
+        The subsequence index in `Ts[j]` that has radius `bsf_radius`. This is `-1`
+        when no candidate has a radius below the (initial) best-so-far radius.
+    """
+    bsf_subseq_idx = -1
+
+    k = len(Ts)
+    if j < (k - 1):
+        h = j + 1
+    else:
+        h = 0
+
+    si = np.argsort(P)
+    for q in si:
+        max_radius = bsf_radius
+        if share_bsf_radius is not None:
+            # Ties with the shared radius are kept so that the first of the smallest
+            # radii is found regardless of which search found the shared radius
+            max_radius = min(
+                max_radius, np.nextafter(share_bsf_radius(bsf_radius), np.inf)
+            )
+        Q = Ts[j][q : q + m]
+        radius = P[q]
+        if radius >= max_radius:
+            break
+        for i in range(k):
+            if i != j and i != h:
+                if np.any(~np.isfinite(Q)):  # pragma: no cover
+                    distance_profile = np.full(Ts[i].shape[0] - m + 1, np.inf)
+                else:
+                    distance_profile = core.mass_absolute(
+                        Q, Ts[i], Ts_subseq_isfinite[i], p=p
+                    )
+                radius = np.max((radius, np.min(distance_profile)))
+                if radius >= max_radius:
+                    break
+        if radius < max_radius:
+            bsf_radius, bsf_subseq_idx = radius, q
+
+    return bsf_radius, bsf_subseq_idx
+
+
 def _aamp_ostinato(
     Ts,
     m,
@@ -217,25 +308,181 @@ def _aamp_ostinato(
             h = 0
 
         mp = partial_mp_func(Ts[j], m, Ts[h], ignore_trivial=False, p=p)
-        si = np.argsort(mp[:, 0])
-        for q in si:
-            Q = Ts[j][q : q + m]
-            radius = mp[q, 0]
-            if radius >= bsf_radius:
-                break
-            for i in range(k):
-                if i != j and i != h:
-                    if np.any(~np.isfinite(Q)):  # pragma: no cover
-                        distance_profile = np.full(Ts[i].shape[0] - m + 1, np.inf)
-                    else:
-                        distance_profile = core.mass_absolute(
-                            Q, Ts[i], Ts_subseq_isfinite[i], p=p
-                        )
-                    radius = np.max((radius, np.min(distance_profile)))
-                    if radius >= bsf_radius:
-                        break
-            if radius < bsf_radius:
-                bsf_radius, bsf_Ts_idx, bsf_subseq_idx = radius, j, q
+        radius, subseq_idx = _aamp_ostinato_series(
+            Ts,
+            j,
+            mp[:, 0].astype(np.float64),
+            m,
+            Ts_subseq_isfinite,
+            p=p,
+            bsf_radius=bsf_radius,
+        )
+        if radius < bsf_radius:
+            bsf_radius, bsf_Ts_idx, bsf_subseq_idx = radius, j, subseq_idx
+
+    return bsf_radius, bsf_Ts_idx, bsf_subseq_idx
+
+
+def _aamp_ostinato_series_range(
+    Ts, m, Ts_subseq_isfinite, p, start, stop, bsf_radius_name
+):
+    """
+    Find the non-normalized (i.e., without z-normalization) consensus motif candidate
+    with the smallest radius amongst the time series `Ts[start : stop]` while sharing
+    the best-so-far radius with the rest of the Dask cluster
+
+    Parameters
+    ----------
+    Ts : list
+        A list of time series for which to find the consensus motif
+
+    m : int
+        Window size
+
+    Ts_subseq_isfinite : list
+        A list of rolling window `T_subseq_isfinite` for each time series in `Ts`
+
+    p : float
+        The p-norm to apply for computing the Minkowski distance.
+
+    start : int
+        The index of the first time series in `Ts` to search for candidates
+
+    stop : int
+        The (exclusive) index of the last time series in `Ts` to search for candidates
+
+    bsf_radius_name : str
+        The name of the Dask `Variable` that holds the cluster-wide best-so-far radius
+
+    Returns
+    -------
+    bsf_radius : float
+        The best-so-far radius found in `Ts[start : stop]`. This is `np.inf` when no
+        candidate beats the cluster-wide best-so-far radius.
+
+    bsf_Ts_idx : int
+        The time series index in `Ts` which contains the candidate
+
+    bsf_subseq_idx : int
+        The subsequence index within time series `Ts[bsf_Ts_idx]` the contains the
+        candidate
+    """
+    bsf_radius = np.inf
+    bsf_Ts_idx = 0
+    bsf_subseq_idx = 0
+
+    share_bsf_radius = core._shared_bsf_radius(bsf_radius_name)
+
+    k = len(Ts)
+    for j in range(start, stop):
+        if j < (k - 1):
+            h = j + 1
+        else:
+            h = 0
+
+        mp = aamp(Ts[j], m, Ts[h], ignore_trivial=False, p=p)
+        radius, subseq_idx = _aamp_ostinato_series(
+            Ts,
+            j,
+            mp[:, 0].astype(np.float64),
+            m,
+            Ts_subseq_isfinite,
+            p=p,
+            bsf_radius=bsf_radius,
+            share_bsf_radius=share_bsf_radius,
+        )
+        if radius < bsf_radius:
+            bsf_radius, bsf_Ts_idx, bsf_subseq_idx = radius, j, subseq_idx
+
+    share_bsf_radius(bsf_radius)
+
+    return bsf_radius, bsf_Ts_idx, bsf_subseq_idx
+
+
+def _dask_aamp_ostinato(dask_client, Ts, m, Ts_subseq_isfinite, p=2.0):
+    """
+    Find the non-normalized (i.e., without z-normalization) consensus motif amongst a
+    list of time series with a distributed Dask cluster
+
+    The time series are split into contiguous ranges (one per worker) and each worker
+    computes the AB-join matrix profiles and evaluates the candidate radii for its own
+    range of time series. The best-so-far radius is shared across the cluster via a
+    Dask `Variable` so that candidates are pruned cluster-wide.
+
+    Parameters
+    ----------
+    dask_client : client
+        A Dask Distributed client. Setting up a distributed cluster is beyond
+        the scope of this library. Please refer to the Dask Distributed
+        documentation.
+
+    Ts : list
+        A list of time series for which to find the consensus motif
+
+    m : int
+        Window size
+
+    Ts_subseq_isfinite : list
+        A list of rolling window `T_subseq_isfinite` for each time series in `Ts`
+
+    p : float, default 2.0
+        The p-norm to apply for computing the Minkowski distance.
+
+    Returns
+    -------
+    bsf_radius : float
+        The (best-so-far) Radius of the consensus motif
+
+    bsf_Ts_idx : int
+        The time series index in `Ts` which contains the consensus motif
+
+    bsf_subseq_idx : int
+        The subsequence index within time series `Ts[bsf_Ts_idx]` the contains the
+        consensus motif
+    """
+    from dask.distributed import Variable
+
+    hosts = list(dask_client.ncores().keys())
+    nworkers = len(hosts)
+
+    l = np.array([T.shape[0] - m + 1 for T in Ts], dtype=np.int64)
+    Ts_ranges = core._get_array_ranges(l, nworkers, True)
+
+    bsf_radius_var = Variable(client=dask_client)
+    bsf_radius_var.set(np.inf)
+
+    # Scatter data to Dask cluster
+    Ts_future = dask_client.scatter(Ts, broadcast=True, hash=False)
+    Ts_subseq_isfinite_future = dask_client.scatter(
+        Ts_subseq_isfinite, broadcast=True, hash=False
+    )
+
+    futures = []
+    for i in range(Ts_ranges.shape[0]):
+        futures.append(
+            dask_client.submit(
+                _aamp_ostinato_series_range,
+                Ts_future,
+                m,
+                Ts_subseq_isfinite_future,
+                p,
+                Ts_ranges[i, 0],
+                Ts_ranges[i, 1],
+                bsf_radius_var.name,
+                workers=[hosts[i]],
+                pure=False,
+            )
+        )
+
+    results = dask_client.gather(futures)
+    bsf_radius_var.delete()
+
+    # The ranges are ordered so the first of the smallest radii is kept as in a
+    # serial search
+    bsf_radius, bsf_Ts_idx, bsf_subseq_idx = results[0]
+    for radius, Ts_idx, subseq_idx in results[1:]:
+        if radius < bsf_radius:
+            bsf_radius, bsf_Ts_idx, bsf_subseq_idx = radius, Ts_idx, subseq_idx
 
     return bsf_radius, bsf_Ts_idx, bsf_subseq_idx
 
@@ -307,7 +554,11 @@ def aamp_ostinato(Ts, m, p=2.0):
         Ts, m, Ts_subseq_isfinite, p
     )
 
-    (central_radius, central_Ts_idx, central_subseq_idx,) = _get_aamp_central_motif(
+    (
+        central_radius,
+        central_Ts_idx,
+        central_subseq_idx,
+    ) = _get_aamp_central_motif(
         Ts, bsf_radius, bsf_Ts_idx, bsf_subseq_idx, m, Ts_subseq_isfinite, p
     )
 
@@ -382,16 +633,15 @@ def aamp_ostinatoed(client, Ts, m, p=2.0):
             _,
         ) = core.preprocess_non_normalized(T, m)
 
-    bsf_radius, bsf_Ts_idx, bsf_subseq_idx = _aamp_ostinato(
-        Ts,
-        m,
-        Ts_subseq_isfinite,
-        p=p,
-        client=client,
-        mp_func=aamped,
+    bsf_radius, bsf_Ts_idx, bsf_subseq_idx = _dask_aamp_ostinato(
+        client, Ts, m, Ts_subseq_isfinite, p=p
     )
 
-    (central_radius, central_Ts_idx, central_subseq_idx,) = _get_aamp_central_motif(
+    (
+        central_radius,
+        central_Ts_idx,
+        central_subseq_idx,
+    ) = _get_aamp_central_motif(
         Ts,
         bsf_radius,
         bsf_Ts_idx,
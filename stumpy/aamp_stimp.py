@@ -2,30 +2,25 @@
 # Copyright 2019 TD Ameritrade. Released under the terms of the 3-Clause BSD license.
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
+import functools
+import weakref
+from concurrent.futures import as_completed
+
 import numpy as np
-from . import core, aamp, scraamp, aamped
+from . import core, config, aamp, scraamp, aamped
+from .aamp import _aamp
 
 
-def _normalize_pan(pan, ms, bfs_indices, n_processed, T_min, T_max, p=2.0):
+def _get_pan_norm(ms, T_min, T_max, p=2.0):
     """
-    Normalize the pan matrix profile nearest neighbor distances (inplace) relative
-    to the corresponding subsequence length from which they were computed
+    Get the factors for normalizing the pan matrix profile nearest neighbor distances
+    relative to the corresponding subsequence length from which they were computed
 
     Parameters
     ----------
-    pan : numpy.ndarray
-        The pan matrix profile
-
     ms : numpy.ndarray
         The breadth-first-search sorted subsequence window sizes
 
-    bfs_indices : numpy.ndarray
-        The breadth-first-search indices
-
-    n_processed : numpy.ndarray
-        The number of subsequence window sizes and breadth-first-search indices to
-        normalize
-
     T_min : float
         The min value in `T`
 
@@ -37,11 +32,94 @@ def _normalize_pan(pan, ms, bfs_indices, n_processed, T_min, T_max, p=2.0):
 
     Returns
     -------
-    None
+    norm : numpy.ndarray
+        The normalization factor for each subsequence window size
+    """
+    return 1.0 / (np.abs(T_max - T_min) * np.power(ms, 1.0 / p))
+
+
+def _compute_P(T, m, percentage, pre_scraamp, mp_func, p=2.0, T_cumsums=None):
     """
-    idx = bfs_indices[:n_processed]
-    norm = 1.0 / (np.abs(T_max - T_min) * np.power(ms[:n_processed], 1.0 / p))
-    pan[idx] = np.minimum(1.0, pan[idx] * norm[:, np.newaxis])
+    Compute the (approximate) non-normalized (i.e., without z-normalization) matrix
+    profile of `T` for a single subsequence window size
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        The time series or sequence for which to compute the matrix profile
+
+    m : int
+        Window size
+
+    percentage : float
+        The percentage of the full matrix profile to compute. When
+        `percentage < 1.0`, then the `scraamp` algorithm is used. Otherwise,
+        `mp_func` is used.
+
+    pre_scraamp : bool
+        A flag for whether or not to perform the PreSCRIMP calculation prior to
+        computing SCRIMP
+
+    mp_func : object
+        The matrix profile function to use when `percentage = 1.0`
+
+    p : float, default 2.0
+        The p-norm to apply for computing the Minkowski distance.
+
+    T_cumsums : tuple, default None
+        The outputs of `core._preprocess_cumsum` for `T`. When provided, the
+        `isfinite`/`isconstant` masks for `m` are derived from these cumulative sums
+        and passed to `scraamp` (or `aamp`) rather than preprocessing `T` again.
+
+    Returns
+    -------
+    P : numpy.ndarray
+        The (approximate) matrix profile
+    """
+    T_preprocessed = None
+    if T_cumsums is not None and (percentage < 1.0 or mp_func is aamp):
+        T_preprocessed = core._preprocess_non_normalized_from_cumsum(
+            T_cumsums[0], m, *T_cumsums[1:]
+        )
+
+    if percentage < 1.0:
+        if T_preprocessed is None:
+            approx = scraamp(
+                T,
+                m,
+                ignore_trivial=True,
+                percentage=percentage,
+                pre_scraamp=pre_scraamp,
+                p=p,
+            )
+        else:
+            approx = scraamp._from_preprocessed(
+                m,
+                T_preprocessed,
+                percentage=percentage,
+                pre_scraamp=pre_scraamp,
+                p=p,
+            )
+        approx.update()
+        return approx.P_
+    elif T_preprocessed is not None:
+        T_A, T_A_subseq_isfinite, T_A_subseq_isconstant = T_preprocessed
+        excl_zone = int(np.ceil(m / config.STUMPY_EXCL_ZONE_DENOM))
+        diags = np.arange(excl_zone + 1, T_A.shape[0] - m + 1, dtype=np.int64)
+        P, PL, PR, I, IL, IR = _aamp(
+            T_A,
+            T_A,
+            m,
+            T_A_subseq_isfinite,
+            T_A_subseq_isfinite,
+            p,
+            diags,
+            True,
+            1,
+        )
+        return P[:, 0]
+    else:
+        return mp_func(T, m, ignore_trivial=True, p=p)[:, 0]
 
 
 class _aamp_stimp:
@@ -95,6 +173,16 @@ class _aamp_stimp:
     p : float, default 2.0
         The p-norm to apply for computing the Minkowski distance.
 
+    dtype : dtype, default np.float64
+        The data type in which the (raw) pan matrix profile is stored. Each
+        non-normalized matrix profile is always computed in `np.float64` and it is only
+        cast to `dtype` when it is written into its row of the pan matrix profile.
+
+    mmap_path : str, default None
+        The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+        a memory-mapped array (rather than in memory). Any existing file is
+        overwritten.
+
     Attributes
     ----------
     PAN_ : numpy.ndarray
@@ -107,9 +195,13 @@ class _aamp_stimp:
 
     Methods
     -------
-    update():
-        Compute the next matrix profile using the next available (breadth-first-search
-        (level) ordered) subsequence window size and update the pan matrix profile
+    update(n=1, workers=1):
+        Compute the next `n` matrix profiles using the next available
+        (breadth-first-search (level) ordered) subsequence window sizes and update the
+        pan matrix profile
+
+    close():
+        Shut down the process pool that is kept and reused by `update`
 
     Notes
     -----
@@ -131,6 +223,8 @@ class _aamp_stimp:
         device_id=None,
         mp_func=aamp,
         p=2.0,
+        dtype=np.float64,
+        mmap_path=None,
     ):
         """
         Initialize the `stimp` object and compute the Pan Matrix Profile
@@ -179,6 +273,17 @@ class _aamp_stimp:
 
         p : float, default 2.0
             The p-norm to apply for computing the Minkowski distance.
+
+        dtype : dtype, default np.float64
+            The data type in which the (raw) pan matrix profile is stored. Each
+            non-normalized matrix profile is always computed in `np.float64` and it is
+            only cast to `dtype` when it is written into its row of the pan matrix
+            profile.
+
+        mmap_path : str, default None
+            The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+            a memory-mapped array (rather than in memory). Any existing file is
+            overwritten.
         """
         self._T = T.copy()
         self._T_min = np.min(self._T[np.isfinite(self._T)])
@@ -204,15 +309,44 @@ class _aamp_stimp:
             mp_func, client=client, device_id=device_id
         )
         self._mp_func = partial_mp_func
+        # The window size independent cumulative sums are computed once and then
+        # reused to derive the subsequence masks for each window size (`_compute_P`)
+        if percentage < 1.0 or mp_func is aamp:
+            self._T_cumsums = core._preprocess_cumsum(self._T)
+        else:
+            self._T_cumsums = None
+        self._client = client
+        self._device_id = device_id
 
-        self._PAN = np.full(
-            (self._M.shape[0], self._T.shape[0]), fill_value=np.inf, dtype=np.float64
+        self._PAN = core._get_pan_array(
+            self._M.shape[0], self._T.shape[0], dtype=dtype, mmap_path=mmap_path
         )
+        self._pan_nanmax = None
+        self._executor = None
+        self._executor_workers = 1
+        self._executor_finalizer = None
 
-    def update(self):
+    def update(self, n=1, workers=1):
         """
-        Update the pan matrix profile by computing a single matrix profile using the
-        next available subsequence window size
+        Update the pan matrix profile by computing the matrix profiles for the next
+        `n` available subsequence window sizes
+
+        Parameters
+        ----------
+        n : int, default 1
+            The number of (breadth-first-search (level) ordered) subsequence window
+            sizes to process
+
+        workers : int, default 1
+            The maximum number of subsequence window sizes to evaluate concurrently in
+            separate (spawned) processes on this machine, where each process is
+            restricted to an even share of the Numba threads. When a Dask or Ray
+            `client` is used, up to one window size per cluster worker is submitted
+            to the cluster concurrently and this parameter is ignored. Each row of
+            the pan matrix profile is written as soon as its matrix profile is
+            available. The processes (and the time series that is sent to them once)
+            are kept and reused by later updates with the same number of processes
+            until `close` is called.
 
         Notes
         -----
@@ -221,29 +355,138 @@ class _aamp_stimp:
 
         See Table 2
         """
-        if self._n_processed < self._M.shape[0]:
-            m = self._M[self._n_processed]
-            if self._percentage < 1.0:
-                approx = scraamp(
-                    self._T,
-                    m,
-                    ignore_trivial=True,
-                    percentage=self._percentage,
-                    pre_scraamp=self._pre_scraamp,
-                    p=self._p,
-                )
-                approx.update()
-                self._PAN[
-                    self._bfs_indices[self._n_processed], : approx.P_.shape[0]
-                ] = approx.P_
-            else:
-                out = self._mp_func(self._T, m, ignore_trivial=True, p=self._p)
-                self._PAN[
-                    self._bfs_indices[self._n_processed], : out[:, 0].shape[0]
-                ] = out[:, 0]
-            self._n_processed += 1
-
-    def pan(self, threshold=0.2, normalize=True, contrast=True, binary=True, clip=True):
+        start = self._n_processed
+        stop = min(start + max(1, int(n)), self._M.shape[0])
+        if self._device_id is not None:  # pragma: no cover
+            # GPU devices are not shared across processes
+            workers = 1
+        compute_P = functools.partial(
+            _compute_P,
+            self._T,
+            percentage=self._percentage,
+            pre_scraamp=self._pre_scraamp,
+            mp_func=self._mp_func,
+            p=self._p,
+            T_cumsums=self._T_cumsums,
+        )
+        if self._client is not None:
+            executor = core._get_pool_executor(stop - start, client=self._client)
+            task = compute_P
+        else:
+            executor = self._get_process_pool(stop - start, workers, compute_P)
+            task = core._call_pool_func
+
+        if executor is None:
+            for idx in range(start, stop):
+                P = compute_P(self._M[idx])
+                self._PAN[self._bfs_indices[idx], : P.shape[0]] = P
+                self._n_processed += 1
+        else:
+            futures = {
+                executor.submit(task, self._M[idx]): idx for idx in range(start, stop)
+            }
+            for future in as_completed(futures):
+                P = future.result()
+                self._PAN[self._bfs_indices[futures[future]], : P.shape[0]] = P
+            if self._client is not None:
+                executor.shutdown()
+            self._n_processed = stop
+
+    def _get_process_pool(self, n_tasks, workers, compute_P):
+        """
+        Get the (spawned) process pool for evaluating `n_tasks` subsequence window sizes
+        concurrently. The process pool is kept and reused by later updates.
+
+        Parameters
+        ----------
+        n_tasks : int
+            The number of subsequence window sizes to be evaluated
+
+        workers : int
+            The maximum number of processes
+
+        compute_P : function
+            The function that computes the matrix profile for a given subsequence
+            window size. This is sent to each process once when the process pool is
+            created.
+
+        Returns
+        -------
+        executor : concurrent.futures.ProcessPoolExecutor
+            The process pool or `None` when the subsequence window sizes should be
+            evaluated serially
+        """
+        workers = min(int(workers), n_tasks)
+        if workers < 2:
+            return None
+
+        if self._executor is None or self._executor_workers != workers:
+            self.close()
+            self._executor = core._get_pool_executor(n_tasks, workers, func=compute_P)
+            self._executor_workers = workers
+            # Shut down the processes when this object is garbage collected
+            self._executor_finalizer = weakref.finalize(self, self._executor.shutdown)
+
+        return self._executor
+
+    def close(self):
+        """
+        Shut down the (spawned) process pool that is kept and reused by `update`. A
+        later update with `workers > 1` spawns a new process pool.
+
+        Returns
+        -------
+        None
+        """
+        if self._executor_finalizer is not None:
+            self._executor_finalizer()
+        self._executor = None
+        self._executor_workers = 1
+        self._executor_finalizer = None
+
+    def __enter__(self):
+        """
+        Enter the runtime context of this object
+
+        Returns
+        -------
+        self : object
+            This object
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Exit the runtime context of this object and shut down its process pool
+
+        Parameters
+        ----------
+        exc_type : type
+            The type of the exception that was raised in the runtime context, if any
+
+        exc_value : Exception
+            The exception that was raised in the runtime context, if any
+
+        traceback : traceback
+            The traceback of the exception that was raised in the runtime context, if
+            any
+
+        Returns
+        -------
+        None
+        """
+        self.close()
+
+    def pan(
+        self,
+        threshold=0.2,
+        normalize=True,
+        contrast=True,
+        binary=True,
+        clip=True,
+        start=None,
+        stop=None,
+    ):
         """
         Generate a transformed (i.e., normalized, contrasted, binarized, and repeated)
         pan matrix profile
@@ -274,40 +517,58 @@ class _aamp_stimp:
             A flag for whether or not the pan matrix profile is clipped. If set to
             `True`, all values are ensured to be clipped between `0.0` and `1.0`.
 
+        start : int, default None
+            The first row of the transformed pan matrix profile to return. When
+            `start = None`, this is set to `0`.
+
+        stop : int, default None
+            The (exclusive) last row of the transformed pan matrix profile to return.
+            When `stop = None`, this is set to the total number of rows. Only the
+            requested rows are transformed so that, together with `start`, a large
+            pan matrix profile can be paged through one row range at a time.
+
         Returns
         -------
-        None
+        PAN : numpy.ndarray
+            The requested rows of the transformed pan matrix profile
         """
-        PAN = self._PAN.copy()
-        # Retrieve the row indices where the matrix profile was actually computed
-        idx = self._bfs_indices[: self._n_processed]
-        sorted_idx = np.sort(idx)
-        PAN[PAN == np.inf] = np.nan
+        start, stop, _ = slice(start, stop).indices(self._PAN.shape[0])
+        rows = np.arange(start, stop)
 
+        norm = None
         if normalize:
-            _normalize_pan(
-                PAN,
-                self._M,
-                self._bfs_indices,
-                self._n_processed,
-                self._T_min,
-                self._T_max,
-                self._p,
+            norm = _get_pan_norm(self._M, self._T_min, self._T_max, self._p)
+
+        # Each row where the matrix profile has yet to be computed is replaced by the
+        # next computed matrix profile below it (i.e., this gives the "blocky" look)
+        PAN = core._transform_pan_rows(
+            self._PAN,
+            rows,
+            threshold,
+            self._bfs_indices,
+            self._n_processed,
+            norm=norm,
+            contrast=contrast,
+            binary=binary,
+            clip=clip,
+        )
+
+        key = (self._n_processed, threshold, normalize, contrast, binary, clip)
+        if self._pan_nanmax is None or self._pan_nanmax[0] != key:
+            self._pan_nanmax = (
+                key,
+                core._get_pan_nanmax(
+                    self._PAN,
+                    threshold,
+                    self._bfs_indices,
+                    self._n_processed,
+                    norm=norm,
+                    contrast=contrast,
+                    binary=binary,
+                    clip=clip,
+                ),
             )
-        if contrast:
-            core._contrast_pan(PAN, threshold, self._bfs_indices, self._n_processed)
-        if binary:
-            core._binarize_pan(PAN, threshold, self._bfs_indices, self._n_processed)
-        if clip:
-            PAN[idx] = np.clip(PAN[idx], 0.0, 1.0)
-
-        # Below, for each matrix profile that was computed, we take that matrix profile
-        # and copy/repeat it downwards to replace other rows in the `PAN` where the
-        # matrix profile has yet to be computed. Instead of only having lines/values in
-        # the rows where matrix profiles were computed, this gives us the "blocky" look
-        nrepeat = np.diff(np.append(-1, sorted_idx))
-        PAN[: np.sum(nrepeat)] = np.repeat(PAN[sorted_idx], nrepeat, axis=0)
-        PAN[np.isnan(PAN)] = np.nanmax(PAN)
+        PAN[np.isnan(PAN)] = self._pan_nanmax[1]
 
         return PAN
 
@@ -378,6 +639,17 @@ class aamp_stimp(_aamp_stimp):
     p : float, default 2.0
         The p-norm to apply for computing the Minkowski distance.
 
+    dtype : dtype, default np.float64
+        The data type in which the (raw) pan matrix profile is stored. Non-normalized
+        distances scale with the values in `T` and so a `np.float32` pan matrix profile
+        keeps about seven significant digits relative to each distance rather than a
+        fixed absolute precision.
+
+    mmap_path : str, default None
+        The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+        a memory-mapped array (rather than in memory). Any existing file is
+        overwritten.
+
     Attributes
     ----------
     PAN_ : numpy.ndarray
@@ -390,9 +662,13 @@ class aamp_stimp(_aamp_stimp):
 
     Methods
     -------
-    update():
-        Compute the next matrix profile using the next available (breadth-first-search
-        (level) ordered) subsequence window size and update the pan matrix profile
+    update(n=1, workers=1):
+        Compute the next `n` matrix profiles using the next available
+        (breadth-first-search (level) ordered) subsequence window sizes and update the
+        pan matrix profile
+
+    close():
+        Shut down the process pool that is kept and reused by `update`
 
     Notes
     -----
@@ -411,6 +687,8 @@ class aamp_stimp(_aamp_stimp):
         percentage=0.01,
         pre_scraamp=True,
         p=2.0,
+        dtype=np.float64,
+        mmap_path=None,
     ):
         """
         Initialize the `stimp` object and compute the Pan Matrix Profile
@@ -445,6 +723,17 @@ class aamp_stimp(_aamp_stimp):
 
         p : float, default 2.0
             The p-norm to apply for computing the Minkowski distance.
+
+        dtype : dtype, default np.float64
+            The data type in which the (raw) pan matrix profile is stored.
+            Non-normalized distances scale with the values in `T` and so a `np.float32`
+            pan matrix profile keeps about seven significant digits relative to each
+            distance rather than a fixed absolute precision.
+
+        mmap_path : str, default None
+            The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+            a memory-mapped array (rather than in memory). Any existing file is
+            overwritten.
         """
         super().__init__(
             T,
@@ -455,6 +744,8 @@ class aamp_stimp(_aamp_stimp):
             pre_scraamp=pre_scraamp,
             mp_func=aamp,
             p=2.0,
+            dtype=dtype,
+            mmap_path=mmap_path,
         )
 
 
@@ -489,6 +780,16 @@ class aamp_stimped(_aamp_stimp):
     p : float, default 2.0
         The p-norm to apply for computing the Minkowski distance.
 
+    dtype : dtype, default np.float64
+        The data type in which the (raw) pan matrix profile is stored on the client.
+        Every non-normalized matrix profile is gathered from the Dask workers in
+        `np.float64` and then cast to `dtype`.
+
+    mmap_path : str, default None
+        The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+        a memory-mapped array (rather than in memory). Any existing file is
+        overwritten.
+
     Attributes
     ----------
     PAN_ : numpy.ndarray
@@ -501,9 +802,13 @@ class aamp_stimped(_aamp_stimp):
 
     Methods
     -------
-    update():
-        Compute the next matrix profile using the next available (breadth-first-search
-        (level) ordered) subsequence window size and update the pan matrix profile
+    update(n=1, workers=1):
+        Compute the next `n` matrix profiles using the next available
+        (breadth-first-search (level) ordered) subsequence window sizes and update the
+        pan matrix profile
+
+    close():
+        Shut down the process pool that is kept and reused by `update`
 
     Notes
     -----
@@ -521,6 +826,8 @@ class aamp_stimped(_aamp_stimp):
         max_m=None,
         step=1,
         p=2.0,
+        dtype=np.float64,
+        mmap_path=None,
     ):
         """
         Initialize the `stimp` object and compute the Pan Matrix Profile
@@ -549,6 +856,16 @@ class aamp_stimped(_aamp_stimp):
 
         p : float, default 2.0
             The p-norm to apply for computing the Minkowski distance.
+
+        dtype : dtype, default np.float64
+            The data type in which the (raw) pan matrix profile is stored on the client.
+            Every non-normalized matrix profile is gathered from the Dask workers in
+            `np.float64` and then cast to `dtype`.
+
+        mmap_path : str, default None
+            The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+            a memory-mapped array (rather than in memory). Any existing file is
+            overwritten.
         """
         super().__init__(
             T,
@@ -560,4 +877,6 @@ class aamp_stimped(_aamp_stimp):
             client=client,
             mp_func=aamped,
             p=2.0,
+            dtype=dtype,
+            mmap_path=mmap_path,
         )
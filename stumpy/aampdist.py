@@ -55,27 +55,18 @@ def _aampdist_vect(
     """
     j = Q.shape[0] - m + 1  # `k` is reserved for `P_ABBA` selection
     l = T.shape[0] - m + 1
-    MPdist_vect = np.empty(T.shape[0] - Q.shape[0] + 1, dtype=np.float64)
-    distance_matrix = np.full((j, l), np.inf, dtype=np.float64)
-    P_ABBA = np.empty(2 * j, dtype=np.float64)
 
     if k is None:
         percentage = np.clip(percentage, 0.0, 1.0)
         k = min(math.ceil(percentage * (2 * Q.shape[0])), 2 * j - 1)
 
-    k = min(int(k), P_ABBA.shape[0] - 1)
+    def compute_distance_matrix(start, stop, distance_matrix):
+        core._mass_absolute_distance_matrix(
+            Q, T[start : stop + m - 1], m, distance_matrix, p=p
+        )
 
-    core._mass_absolute_distance_matrix(Q, T, m, distance_matrix, p=p)
-
-    rolling_row_min = core.rolling_nanmin(distance_matrix, j)
-    col_min = np.nanmin(distance_matrix, axis=0)
-
-    for i in range(MPdist_vect.shape[0]):
-        P_ABBA[:j] = rolling_row_min[:, i]
-        P_ABBA[j:] = col_min[i : i + j]
-        MPdist_vect[i] = core._select_P_ABBA_value(P_ABBA, k, custom_func)
-
-    return MPdist_vect
+    # The distance matrix is processed in blocks of columns to bound the memory usage
+    return core._compute_mpdist_vect(compute_distance_matrix, j, l, k, custom_func)
 
 
 def aampdist(T_A, T_B, m, percentage=0.05, k=None, p=2.0):
@@ -3,10 +3,125 @@
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
 import numpy as np
+from numba import njit, prange
+
 from . import core, config
 from .aamp import aamp
 
 
+@njit(
+    # "(f8[:], i8, b1[:], f8[:], f8[:, :], i8[:, :], f8[:], i8[:], i8, i8, i8, i8,"
+    # "f8)",
+    parallel=True,
+    fastmath=True,
+)
+def _update_batch(
+    T, m, T_subseq_isfinite, p_norm, P, I, left_P, left_I, l, w, excl_zone, I_offset, p
+):
+    """
+    A Numba JIT-compiled function for ingressing a batch of new subsequences, one at a
+    time, and updating the non-normalized (top-k) matrix profile, the (top-1) left
+    matrix profile, and their corresponding indices in place
+
+    The sliding p-norm of each new subsequence is derived from the sliding p-norm of
+    its preceding subsequence in O(n) time (i.e., along the diagonals of the distance
+    matrix) so that no Python-level loop is needed for each new data point.
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        The time series (with all non-finite values replaced by zero) that contains
+        both the existing data points and the new data points
+
+    m : int
+        Window size
+
+    T_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` contains a
+        `np.nan`/`np.inf` value (False)
+
+    p_norm : numpy.ndarray
+        The sliding p-norm (raised to the power `p`) between the last existing
+        subsequence (i.e., the subsequence at index `l - 1`) and the first `l`
+        subsequences of `T`
+
+    P : numpy.ndarray
+        The (top-k) matrix profile of `T`. Only the first `l` rows must be initialized.
+
+    I : numpy.ndarray
+        The (top-k) matrix profile indices of `T`. Only the first `l` rows must be
+        initialized.
+
+    left_P : numpy.ndarray
+        The (top-1) left matrix profile of `T`
+
+    left_I : numpy.ndarray
+        The (top-1) left matrix profile indices of `T`
+
+    l : int
+        The number of existing subsequences. All subsequences in `T` at index `l` and
+        beyond are new.
+
+    w : int
+        The maximum number of subsequences (including itself) that each new subsequence
+        is compared to. With egress, this is the (constant) number of subsequences
+        in the sliding window. Otherwise, all preceding subsequences are compared.
+
+    excl_zone : int
+        The half width for the exclusion zone
+
+    I_offset : int
+        The offset that is added to the index of each subsequence (e.g., the number of
+        data points that have been egressed) before it is stored in `I` or `left_I`
+
+    p : float
+        The p-norm to apply for computing the Minkowski distance
+
+    Returns
+    -------
+    p_norm : numpy.ndarray
+        The sliding p-norm (raised to the power `p`) between the last new subsequence
+        and the last `w` subsequences of `T`
+    """
+    n_subseqs = T.shape[0] - m + 1
+    p_norm_prev = np.empty(n_subseqs, dtype=np.float64)
+    p_norm_curr = np.empty(n_subseqs, dtype=np.float64)
+    D = np.empty(n_subseqs, dtype=np.float64)
+    p_norm_prev[:l] = p_norm
+
+    for j in range(l, n_subseqs):
+        start = max(0, j - w + 1)
+        for i in prange(max(start, 1), j + 1):
+            p_norm_curr[i] = (
+                p_norm_prev[i - 1]
+                - np.power(abs(T[i - 1] - T[j - 1]), p)
+                + np.power(abs(T[i + m - 1] - T[j + m - 1]), p)
+            )
+        if start == 0:
+            p_norm_curr[0] = np.sum(np.power(np.abs(T[:m] - T[j : j + m]), p))
+
+        for i in prange(start, j + 1):
+            if p_norm_curr[i] < config.STUMPY_P_NORM_THRESHOLD:
+                p_norm_curr[i] = 0
+            if T_subseq_isfinite[i] and T_subseq_isfinite[j]:
+                D[i] = np.power(p_norm_curr[i], 1.0 / p)
+            else:
+                D[i] = np.inf
+        D[max(start, j - excl_zone) : j + 1] = np.inf
+
+        core._update_incremental_PI(
+            D[start : j + 1], P[start : j + 1], I[start : j + 1], start + I_offset
+        )
+
+        # All neighbors of the new subsequence are on its left
+        left_P[j] = P[j, 0]
+        left_I[j] = I[j, 0]
+
+        p_norm_prev, p_norm_curr = p_norm_curr, p_norm_prev
+
+    return p_norm_prev[max(0, n_subseqs - w) :].copy()
+
+
 class aampi:
     # needs to be enhanced to support top-k matrix profile
     """
@@ -55,8 +170,8 @@ class aampi:
     Methods
     -------
     update(t)
-        Append a single new data point, `t`, to the time series, `T`, and update the
-        matrix profile
+        Append a single new data point (or an array of new data points), `t`, to the
+        time series, `T`, and update the matrix profile
 
     Notes
     -----
@@ -68,6 +183,17 @@ class aampi:
     Note that we have extended this algorithm for AB-joins as well.
     """
 
+    # Arrays that are stored in (and viewed from) larger buffers
+    _buffered_attrs = (
+        "_T",
+        "_T_isfinite",
+        "_T_subseq_isfinite",
+        "_P",
+        "_I",
+        "_left_P",
+        "_left_I",
+    )
+
     def __init__(self, T, m, egress=True, p=2.0, k=1):
         """
         Initialize the `stumpi` object
@@ -138,6 +264,7 @@ class aampi:
         if self._egress:
             self._p_norm_new = np.empty(self._p_norm.shape[0], dtype=np.float64)
             self._n_appended = 0
+        self._init_buffers()
 
     def update(self, t):
         """
@@ -145,10 +272,16 @@ class aampi:
         the non-normalized (i.e., without z-normalization) matrix profile and matrix
         profile indices.
 
+        When `t` is an array of new data points, the whole batch is ingressed (and, when
+        `egress=True`, the same number of the oldest data points are egressed) with a
+        single call. The result is the same as calling `update` for each data point in
+        `t` individually but without the Python overhead for every data point.
+
         Parameters
         ----------
-        t : float
-            A single new data point to be appended to `T`
+        t : float or numpy.ndarray
+            A single new data point (or an array of new data points) to be appended to
+            `T`
 
         Notes
         -----
@@ -159,7 +292,9 @@ class aampi:
 
         Note that we have extended this algorithm for AB-joins as well.
         """
-        if self._egress:
+        if np.ndim(t) > 0:
+            self._update_batch(t)
+        elif self._egress:
             self._update_egress(t)
         else:
             self._update(t)
@@ -176,19 +311,12 @@ class aampi:
         """
         self._n = self._T.shape[0]
         l = self._n - self._m + 1 - 1  # Subtract 1 due to egress
-        self._T[:-1] = self._T[1:]
+        self._ingress_buffers()
+        self._egress_buffers()
         self._T[-1] = t
         self._n_appended += 1
-        self._p_norm[:-1] = self._p_norm[1:]
         S = self._T[l:]
         t_drop = self._T[l - 1]
-        self._T_isfinite[:-1] = self._T_isfinite[1:]
-        self._T_subseq_isfinite[:-1] = self._T_subseq_isfinite[1:]
-
-        self._I[:-1] = self._I[1:]
-        self._P[:-1] = self._P[1:]
-        self._left_I[:-1] = self._left_I[1:]
-        self._left_P[:-1] = self._left_P[1:]
 
         if np.isfinite(t):
             self._T_isfinite[-1] = True
@@ -200,8 +328,11 @@ class aampi:
 
         self._T_subseq_isfinite[-1] = np.all(self._T_isfinite[-self._m :])
 
+        # Note that `self._p_norm` is not shifted. Instead, `self._p_norm[1:]` is
+        # aligned with the egressed `self._T[:l]`, which is what is needed for the
+        # sliding update
         self._p_norm_new[1:] = (
-            self._p_norm[:l]
+            self._p_norm[1:]
             - np.power(abs(self._T[:l] - t_drop), self._p)
             + np.power(abs(self._T[self._m :] - t), self._p)
         )
@@ -219,24 +350,10 @@ class aampi:
 
         core.apply_exclusion_zone(D, D.shape[0] - 1, self._excl_zone, np.inf)
 
-        update_idx = np.argwhere(D < self._P[:, -1]).flatten()
-        for i in update_idx:
-            idx = np.searchsorted(self._P[i], D[i], side="right")
-            core._shift_insert_at_index(self._P[i], idx, D[i])
-            core._shift_insert_at_index(
-                self._I[i], idx, D.shape[0] + self._n_appended - 1
-            )
-            # D.shape[0] is base-1
-
-        # Calculate the (top-k) matrix profile values/indices for the last susequence
-        # by using its correspondng distance profile `D`
-        self._P[-1] = np.inf
-        self._I[-1] = -1
-        for i, d in enumerate(D):
-            if d < self._P[-1, -1]:
-                idx = np.searchsorted(self._P[-1], d, side="right")
-                core._shift_insert_at_index(self._P[-1], idx, d)
-                core._shift_insert_at_index(self._I[-1], idx, i + self._n_appended)
+        # Update the (top-k) matrix profile values/indices of all subsequences and
+        # calculate them for the last subsequence by using its corresponding distance
+        # profile `D`
+        core._update_incremental_PI(D, self._P, self._I, self._n_appended)
 
         # All neighbors of the last subsequence are on its left. So, its (top-1)
         # matrix profile value/index and its left matrix profile value/index must
@@ -244,7 +361,7 @@ class aampi:
         self._left_P[-1] = self._P[-1, 0]
         self._left_I[-1] = self._I[-1, 0]
 
-        self._p_norm[:] = self._p_norm_new
+        self._p_norm, self._p_norm_new = self._p_norm_new, self._p_norm
 
     def _update(self, t):
         """
@@ -258,30 +375,29 @@ class aampi:
         """
         self._n = self._T.shape[0]
         l = self._n - self._m + 1
-        T_new = np.append(self._T, t)
+        self._ingress_buffers()
+        self._T[-1] = t
         p_norm_new = np.empty(self._p_norm.shape[0] + 1, dtype=np.float64)
-        S = T_new[l:]
-        t_drop = T_new[l - 1]
+        S = self._T[l:]
+        t_drop = self._T[l - 1]
 
         if np.isfinite(t):
-            self._T_isfinite = np.append(self._T_isfinite, True)
+            self._T_isfinite[-1] = True
         else:
-            self._T_isfinite = np.append(self._T_isfinite, False)
+            self._T_isfinite[-1] = False
             t = 0
-            T_new[-1] = 0
+            self._T[-1] = 0
             S[-1] = 0
 
-        self._T_subseq_isfinite = np.append(
-            self._T_subseq_isfinite, np.all(self._T_isfinite[-self._m :])
-        )
+        self._T_subseq_isfinite[-1] = np.all(self._T_isfinite[-self._m :])
 
         p_norm_new[1:] = (
             self._p_norm[:l]
-            - np.power(abs(T_new[:l] - t_drop), self._p)
-            + np.power(abs(T_new[self._m :] - t), self._p)
+            - np.power(abs(self._T[:l] - t_drop), self._p)
+            + np.power(abs(self._T[self._m :] - t), self._p)
         )
         p_norm_new[0] = (
-            np.linalg.norm(T_new[: self._m] - S[: self._m], ord=self._p) ** self._p
+            np.linalg.norm(self._T[: self._m] - S[: self._m], ord=self._p) ** self._p
         )
 
         mask = p_norm_new < config.STUMPY_P_NORM_THRESHOLD
@@ -294,32 +410,145 @@ class aampi:
 
         core.apply_exclusion_zone(D, D.shape[0] - 1, self._excl_zone, np.inf)
 
-        update_idx = np.argwhere(D[:l] < self._P[:l, -1]).flatten()
-        for i in update_idx:
-            idx = np.searchsorted(self._P[i], D[i], side="right")
-            core._shift_insert_at_index(self._P[i], idx, D[i])
-            core._shift_insert_at_index(self._I[i], idx, l)
-
-        # Calculating top-k matrix profile and (top-1) left matrix profile (and their
-        # corresponding indices) for new subsequence whose distance profie is `D`
-        P_new = np.full(self._k, np.inf, dtype=np.float64)
-        I_new = np.full(self._k, -1, dtype=np.int64)
-        for i, d in enumerate(D):
-            if d < P_new[-1]:  # maximum value in sorted array P_new
-                idx = np.searchsorted(P_new, d, side="right")
-                core._shift_insert_at_index(P_new, idx, d)
-                core._shift_insert_at_index(I_new, idx, i)
-
-        left_I_new = I_new[0]
-        left_P_new = P_new[0]
-
-        self._T = T_new
-        self._P = np.append(self._P, P_new.reshape(1, -1), axis=0)
-        self._I = np.append(self._I, I_new.reshape(1, -1), axis=0)
-        self._left_P = np.append(self._left_P, left_P_new)
-        self._left_I = np.append(self._left_I, left_I_new)
+        # Update the (top-k) matrix profile values/indices of all existing
+        # subsequences and calculate the top-k matrix profile and (top-1) left matrix
+        # profile (and their corresponding indices) for new subsequence whose distance
+        # profile is `D`
+        core._update_incremental_PI(D, self._P, self._I, 0)
+
+        self._left_P[-1] = self._P[-1, 0]
+        self._left_I[-1] = self._I[-1, 0]
+
         self._p_norm = p_norm_new
 
+    def _update_batch(self, t):
+        """
+        Ingress an array of new data points (and, when `egress=True`, egress the same
+        number of the oldest data points) and update the (top-k) matrix profile and
+        matrix profile indices
+
+        Parameters
+        ----------
+        t : numpy.ndarray
+            An array of new data points to be appended to `T`
+        """
+        t = core._preprocess(t)
+        n = self._T.shape[0]
+        l = n - self._m + 1
+        n_new = t.shape[0]
+        if n_new == 0:
+            return
+
+        # Temporarily extend all buffered arrays to hold both the existing and the new
+        # data points since the new subsequences must also be compared to the existing
+        # subsequences that will be egressed
+        self._ingress_buffers(n_new)
+        self._T[n:] = t
+        self._T_isfinite[n:] = np.isfinite(t)
+        self._T[n:][~self._T_isfinite[n:]] = 0
+        self._T_subseq_isfinite[l:] = np.all(
+            core.rolling_window(self._T_isfinite[l:], self._m), axis=1
+        )
+
+        if self._egress:
+            w = l
+            I_offset = self._n_appended
+        else:
+            w = self._T.shape[0] - self._m + 1
+            I_offset = 0
+
+        self._p_norm = _update_batch(
+            self._T,
+            self._m,
+            self._T_subseq_isfinite,
+            self._p_norm,
+            self._P,
+            self._I,
+            self._left_P,
+            self._left_I,
+            l,
+            w,
+            self._excl_zone,
+            I_offset,
+            self._p,
+        )
+
+        if self._egress:
+            self._egress_buffers(n_new)
+            self._n_appended += n_new
+
+    def _init_buffers(self):
+        """
+        Copy the arrays that slide forward (or grow) with each update into larger
+        buffers
+
+        Each buffer has `self._n` extra rows so that egressing the oldest data point
+        only requires moving the head offset, `self._head`, forward rather than
+        shifting every element of every array and so that ingressing a new data point
+        (without egress) does not require reallocating every array. The private
+        attributes (e.g., `self._T`) are then contiguous views of the current window
+        of each buffer.
+        """
+        self._head = 0
+        self._buffers = {}
+        for attr in self._buffered_attrs:
+            a = getattr(self, attr)
+            buffer = np.empty((a.shape[0] + self._n,) + a.shape[1:], a.dtype)
+            buffer[: a.shape[0]] = a
+            self._buffers[attr] = buffer
+            setattr(self, attr, buffer[: a.shape[0]])
+
+    def _ingress_buffers(self, n_ingress=1):
+        """
+        Grow each buffered array by `n_ingress` elements without egressing the oldest
+        elements. The newly ingressed elements at the end of each view are left
+        uninitialized and must be set by the caller.
+
+        When there is not enough room left at the end of the buffers, the views are
+        first copied back to the front of the buffers and, if there is still not
+        enough room, the capacity of the buffers is doubled. Either way, the cost of
+        copying is amortized to O(1) per data point.
+
+        Parameters
+        ----------
+        n_ingress : int, default 1
+            The number of elements to ingress
+        """
+        n = self._T.shape[0]
+        capacity = self._buffers["_T"].shape[0]
+        if self._head + n + n_ingress > capacity:
+            if n + n_ingress > capacity:
+                capacity = 2 * (n + n_ingress)
+            for attr, buffer in self._buffers.items():
+                a = getattr(self, attr)
+                buffer_capacity = capacity - n + a.shape[0]
+                if buffer_capacity != buffer.shape[0]:
+                    buffer = np.empty((buffer_capacity,) + a.shape[1:], a.dtype)
+                    self._buffers[attr] = buffer
+                buffer[: a.shape[0]] = a
+            self._head = 0
+
+        for attr, buffer in self._buffers.items():
+            stop = self._head + getattr(self, attr).shape[0] + n_ingress
+            setattr(self, attr, buffer[self._head : stop])
+
+    def _egress_buffers(self, n_egress=1):
+        """
+        Egress the `n_egress` oldest elements from each buffered array by moving the
+        head offset, `self._head`, forward
+
+        Parameters
+        ----------
+        n_egress : int, default 1
+            The number of elements to egress
+        """
+        stop = self._head
+        self._head += n_egress
+        for attr, buffer in self._buffers.items():
+            setattr(
+                self, attr, buffer[self._head : stop + getattr(self, attr).shape[0]]
+            )
+
     @property
     def P_(self):
         """
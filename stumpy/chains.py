@@ -2,9 +2,154 @@
 # Copyright 2019 TD Ameritrade. Released under the terms of the 3-Clause BSD license.  # noqa: E501
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
-from collections import deque
-
 import numpy as np
+from numba import njit, prange
+
+
+@njit(
+    # "i8[:](i8[:], i8[:], i8)"
+)
+def _atsc(IL, IR, j):
+    """
+    A Numba JIT-compiled function for computing the anchored time series chain (ATSC)
+
+    Parameters
+    ----------
+    IL : numpy.ndarray
+        Left matrix profile indices
+
+    IR : numpy.ndarray
+        Right matrix profile indices
+
+    j : int
+        The index value for which to compute the ATSC
+
+    Returns
+    -------
+    out : numpy.ndarray
+        Anchored time series chain for index, `j`
+    """
+    # The chain is traversed twice so that the output can be allocated up front
+    chain_len = 1
+    k = j
+    for i in range(IL.shape[0]):
+        if IR[k] == -1 or IL[IR[k]] != k:
+            break
+        k = IR[k]
+        chain_len += 1
+
+    out = np.empty(chain_len, dtype=np.int64)
+    out[0] = j
+    for i in range(1, chain_len):
+        j = IR[j]
+        out[i] = j
+
+    return out
+
+
+@njit(
+    # "(i8[:], i8[:])",
+    parallel=True,
+)
+def _mark_chains(IL, IR):
+    """
+    A Numba JIT-compiled and parallelized function for finding the successor of each
+    subsequence in its chain and for marking the subsequences that start a chain
+
+    Parameters
+    ----------
+    IL : numpy.ndarray
+        Left matrix profile indices
+
+    IR : numpy.ndarray
+        Right matrix profile indices
+
+    Returns
+    -------
+    is_head : numpy.ndarray
+        A boolean array that indicates whether a subsequence is the first subsequence
+        of a chain (i.e., it has no predecessor)
+
+    successors : numpy.ndarray
+        The index of the next subsequence in the chain of each subsequence. This is
+        `-1` for the last subsequence of a chain.
+    """
+    n = IL.shape[0]
+    is_head = np.empty(n, dtype=np.bool_)
+    successors = np.empty(n, dtype=np.int64)
+    for i in prange(n):
+        j = IR[i]
+        if j != -1 and IL[j] == i:
+            successors[i] = j
+        else:
+            successors[i] = -1
+
+        j = IL[i]
+        is_head[i] = j == -1 or IR[j] != i
+
+    return is_head, successors
+
+
+@njit(
+    # "(i8[:], i8[:])",
+    parallel=True,
+)
+def _allc(IL, IR):
+    """
+    A Numba JIT-compiled and parallelized function for computing the all-chain set
+    (ALLC) as flat arrays
+
+    Parameters
+    ----------
+    IL : numpy.ndarray
+        Left matrix profile indices
+
+    IR : numpy.ndarray
+        Right matrix profile indices
+
+    Returns
+    -------
+    starts : numpy.ndarray
+        The (CSR-style) start index of each chain in `members`. The last element is
+        the total number of chain members so that the `i`th chain is
+        `members[starts[i] : starts[i + 1]]`.
+
+    members : numpy.ndarray
+        The subsequence indices of all chains, concatenated in order of their first
+        subsequence index
+
+    Notes
+    -----
+    Every subsequence belongs to exactly one chain and each chain is found from the
+    subsequence that starts it so this is `O(n)`. Like `atsc`, the length of a chain
+    is bounded by the number of subsequences.
+    """
+    n = IL.shape[0]
+    is_head, successors = _mark_chains(IL, IR)
+    heads = np.flatnonzero(is_head)
+
+    chain_lens = np.empty(heads.shape[0], dtype=np.int64)
+    for c in prange(heads.shape[0]):
+        chain_len = 1
+        j = heads[c]
+        for i in range(n):
+            j = successors[j]
+            if j == -1:
+                break
+            chain_len += 1
+        chain_lens[c] = chain_len
+
+    starts = np.zeros(heads.shape[0] + 1, dtype=np.int64)
+    starts[1:] = np.cumsum(chain_lens)
+
+    members = np.empty(starts[-1], dtype=np.int64)
+    for c in prange(heads.shape[0]):
+        j = heads[c]
+        for idx in range(starts[c], starts[c + 1]):
+            members[idx] = j
+            j = successors[j]
+
+    return starts, members
 
 
 def atsc(IL, IR, j):
@@ -51,20 +196,13 @@ def atsc(IL, IR, j):
     >>> stumpy.atsc(mp[:, 2], mp[:, 3], 1)
     array([1, 3])
     """
-    C = deque([j])
-    for i in range(IL.size):
-        if IR[j] == -1 or IL[IR[j]] != j:
-            break
-        else:
-            j = IR[j]
-            C.append(j)
+    IL = np.asarray(IL, dtype=np.int64)
+    IR = np.asarray(IR, dtype=np.int64)
 
-    out = np.array(list(C), dtype=np.int64)
-
-    return out
+    return _atsc(IL, IR, j)
 
 
-def allc(IL, IR):
+def allc(IL, IR, flat=False):
     """
     Compute the all-chain set (ALLC)
 
@@ -79,9 +217,15 @@ def allc(IL, IR):
     IR : numpy.ndarray
         Right matrix profile indices
 
+    flat : bool, default False
+        When set to `True`, the all-chain set, `S`, is returned as a `(starts,
+        members)` tuple of flat (CSR-style) arrays where the `i`th chain is
+        `members[starts[i] : starts[i + 1]]`. This avoids creating one array per
+        chain for large matrix profiles.
+
     Returns
     -------
-    S : list(numpy.ndarray)
+    S : list(numpy.ndarray) or tuple(numpy.ndarray, numpy.ndarray)
         All-chain set
 
     C : numpy.ndarray
@@ -107,30 +251,26 @@ def allc(IL, IR):
     chain is simply the longest one among the all-chain set. Both the
     all-chain set and unanchored chain are returned.
 
-    The all-chain set, S, is returned as a list of unique numpy arrays.
+    The all-chain set, S, is returned as a list of unique numpy arrays that are
+    ordered by their first subsequence index (or as flat arrays when `flat=True`).
 
     Examples
     --------
     >>> mp = stumpy.stump(np.array([584., -11., 23., 79., 1001., 0., -19.]), m=3)
     >>> stumpy.allc(mp[:, 2], mp[:, 3])
-    ([array([1, 3]), array([2]), array([0, 4])], array([0, 4]))
+    ([array([0, 4]), array([1, 3]), array([2])], array([0, 4]))
     """
-    L = np.ones(IL.size, dtype=np.int64)
-    S = set()  # type: ignore
-    for i in range(IL.size):
-        if L[i] == 1:
-            j = i
-            C = deque([j])
-            for k in range(IL.size):
-                if IR[j] == -1 or IL[IR[j]] != j:
-                    break
-                else:
-                    j = IR[j]
-                    L[j] = -1
-                    L[i] = L[i] + 1
-                    C.append(j)
-            S.update([tuple(C)])
-    C = atsc(IL, IR, L.argmax())
-    S = [np.array(s, dtype=np.int64) for s in S]  # type: ignore
-
-    return S, C  # type: ignore
+    IL = np.asarray(IL, dtype=np.int64)
+    IR = np.asarray(IR, dtype=np.int64)
+
+    starts, members = _allc(IL, IR)
+    chain_lens = np.diff(starts)
+    idx = np.argmax(chain_lens)
+    C = members[starts[idx] : starts[idx + 1]].copy()
+
+    if flat:
+        S = (starts, members)
+    else:
+        S = np.split(members, starts[1:-1])
+
+    return S, C
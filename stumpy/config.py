@@ -14,3 +14,8 @@ STUMPY_TEST_PRECISION = 5
 STUMPY_MAX_P_NORM_DISTANCE = np.finfo(np.float64).max
 STUMPY_MAX_DISTANCE = np.sqrt(STUMPY_MAX_P_NORM_DISTANCE)
 STUMPY_EXCL_ZONE_DENOM = 4
+STUMPY_MPDIST_MEMORY_BUDGET = 2**30  # bytes
+STUMPY_SNIPPETS_CACHE_SIZE = 0
+STUMPY_MATCH_MANY_CACHE_SIZE = 0
+STUMPY_OSTINATO_SHARE_INTERVAL = 64  # calls
+STUMPY_TIME_BUDGET_PROBE_NDIST = 2**16  # distances
@@ -2,13 +2,18 @@
 # Copyright 2019 TD Ameritrade. Released under the terms of the 3-Clause BSD license.  # noqa: E501
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
+import os
 import warnings
 import functools
 import inspect
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import numpy as np
+import numba
 from numba import njit, cuda, prange
 from scipy.signal import convolve
+from scipy import fft as sp_fft
 from scipy.ndimage import maximum_filter1d, minimum_filter1d
 from scipy import linalg
 from scipy.spatial.distance import cdist
@@ -141,6 +146,13 @@ def non_normalized(non_norm, exclude=None, replace=None):
                                 kwargs[v] = kwargs.pop(k)
                 return non_norm(*args, **kwargs)
 
+        if inspect.isclass(norm):
+            # Expose the (bound) class methods of `norm` (e.g., alternative
+            # constructors) through the wrapper
+            for name, attr in vars(norm).items():
+                if isinstance(attr, classmethod):
+                    setattr(inner_wrapper, name, getattr(norm, name))
+
         return inner_wrapper
 
     return outer_wrapper
@@ -543,6 +555,135 @@ def sliding_dot_product(Q, T):
     return QT.real[m - 1 : n]
 
 
+def _get_nfft(n, m):
+    """
+    Get the shortest fast length that a time series of length `n` must be zero-padded
+    to so that its real FFT spectrum can be used to calculate the sliding dot product
+    with any query of length `m`
+
+    Parameters
+    ----------
+    n : int
+        The length of the time series
+
+    m : int
+        Window size (i.e., the length of the queries)
+
+    Returns
+    -------
+    nfft : int
+        The length of the zero-padded time series
+    """
+    return sp_fft.next_fast_len(n + m - 1, real=True)
+
+
+def _rfft_spectrum(T, m, nfft=None):
+    """
+    Compute the (zero-padded) real FFT spectrum of the time series, `T`, so that
+    it can be reused to calculate the sliding dot product of `T` with any query
+    of length `m`
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        Time series or sequence. If `T` is 2-dimensional, then the spectrum is
+        computed for each row (dimension) of `T`.
+
+    m : int
+        Window size (i.e., the length of the queries)
+
+    nfft : int, default None
+        The length that `T` is zero-padded to, which must be at least
+        `T.shape[-1] + m - 1`. When `nfft` is `None`, the shortest fast FFT length is
+        used.
+
+    Returns
+    -------
+    T_fft : numpy.ndarray
+        The real FFT spectrum of `T` along its last axis
+
+    nfft : int
+        The length of the zero-padded `T` that the spectrum was computed from
+    """
+    if nfft is None:
+        nfft = _get_nfft(T.shape[-1], m)
+    T_fft = sp_fft.rfft(T, nfft, axis=-1)
+
+    return T_fft, nfft
+
+
+def _rfft_query_spectrum(Q, nfft, workers=1):
+    """
+    Compute the (zero-padded) real FFT spectrum of the reversed query, `Q`, so that
+    it can be reused to calculate the sliding dot product of `Q` with any time series
+    whose spectrum has the same length, `nfft`
+
+    Parameters
+    ----------
+    Q : numpy.ndarray
+        Query array or subsequence. If `Q` is 2-dimensional, then the spectrum is
+        computed for each row of `Q`.
+
+    nfft : int
+        The length that the reversed `Q` is zero-padded to
+
+    workers : int, default 1
+        The maximum number of workers that are used to compute the (batched) FFTs in
+        parallel
+
+    Returns
+    -------
+    Q_fft : numpy.ndarray
+        The real FFT spectrum of the reversed `Q` along its last axis
+    """
+    Qr = np.flip(Q, axis=-1)  # Reverse/flip Q
+
+    return sp_fft.rfft(Qr, nfft, axis=-1, workers=workers)
+
+
+def _sliding_dot_product_from_spectrum(Q, T_fft, nfft, n, workers=1, Q_fft=None):
+    """
+    Use the precomputed real FFT spectrum of the time series, `T`, to calculate the
+    sliding window dot product of one or more queries with `T`
+
+    Parameters
+    ----------
+    Q : numpy.ndarray
+        Query array or subsequence. If `Q` is 2-dimensional, then each row is
+        treated as a separate query and is paired with the corresponding (or
+        broadcasted) row of `T_fft`.
+
+    T_fft : numpy.ndarray
+        The real FFT spectrum of `T` (see `_rfft_spectrum`)
+
+    nfft : int
+        The length of the zero-padded `T` that `T_fft` was computed from
+
+    n : int
+        The length of `T`
+
+    workers : int, default 1
+        The maximum number of workers that are used to compute the (batched) FFTs in
+        parallel
+
+    Q_fft : numpy.ndarray, default None
+        The (precomputed) real FFT spectrum of the reversed `Q` with the same length,
+        `nfft`, as `T_fft` (see `_rfft_query_spectrum`). When `Q_fft` is `None`, it is
+        computed from `Q`.
+
+    Returns
+    -------
+    output : numpy.ndarray
+        Sliding dot product between `Q` and `T`.
+    """
+    m = Q.shape[-1]
+    if Q_fft is None:
+        Q_fft = _rfft_query_spectrum(Q, nfft, workers)
+    QT = sp_fft.irfft(Q_fft * T_fft, nfft, axis=-1, workers=workers)
+
+    return QT[..., m - 1 : n]
+
+
 @njit(parallel=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
 def _parallel_rolling_func(a, w, func):
     """
@@ -1157,6 +1298,207 @@ def _p_norm_distance_profile(Q, T, p=2.0):
     return p_norm_profile
 
 
+@njit(
+    # "f8[:](f8[:], f8[:], f8, f8, f8[:], f8[:], f8)",
+    parallel=True,
+    fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+)
+def _mass_early_abandon(Q, T, μ_Q, σ_Q, M_T, Σ_T, max_distance):
+    """
+    A Numba JIT-compiled and parallelized function for computing the z-normalized
+    distance profile where any distance that is larger than `max_distance` is
+    abandoned early and set to `np.inf`
+
+    Each subsequence is first pruned with a lower bound that is based on its first
+    and last z-normalized values (i.e., LB_Kim) and then its Euclidean distance is
+    accumulated in order of decreasing absolute z-normalized query value so that
+    non-matches are abandoned as early as possible.
+
+    Parameters
+    ----------
+    Q : numpy.ndarray
+        Query array or subsequence
+
+    T : numpy.ndarray
+        Time series or sequence
+
+    μ_Q : float
+        Mean of `Q`
+
+    σ_Q : float
+        Standard deviation of `Q`
+
+    M_T : numpy.ndarray
+        Sliding mean of `T`
+
+    Σ_T : numpy.ndarray
+        Sliding standard deviation of `T`
+
+    max_distance : float
+        The largest distance that is computed exactly
+
+    Returns
+    -------
+    output : numpy.ndarray
+        Distance profile where all distances that are larger than `max_distance` are
+        set to `np.inf`
+
+    Notes
+    -----
+    `DOI: 10.1145/2339530.2339576 \
+    <https://www.cs.ucr.edu/~eamonn/SIGKDD_trillion.pdf>`__
+
+    See Section 4.2
+    """
+    m = Q.shape[0]
+    l = M_T.shape[0]
+    max_D_squared = max_distance * max_distance
+    D = np.full(l, np.inf, dtype=np.float64)
+
+    if σ_Q < config.STUMPY_STDDEV_THRESHOLD:
+        Q_z = np.zeros(m, dtype=np.float64)
+    else:
+        Q_z = (Q - μ_Q) / σ_Q
+    Q_order = np.argsort(-np.abs(Q_z))
+    Q_z = Q_z[Q_order]
+
+    for i in prange(l):
+        if np.isinf(M_T[i]):
+            continue
+
+        if (
+            σ_Q < config.STUMPY_STDDEV_THRESHOLD
+            or Σ_T[i] < config.STUMPY_STDDEV_THRESHOLD
+        ):
+            D_squared = _calculate_squared_distance(m, 0.0, μ_Q, σ_Q, M_T[i], Σ_T[i])
+        else:
+            # LB_Kim (first and last values)
+            D_squared = ((T[i] - M_T[i]) / Σ_T[i] - (Q[0] - μ_Q) / σ_Q) ** 2
+            if m > 1:
+                D_squared += (
+                    (T[i + m - 1] - M_T[i]) / Σ_T[i] - (Q[m - 1] - μ_Q) / σ_Q
+                ) ** 2
+            if D_squared > max_D_squared:
+                continue
+
+            D_squared = 0.0
+            for j in range(m):
+                D_squared += ((T[i + Q_order[j]] - M_T[i]) / Σ_T[i] - Q_z[j]) ** 2
+                if D_squared > max_D_squared:
+                    break
+
+            if D_squared < config.STUMPY_P_NORM_THRESHOLD:
+                D_squared = 0.0
+
+        if D_squared <= max_D_squared:
+            D[i] = np.sqrt(D_squared)
+
+    return D
+
+
+@njit(
+    # "f8[:](f8[:], f8[:], b1[:], f8, f8)",
+    parallel=True,
+    fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+)
+def _mass_absolute_early_abandon(Q, T, T_subseq_isfinite, max_distance, p=2.0):
+    """
+    A Numba JIT-compiled and parallelized function for computing the non-normalized
+    distance profile where any distance that is larger than `max_distance` is
+    abandoned early and set to `np.inf`
+
+    Each subsequence is first pruned with a lower bound that is based on its first
+    and last values (i.e., LB_Kim) and then its p-norm distance is accumulated in
+    order of decreasing absolute (mean-centered) query value so that non-matches are
+    abandoned as early as possible.
+
+    Parameters
+    ----------
+    Q : numpy.ndarray
+        Query array or subsequence
+
+    T : numpy.ndarray
+        Time series or sequence
+
+    T_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` contains a
+        `np.nan`/`np.inf` value (False)
+
+    max_distance : float
+        The largest distance that is computed exactly
+
+    p : float, default 2.0
+        The p-norm to apply for computing the Minkowski distance.
+
+    Returns
+    -------
+    output : numpy.ndarray
+        Distance profile where all distances that are larger than `max_distance` are
+        set to `np.inf`
+
+    Notes
+    -----
+    `DOI: 10.1145/2339530.2339576 \
+    <https://www.cs.ucr.edu/~eamonn/SIGKDD_trillion.pdf>`__
+
+    See Section 4.2
+    """
+    m = Q.shape[0]
+    l = T_subseq_isfinite.shape[0]
+    max_p_norm = np.power(max_distance, p)
+    D = np.full(l, np.inf, dtype=np.float64)
+
+    Q_order = np.argsort(-np.abs(Q - np.mean(Q)))
+
+    for i in prange(l):
+        if not T_subseq_isfinite[i]:
+            continue
+
+        # LB_Kim (first and last values)
+        p_norm = np.power(np.abs(T[i] - Q[0]), p)
+        if m > 1:
+            p_norm += np.power(np.abs(T[i + m - 1] - Q[m - 1]), p)
+        if p_norm > max_p_norm:
+            continue
+
+        p_norm = 0.0
+        for j in range(m):
+            p_norm += np.power(np.abs(T[i + Q_order[j]] - Q[Q_order[j]]), p)
+            if p_norm > max_p_norm:
+                break
+
+        if p_norm <= max_p_norm:
+            D[i] = np.power(p_norm, 1.0 / p)
+
+    return D
+
+
+def _is_early_abandon_faster(n, m, n_expected_terms):
+    """
+    Determine whether an early abandoning scan is expected to be faster than
+    computing the full distance profile with FFT convolution
+
+    Parameters
+    ----------
+    n : int
+        The length of the time series, `T`
+
+    m : int
+        Window size
+
+    n_expected_terms : float
+        The expected number of terms of the distance that must be accumulated before
+        a non-matching subsequence can be abandoned
+
+    Returns
+    -------
+    output : bool
+        `True` if the early abandoning scan is expected to be faster
+    """
+    # The cost of the FFT convolution per subsequence is roughly `log2(n + m)`
+    return min(m, n_expected_terms + 2.0) < np.log2(n + m)
+
+
 def _mass_absolute(Q, T, p=2.0):
     """
     A wrapper around `cdist` for computing the non-normalized distance profile
@@ -1579,6 +1921,59 @@ def _mass_distance_matrix(Q, T, m, distance_matrix, μ_Q, σ_Q, M_T, Σ_T):
             distance_matrix[i, :] = _mass(Q[i : i + m], T, QT, μ_Q[i], σ_Q[i], M_T, Σ_T)
 
 
+@njit(
+    # "(i8, f8[:, :], f8[:], f8[:], b1[:], f8[:], f8[:], f8[:, :])",
+    parallel=True,
+    fastmath=True,
+)
+def _mass_distance_matrix_from_QT(
+    m, QT, μ_Q, σ_Q, Q_subseq_isfinite, M_T, Σ_T, distance_matrix
+):
+    """
+    A Numba JIT-compiled and parallelized function for computing the distance matrix
+    between the subsequences of `Q` and `T` from their (precomputed) sliding dot
+    products
+
+    Parameters
+    ----------
+    m : int
+        Window size
+
+    QT : numpy.ndarray
+        The sliding dot product between each subsequence of `Q` (rows) and `T`
+
+    μ_Q : numpy.ndarray
+        Sliding mean of `Q`
+
+    σ_Q : numpy.ndarray
+        Sliding standard deviation of `Q`
+
+    Q_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `Q` contains a
+        `np.nan`/`np.inf` value (False)
+
+    M_T : numpy.ndarray
+        Sliding mean of `T`
+
+    Σ_T : numpy.ndarray
+        Sliding standard deviation of `T`
+
+    distance_matrix : numpy.ndarray
+        The output distance matrix, which is updated in place
+
+    Returns
+    -------
+    None
+    """
+    for i in prange(distance_matrix.shape[0]):
+        if Q_subseq_isfinite[i]:
+            distance_matrix[i, :] = calculate_distance_profile(
+                m, QT[i], μ_Q[i], σ_Q[i], M_T, Σ_T
+            )
+        else:  # pragma: no cover
+            distance_matrix[i, :] = np.inf
+
+
 def mass_distance_matrix(Q, T, m, distance_matrix, M_T=None, Σ_T=None):
     """
     Compute the full distance matrix between all of the subsequences of `Q` and `T`
@@ -1862,78 +2257,498 @@ def preprocess_diagonal(T, m):
     return T, M_T, Σ_T_inverse, M_T_m_1, T_subseq_isfinite, T_subseq_isconstant
 
 
-def replace_distance(D, search_val, replace_val, epsilon=0.0):
+@njit
+def _two_sum(a, b):
     """
-    Replace values in distance array inplace
+    A Numba JIT-compiled function for computing the sum of two floats along with
+    the exact rounding error of that sum
 
     Parameters
     ----------
-    D : numpy.ndarray
-        Distance array
+    a : float
+        The first summand
 
-    search_val : float
-        Value to search for
-
-    replace_val : float
-        Value to replace with
+    b : float
+        The second summand
 
-    epsilon : float, default 0.0
-        Threshold below `search_val` in which to still allow for a replacement
+    Returns
+    -------
+    s : float
+        The (rounded) sum
 
-    Return
-    ------
-    None
+    e : float
+        The rounding error such that `s + e == a + b` exactly
     """
-    D[D == search_val - epsilon] = replace_val
+    s = a + b
+    b_virtual = s - a
+    e = (a - (s - b_virtual)) + (b - b_virtual)
 
+    return s, e
 
-def array_to_temp_file(a):
+
+@njit
+def _two_prod(a, b):
     """
-    Write an array to a file
+    A Numba JIT-compiled function for computing the product of two floats along with
+    the exact rounding error of that product (i.e., Dekker's algorithm)
 
     Parameters
     ----------
-    a : numpy.ndarray
-        A NumPy array to be written to a file
+    a : float
+        The first factor
+
+    b : float
+        The second factor
 
     Returns
     -------
-    fname : str
-        The output file name
+    p : float
+        The (rounded) product
+
+    e : float
+        The rounding error such that `p + e == a * b` exactly
     """
-    fname = tempfile.NamedTemporaryFile(delete=False)
-    fname = fname.name + ".npy"
-    np.save(fname, a, allow_pickle=False)
+    p = a * b
+    split = 134217729.0  # 2**27 + 1
+    t = split * a
+    a_hi = t - (t - a)
+    a_lo = a - a_hi
+    t = split * b
+    b_hi = t - (t - b)
+    b_lo = b - b_hi
+    e = ((a_hi * b_hi - p) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
 
-    return fname
+    return p, e
 
 
-@njit(
-    # "i8[:](i8[:], i8, i8, i8)",
-    fastmath=True,
-)
-def _count_diagonal_ndist(diags, m, n_A, n_B):
+@njit
+def _dd_add(a_hi, a_lo, b_hi, b_lo):
     """
-    Count the number of distances that would be computed for each diagonal index
-    referenced in `diags`
+    A Numba JIT-compiled function for adding two double-double numbers (i.e., an
+    unevaluated sum of a rounded value and its rounding error)
 
     Parameters
     ----------
-    diags : numpy.ndarray
-        The diagonal indices of interest
+    a_hi : float
+        The rounded value of the first summand
 
-    m : int
-        Window size
+    a_lo : float
+        The rounding error of the first summand
 
-    n_A : int
-        The length of time series `T_A`
+    b_hi : float
+        The rounded value of the second summand
 
-    n_B : int
-        The length of time series `T_B`
+    b_lo : float
+        The rounding error of the second summand
 
     Returns
     -------
-    diag_ndist_counts : numpy.ndarray
+    s_hi : float
+        The rounded value of the sum
+
+    s_lo : float
+        The rounding error of the sum
+    """
+    s, e = _two_sum(a_hi, b_hi)
+    t, f = _two_sum(a_lo, b_lo)
+    e += t
+    s, e = _two_sum(s, e)
+    e += f
+
+    return _two_sum(s, e)
+
+
+@njit(parallel=True)
+def _compute_mean_var_blockwise(T, m, block_size):
+    """
+    A Numba JIT-compiled and parallelized function for computing the sliding mean and
+    variance of a time series from cumulative sums that are re-anchored for every
+    block of (consecutive) subsequences
+
+    Each block of subsequences is centered on its own first value and its cumulative
+    sums are computed with compensated (double-double) summation. The window sums are
+    then differenced and the variance is computed in double-double arithmetic so that
+    no precision is lost by cancellation, regardless of the length of `T` or of how
+    far the level of `T` drifts.
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        Time series or sequence (without any `np.nan`/`np.inf` values)
+
+    m : int
+        Window size
+
+    block_size : int
+        The number of subsequences in each block
+
+    Returns
+    -------
+    M_T : numpy.ndarray
+        Sliding mean
+
+    var : numpy.ndarray
+        Sliding variance
+
+    var_scale : numpy.ndarray
+        The mean squared deviation of each subsequence from the anchor of its block,
+        which bounds the rounding error of `var`
+    """
+    l = T.shape[0] - m + 1
+    n_blocks = (l + block_size - 1) // block_size
+    M_T = np.empty(l, dtype=np.float64)
+    var = np.empty(l, dtype=np.float64)
+    var_scale = np.empty(l, dtype=np.float64)
+    for b in prange(n_blocks):
+        start = b * block_size
+        stop = min(start + block_size, l)
+        anchor = T[start]
+
+        k = stop - start + m - 1
+        S = np.zeros((2, k + 1), dtype=np.float64)
+        Q = np.zeros((2, k + 1), dtype=np.float64)
+        for j in range(k):
+            # The centered value is carried along with its rounding error
+            c_hi, c_lo = _two_sum(T[start + j], -anchor)
+            S[0, j + 1], S[1, j + 1] = _dd_add(S[0, j], S[1, j], c_hi, c_lo)
+            sq_hi, sq_lo = _two_prod(c_hi, c_hi)
+            sq_lo += c_lo * (2.0 * c_hi + c_lo)
+            Q[0, j + 1], Q[1, j + 1] = _dd_add(Q[0, j], Q[1, j], sq_hi, sq_lo)
+
+        for i in range(start, stop):
+            j = i - start
+            s_hi, s_lo = _dd_add(S[0, j + m], S[1, j + m], -S[0, j], -S[1, j])
+            q_hi, q_lo = _dd_add(Q[0, j + m], Q[1, j + m], -Q[0, j], -Q[1, j])
+
+            # The mean, `μ = s / m`, with the remainder of the division folded back in
+            μ_hi = s_hi / m
+            p_hi, p_lo = _two_prod(μ_hi, m)
+            μ_lo = ((s_hi - p_hi) - p_lo + s_lo) / m
+
+            # var = q / m - μ^2
+            e_hi = q_hi / m
+            p_hi, p_lo = _two_prod(e_hi, m)
+            e_lo = ((q_hi - p_hi) - p_lo + q_lo) / m
+            μ2_hi, μ2_lo = _two_prod(μ_hi, μ_hi)
+            μ2_lo += 2.0 * μ_hi * μ_lo
+            v_hi, v_lo = _dd_add(e_hi, e_lo, -μ2_hi, -μ2_lo)
+
+            M_T[i] = anchor + (μ_hi + μ_lo)
+            var[i] = v_hi + v_lo
+            var_scale[i] = e_hi
+
+    return M_T, var, var_scale
+
+
+def _preprocess_cumsum(T):
+    """
+    Preprocess a time series by computing the (window size independent) cumulative
+    counts that are needed to derive its sliding finiteness and constancy for any
+    window size in `O(n)` time
+
+    Creates a copy of the time series where all NaN and inf values are replaced with
+    zero.
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        Time series or sequence
+
+    Returns
+    -------
+    T : numpy.ndarray
+        Modified time series
+
+    T_nonfinite_cumsum : numpy.ndarray
+        Cumulative count of the `np.nan`/`np.inf` values in the time series
+
+    T_change_cumsum : numpy.ndarray
+        Cumulative count of the consecutive values in the modified time series that
+        differ from each other
+    """
+    T = _preprocess(T)
+    if T.ndim != 1:  # pragma: no cover
+        raise ValueError(f"T is {T.ndim}-dimensional and must be 1-dimensional. ")
+
+    T_isfinite = np.isfinite(T)
+    T[~T_isfinite] = 0.0
+
+    T_nonfinite_cumsum = np.zeros(T.shape[0] + 1, dtype=np.int64)
+    T_nonfinite_cumsum[1:] = np.cumsum(~T_isfinite)
+    T_change_cumsum = np.zeros(T.shape[0], dtype=np.int64)
+    T_change_cumsum[1:] = np.cumsum(T[1:] != T[:-1])
+
+    return T, T_nonfinite_cumsum, T_change_cumsum
+
+
+def _compute_mean_std_from_cumsum(T, m):
+    """
+    Compute the sliding mean and standard deviation for the (modified) time series
+    `T` with a window size of `m` from block-wise re-anchored cumulative sums in
+    `O(n)` time
+
+    Only (nearly) constant subsequences, whose variance is below the rounding error
+    of the cumulative sums, are recomputed directly
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        The modified time series (see `_preprocess_cumsum`)
+
+    m : int
+        Window size
+
+    Returns
+    -------
+    M_T : numpy.ndarray
+        Sliding mean
+
+    Σ_T : numpy.ndarray
+        Sliding standard deviation
+    """
+    # Re-anchoring at least every `m` subsequences keeps the overhead of the
+    # overlapping windows between blocks bounded
+    block_size = max(m, 1024)
+    M_T, var, var_scale = _compute_mean_var_blockwise(T, m, block_size)
+    Σ_T = np.sqrt(np.maximum(var, 0.0))
+
+    idx = np.flatnonzero(var <= 16.0 * np.finfo(np.float64).eps ** 2 * var_scale)
+    # The (chunked) direct computation is only applied to the spans of nearby
+    # subsequences that need it
+    for group in np.split(idx, np.flatnonzero(np.diff(idx) > m) + 1):
+        if group.shape[0] > 0:
+            start = group[0]
+            stop = group[-1] + m
+            M_T_span, Σ_T_span = compute_mean_std(T[start:stop], m)
+            M_T[group] = M_T_span[group - start]
+            Σ_T[group] = Σ_T_span[group - start]
+
+    return M_T, Σ_T
+
+
+def _preprocess_non_normalized_from_cumsum(T, m, T_nonfinite_cumsum, T_change_cumsum):
+    """
+    Derive the outputs of `preprocess_non_normalized` for a window size of `m` from
+    the cumulative sums of a time series in `O(n)` time
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        The modified time series (see `_preprocess_cumsum`)
+
+    m : int
+        Window size
+
+    T_nonfinite_cumsum : numpy.ndarray
+        Cumulative count of the `np.nan`/`np.inf` values in the time series
+
+    T_change_cumsum : numpy.ndarray
+        Cumulative count of the consecutive values in the modified time series that
+        differ from each other
+
+    Returns
+    -------
+    T : numpy.ndarray
+        Modified time series
+
+    T_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` contains a
+        `np.nan`/`np.inf` value (False)
+
+    T_subseq_isconstant : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` is constant
+        (True)
+    """
+    check_window_size(m, max_size=T.shape[-1])
+    T_subseq_isfinite = (T_nonfinite_cumsum[m:] - T_nonfinite_cumsum[:-m]) == 0
+    T_subseq_isconstant = (T_change_cumsum[m - 1 :] - T_change_cumsum[: -m + 1]) == 0
+
+    return T, T_subseq_isfinite, T_subseq_isconstant
+
+
+def _preprocess_diagonal_from_cumsum(T, m, T_nonfinite_cumsum, T_change_cumsum):
+    """
+    Derive the outputs of `preprocess_diagonal` for a window size of `m` from the
+    cumulative sums of a time series in `O(n)` time (i.e., without materializing any
+    rolling windows)
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        The modified time series (see `_preprocess_cumsum`)
+
+    m : int
+        Window size
+
+    T_nonfinite_cumsum : numpy.ndarray
+        Cumulative count of the `np.nan`/`np.inf` values in the time series
+
+    T_change_cumsum : numpy.ndarray
+        Cumulative count of the consecutive values in the modified time series that
+        differ from each other
+
+    Returns
+    -------
+    T : numpy.ndarray
+        Modified time series
+
+    M_T : numpy.ndarray
+        Rolling mean with a subsequence length of `m`
+
+    Σ_T_inverse : numpy.ndarray
+        Inverted rolling standard deviation
+
+    M_T_m_1 : numpy.ndarray
+        Rolling mean with a subsequence length of `m-1`
+
+    T_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` contains a
+        `np.nan`/`np.inf` value (False)
+
+    T_subseq_isconstant : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` is constant (True)
+    """
+    T, T_subseq_isfinite, T_subseq_isconstant = _preprocess_non_normalized_from_cumsum(
+        T, m, T_nonfinite_cumsum, T_change_cumsum
+    )
+    M_T, Σ_T = _compute_mean_std_from_cumsum(T, m)
+    Σ_T[T_subseq_isconstant] = 1.0  # Avoid divide by zero in next inversion step
+    Σ_T_inverse = 1.0 / Σ_T
+    M_T_m_1, _ = _compute_mean_std_from_cumsum(T, m - 1)
+
+    return T, M_T, Σ_T_inverse, M_T_m_1, T_subseq_isfinite, T_subseq_isconstant
+
+
+def replace_distance(D, search_val, replace_val, epsilon=0.0):
+    """
+    Replace values in distance array inplace
+
+    Parameters
+    ----------
+    D : numpy.ndarray
+        Distance array
+
+    search_val : float
+        Value to search for
+
+    replace_val : float
+        Value to replace with
+
+    epsilon : float, default 0.0
+        Threshold below `search_val` in which to still allow for a replacement
+
+    Return
+    ------
+    None
+    """
+    D[D == search_val - epsilon] = replace_val
+
+
+def array_to_temp_file(a):
+    """
+    Write an array to a file
+
+    Parameters
+    ----------
+    a : numpy.ndarray
+        A NumPy array to be written to a file
+
+    Returns
+    -------
+    fname : str
+        The output file name
+    """
+    fname = tempfile.NamedTemporaryFile(delete=False)
+    fname = fname.name + ".npy"
+    np.save(fname, a, allow_pickle=False)
+
+    return fname
+
+
+def _get_npz_path(path):
+    """
+    Append a `.npz` extension to a file name (or path) if it does not already have one
+    (as `np.savez` does)
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The file name (or path)
+
+    Returns
+    -------
+    path : str
+        The file name (or path) with a `.npz` extension
+    """
+    path = os.fspath(path)
+    if not path.endswith(".npz"):
+        path = path + ".npz"
+
+    return path
+
+
+def _savez_atomic(path, **arrays):
+    """
+    Save several arrays into a single (uncompressed) `.npz` file atomically so that an
+    interrupted save never leaves a partially written file behind
+
+    The arrays are first written to a temporary file in the same directory which then
+    replaces the target file.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The file name (or path). A `.npz` extension is appended to the file name if it
+        does not already have one.
+
+    **arrays : dict
+        The arrays to save
+
+    Returns
+    -------
+    None
+    """
+    path = _get_npz_path(path)
+    fd, tmp_path = tempfile.mkstemp(
+        suffix=".npz", dir=os.path.dirname(os.path.abspath(path))
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+@njit(
+    # "i8[:](i8[:], i8, i8, i8)",
+    fastmath=True,
+)
+def _count_diagonal_ndist(diags, m, n_A, n_B):
+    """
+    Count the number of distances that would be computed for each diagonal index
+    referenced in `diags`
+
+    Parameters
+    ----------
+    diags : numpy.ndarray
+        The diagonal indices of interest
+
+    m : int
+        Window size
+
+    n_A : int
+        The length of time series `T_A`
+
+    n_B : int
+        The length of time series `T_B`
+
+    Returns
+    -------
+    diag_ndist_counts : numpy.ndarray
         Counts of distances computed along each diagonal of interest
     """
     diag_ndist_counts = np.zeros(diags.shape[0], dtype=np.int64)
@@ -2199,6 +3014,232 @@ def _get_partial_mp_func(mp_func, client=None, device_id=None):
     return partial_mp_func
 
 
+def _share_bsf_radius(name, radius):
+    """
+    Offer a best-so-far radius to a cluster-wide best-so-far radius that is stored
+    in a Dask `Variable` and return the (updated) cluster-wide best-so-far radius
+
+    Parameters
+    ----------
+    name : str
+        The name of the Dask `Variable` (and `Lock`) for the cluster-wide best-so-far
+        radius
+
+    radius : float
+        The best-so-far radius found by the caller
+
+    Returns
+    -------
+    bsf_radius : float
+        The cluster-wide best-so-far radius
+    """
+    from dask.distributed import Lock, Variable
+
+    bsf_radius_var = Variable(name)
+    bsf_radius = bsf_radius_var.get()
+    if radius < bsf_radius:
+        with Lock(name):
+            bsf_radius = bsf_radius_var.get()
+            if radius < bsf_radius:
+                bsf_radius_var.set(radius)
+                bsf_radius = radius
+
+    return bsf_radius
+
+
+class _shared_bsf_radius:
+    """
+    A callable for sharing a best-so-far radius with a Dask cluster (see
+    `_share_bsf_radius`)
+
+    To avoid a round trip to the scheduler on every call, the cluster-wide best-so-far
+    radius is only read (and updated) when the offered radius improves upon the last
+    radius that was offered or, otherwise, once every
+    `config.STUMPY_OSTINATO_SHARE_INTERVAL` calls. In between, the last cluster-wide
+    best-so-far radius that was read is returned.
+
+    Parameters
+    ----------
+    name : str
+        The name of the Dask `Variable` (and `Lock`) for the cluster-wide best-so-far
+        radius
+    """
+
+    def __init__(self, name):
+        """
+        Initialize the callable
+
+        Parameters
+        ----------
+        name : str
+            The name of the Dask `Variable` (and `Lock`) for the cluster-wide
+            best-so-far radius
+        """
+        self._name = name
+        self._offered_radius = np.inf
+        self._bsf_radius = np.inf
+        # Ensure that the cluster-wide best-so-far radius is read by the first call
+        self._n_calls = config.STUMPY_OSTINATO_SHARE_INTERVAL
+
+    def __call__(self, radius):
+        """
+        Offer a best-so-far radius and return the cluster-wide best-so-far radius
+
+        Parameters
+        ----------
+        radius : float
+            The best-so-far radius found by the caller
+
+        Returns
+        -------
+        bsf_radius : float
+            The (last read) cluster-wide best-so-far radius
+        """
+        self._n_calls += 1
+        if (
+            radius < self._offered_radius
+            or self._n_calls >= config.STUMPY_OSTINATO_SHARE_INTERVAL
+        ):
+            self._bsf_radius = _share_bsf_radius(self._name, radius)
+            self._offered_radius = min(self._offered_radius, radius)
+            self._n_calls = 0
+
+        return self._bsf_radius
+
+
+_pool_func = None
+
+
+def _initialize_pool_worker(n_threads, func=None):
+    """
+    Initialize a (spawned) worker process of a process pool
+
+    Parameters
+    ----------
+    n_threads : int
+        The number of Numba threads that the worker process may use
+
+    func : function, default None
+        The function that is called by `_call_pool_func` in this worker process. This
+        is sent to each worker process only once (rather than with every task).
+
+    Returns
+    -------
+    None
+    """
+    global _pool_func
+    numba.set_num_threads(n_threads)
+    _pool_func = func
+
+
+def _call_pool_func(*args, **kwargs):
+    """
+    Call the function that was set by `_initialize_pool_worker` in a worker process
+
+    Parameters
+    ----------
+    *args : tuple
+        The positional arguments of the function
+
+    **kwargs : dict
+        The keyword arguments of the function
+
+    Returns
+    -------
+    out : object
+        The output of the function
+    """
+    return _pool_func(*args, **kwargs)
+
+
+def _get_client_nworkers(client):
+    """
+    Get the number of workers in a distributed cluster
+
+    Parameters
+    ----------
+    client : client
+        A Dask or Ray Distributed client. Setting up a distributed cluster is beyond
+        the scope of this library. Please refer to the Dask or Ray Distributed
+        documentation.
+
+    Returns
+    -------
+    nworkers : int
+        The number of workers in the cluster
+    """
+    if hasattr(client, "ncores"):
+        # Dask
+        return max(1, len(client.ncores()))
+    elif hasattr(client, "nodes"):  # pragma: no cover
+        # Ray
+        return max(1, len(client.nodes()))
+    else:  # pragma: no cover
+        return 1
+
+
+def _get_pool_executor(n_tasks, workers=1, client=None, func=None):
+    """
+    Get an executor for evaluating independent tasks (e.g., the matrix profiles for
+    different window sizes) concurrently
+
+    Parameters
+    ----------
+    n_tasks : int
+        The number of tasks to be evaluated
+
+    workers : int, default 1
+        The maximum number of local processes. Each process is restricted to an even
+        share of the Numba threads in order to avoid oversubscription. This parameter
+        is ignored when `client` is not `None`.
+
+    client : client, default None
+        A Dask or Ray Distributed client. When `client` is not `None`, a thread pool
+        with (at most) one thread per cluster worker is returned so that the tasks
+        are submitted to the cluster concurrently.
+
+    func : function, default None
+        A function (e.g., a `functools.partial` that holds the large inputs that are
+        shared by all of the tasks) that is sent once to each process and that is
+        called with `_call_pool_func`. This parameter is ignored when `client` is not
+        `None`.
+
+    Returns
+    -------
+    executor : concurrent.futures.Executor
+        A thread pool (when `client` is not `None`) or a (spawned) process pool. When
+        the tasks should be evaluated serially (i.e., `n_tasks < 2` or `workers < 2`),
+        `None` is returned instead.
+
+    Notes
+    -----
+    Since new processes are spawned (rather than forked) for thread safety, the
+    calling script must be guarded with `if __name__ == "__main__":`. Spawning
+    processes (and compiling the Numba functions in each of them) is expensive so a
+    process pool should be reused for as many tasks as possible.
+    """
+    if n_tasks < 2:
+        return None
+
+    if client is not None:
+        workers = min(_get_client_nworkers(client), n_tasks)
+        if workers < 2:
+            return None
+        return ThreadPoolExecutor(max_workers=workers)
+
+    workers = min(int(workers), n_tasks)
+    if workers < 2:
+        return None
+
+    n_threads = max(1, numba.config.NUMBA_NUM_THREADS // workers)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_initialize_pool_worker,
+        initargs=(n_threads, func),
+    )
+
+
 def _jagged_list_to_array(a, fill_value, dtype):
     """
     Fits a 2d jagged list into a 2d numpy array of the specified dtype.
@@ -2604,45 +3645,310 @@ def _bfs_indices(n, fill_value=None):
     return out
 
 
-def _contrast_pan(pan, threshold, bfs_indices, n_processed):
+def _get_pan_array(n_rows, n_cols, dtype=np.float64, mmap_path=None):
+    """
+    Allocate a (raw) pan matrix profile where all values are set to `np.inf`
+
+    Parameters
+    ----------
+    n_rows : int
+        The number of rows (i.e., subsequence window sizes)
+
+    n_cols : int
+        The number of columns (i.e., the length of the time series)
+
+    dtype : dtype, default np.float64
+        The data type of the pan matrix profile
+
+    mmap_path : str, default None
+        The path of a `.npy` file in which the pan matrix profile is stored as a
+        memory-mapped array. Any existing file is overwritten. When
+        `mmap_path = None`, the pan matrix profile is stored in memory.
+
+    Returns
+    -------
+    pan : numpy.ndarray
+        The pan matrix profile
+    """
+    if mmap_path is None:
+        return np.full((n_rows, n_cols), fill_value=np.inf, dtype=dtype)
+
+    pan = np.lib.format.open_memmap(
+        mmap_path, mode="w+", dtype=dtype, shape=(n_rows, n_cols)
+    )
+    pan[:] = np.inf
+
+    return pan
+
+
+def _get_normalized_pan_rows(pan, rows, norm=None):
+    """
+    Copy the requested rows of the pan matrix profile (in its own dtype) with all
+    `np.inf` values replaced by `np.nan` and, optionally, normalize them
+
+    Parameters
+    ----------
+    pan : numpy.ndarray
+        The pan matrix profile
+
+    rows : numpy.ndarray
+        The row indices to copy
+
+    norm : numpy.ndarray, default None
+        The normalization factor for each of the requested rows. When
+        `norm = None`, the rows are not normalized.
+
+    Returns
+    -------
+    out : numpy.ndarray
+        The (normalized) rows
+    """
+    out = np.array(pan[rows])
+    out[out == np.inf] = np.nan
+    if norm is not None:
+        out[:] = np.minimum(1.0, out * norm[:, np.newaxis])
+
+    return out
+
+
+def _get_pan_percentiles(
+    pan, pos, bfs_indices, n_processed, norm=None, max_values=None
+):
     """
-    Center the pan matrix profile (inplace) around the desired distance threshold
-    in order to increase the contrast
+    Compute the percentile of each of the (normalized) values in the rows,
+    `bfs_indices[pos]`, relative to all of the values in the rows of the pan matrix
+    profile where a matrix profile was actually computed
+
+    The percentiles are identical to those obtained by (stably) ranking all of the
+    values at once but the processed rows are only sorted one chunk at a time so that
+    no copy of the entire pan matrix profile is needed.
 
     Parameters
     ----------
     pan : numpy.ndarray
         The pan matrix profile
 
+    pos : numpy.ndarray
+        The breadth-first-search positions (i.e., less than `n_processed`) of the
+        rows to compute the percentiles for
+
+    bfs_indices : numpy.ndarray
+        The breadth-first-search indices
+
+    n_processed : numpy.ndarray
+        The number of breadth-first-search indices that have been processed
+
+    norm : numpy.ndarray, default None
+        The normalization factor for each of the breadth-first-search indices. When
+        `norm = None`, the values are not normalized.
+
+    max_values : int, default None
+        The maximum number of values to sort at a time. When `max_values = None`,
+        this is set to the larger of `2**20` and the number of requested values.
+
+    Returns
+    -------
+    percentile : numpy.ndarray
+        The percentile of each value in `pan[bfs_indices[pos]]`
+    """
+    n_cols = pan.shape[1]
+    l = n_processed * n_cols
+    pos = np.asarray(pos, dtype=np.int64)
+    if max_values is None:
+        max_values = max(2**20, pos.shape[0] * n_cols)
+    max_rows = max(1, max_values // max(1, n_cols))
+
+    row_norm = None
+    if norm is not None:
+        row_norm = norm[pos]
+    v = _get_normalized_pan_rows(pan, bfs_indices[pos], row_norm).ravel()
+    # The position of each requested value within the flattened processed rows
+    p = (pos[:, np.newaxis] * n_cols + np.arange(n_cols)).ravel()
+
+    ranks = np.zeros(v.shape[0], dtype=np.int64)
+    for start in range(0, n_processed, max_rows):
+        stop = min(start + max_rows, n_processed)
+        chunk_norm = None
+        if norm is not None:
+            chunk_norm = norm[start:stop]
+        chunk = _get_normalized_pan_rows(
+            pan, bfs_indices[start:stop], chunk_norm
+        ).ravel()
+        order = np.argsort(chunk, kind="mergesort")
+        sorted_chunk = chunk[order]
+
+        # Equal values before (after) a requested value precede (follow) it
+        lo = np.searchsorted(sorted_chunk, v, side="left")
+        hi = np.searchsorted(sorted_chunk, v, side="right")
+        is_after = p >= stop * n_cols
+        is_before = p < start * n_cols
+        ranks[is_after] += hi[is_after]
+        ranks[is_before] += lo[is_before]
+
+        is_inside = ~is_after & ~is_before
+        if np.any(is_inside):
+            # The stable sort keeps equal values in their original order and so the
+            # group of equal values and the position within the chunk together form
+            # an increasing key (note that `np.nan` values are considered equal)
+            C = chunk.shape[0]
+            is_new = np.ones(C, dtype=bool)
+            is_new[1:] = ~(
+                (sorted_chunk[1:] == sorted_chunk[:-1])
+                | (np.isnan(sorted_chunk[1:]) & np.isnan(sorted_chunk[:-1]))
+            )
+            group = np.cumsum(is_new) - 1
+            key = group * C + order
+            q_key = group[lo[is_inside]] * C + (p[is_inside] - start * n_cols)
+            ranks[is_inside] += np.searchsorted(key, q_key, side="left")
+
+    percentile = ranks.astype(np.float64)
+    if l > 1:
+        # Identical to `np.linspace(0, 1, l)[ranks]` without materializing it
+        percentile *= 1.0 / (l - 1)
+        percentile[ranks == l - 1] = 1.0
+
+    return percentile.reshape(pos.shape[0], n_cols)
+
+
+def _apply_pan_transforms(out, threshold, percentile=None, binary=True, clip=True):
+    """
+    Contrast, binarize, and clip (inplace) the (normalized) values of the pan matrix
+    profile
+
+    Parameters
+    ----------
+    out : numpy.ndarray
+        The (normalized) values to transform
+
+    threshold : float
+        The distance `threshold` in which to center the pan matrix profile around
+        for best contrast and this value is also used for binarizing the pan matrix
+        profile
+
+    percentile : numpy.ndarray, default None
+        The percentile of each value in `out`. When `percentile = None`, contrast is
+        not performed.
+
+    binary : bool, default True
+        A flag for whether or not the values are binarized
+
+    clip : bool, default True
+        A flag for whether or not the values are clipped between `0.0` and `1.0`
+
+    Returns
+    -------
+    None
+    """
+    if percentile is not None:
+        out[:] = 1.0 / (1.0 + np.exp(-10 * (percentile - threshold)))
+    if binary:
+        out[:] = np.where(out <= threshold, 0.0, 1.0)
+    if clip:
+        out[:] = np.clip(out, 0.0, 1.0)
+
+
+def _transform_pan_rows(
+    pan,
+    rows,
+    threshold,
+    bfs_indices,
+    n_processed,
+    norm=None,
+    contrast=True,
+    binary=True,
+    clip=True,
+):
+    """
+    Transform (i.e., normalize, contrast, binarize, clip, and repeat) only the
+    requested rows of the pan matrix profile
+
+    Every row is replaced by the closest row at or below it where a matrix profile
+    was actually computed and the transformations are then applied (inplace) on a
+    copy of these rows only. All values that are left undefined are set to `np.nan`.
+
+    Parameters
+    ----------
+    pan : numpy.ndarray
+        The pan matrix profile
+
+    rows : numpy.ndarray
+        The (sorted) row indices to transform
+
     threshold : float
-        The distance threshold value in which to center the pan matrix profile around
+        The distance `threshold` in which to center the pan matrix profile around
+        for best contrast and this value is also used for binarizing the pan matrix
+        profile
 
     bfs_indices : numpy.ndarray
         The breadth-first-search indices
 
     n_processed : numpy.ndarray
-        The number of breadth-first-search indices to apply contrast to
+        The number of breadth-first-search indices that have been processed
+
+    norm : numpy.ndarray, default None
+        The normalization factor for each of the breadth-first-search indices. When
+        `norm = None`, normalization is not performed.
+
+    contrast : bool, default True
+        A flag for whether or not the rows are contrasted based on the percentile of
+        each value relative to all of the processed values (see
+        `_get_pan_percentiles`)
+
+    binary : bool, default True
+        A flag for whether or not the rows are binarized
+
+    clip : bool, default True
+        A flag for whether or not the rows are clipped between `0.0` and `1.0`
 
     Returns
     -------
-    None
+    out : numpy.ndarray
+        The transformed rows
     """
     idx = bfs_indices[:n_processed]
-    l = n_processed * pan.shape[1]
-    tmp = pan[idx].argsort(kind="mergesort", axis=None)
-    ranks = np.empty(l, dtype=np.int64)
-    ranks[tmp] = np.arange(l).astype(np.int64)
+    sorted_idx = np.sort(idx)
+    bfs_pos = np.empty(pan.shape[0], dtype=np.int64)
+    bfs_pos[idx] = np.arange(n_processed)
+
+    rows = np.asarray(rows, dtype=np.int64)
+    src_idx = np.searchsorted(sorted_idx, rows)
+    is_repeated = src_idx < sorted_idx.shape[0]
+    src = rows.copy()
+    src[is_repeated] = sorted_idx[src_idx[is_repeated]]
+
+    out = np.array(pan[src])
+    out[out == np.inf] = np.nan
+
+    pos, inverse = np.unique(bfs_pos[src[is_repeated]], return_inverse=True)
+    row_norm = None
+    if norm is not None:
+        row_norm = norm[pos]
+    processed_rows = _get_normalized_pan_rows(pan, idx[pos], row_norm)
+    percentile = None
+    if contrast:
+        percentile = _get_pan_percentiles(pan, pos, bfs_indices, n_processed, norm)
+    _apply_pan_transforms(
+        processed_rows, threshold, percentile=percentile, binary=binary, clip=clip
+    )
+    out[is_repeated] = processed_rows[inverse]
 
-    percentile = np.full(ranks.shape, np.nan)
-    percentile[:l] = np.linspace(0, 1, l)
-    percentile = percentile[ranks].reshape(pan[idx].shape)
-    pan[idx] = 1.0 / (1.0 + np.exp(-10 * (percentile - threshold)))
+    return out
 
 
-def _binarize_pan(pan, threshold, bfs_indices, n_processed):
+def _get_pan_nanmax(
+    pan,
+    threshold,
+    bfs_indices,
+    n_processed,
+    norm=None,
+    contrast=True,
+    binary=True,
+    clip=True,
+    max_rows=None,
+):
     """
-    Binarize the pan matrix profile (inplace) such all values below the `threshold`
-    are set to `0.0` and all values above the `threshold` are set to `1.0`.
+    Compute the maximum (non-NaN) value of the transformed pan matrix profile without
+    transforming all of its rows at once
 
     Parameters
     ----------
@@ -2650,20 +3956,74 @@ def _binarize_pan(pan, threshold, bfs_indices, n_processed):
         The pan matrix profile
 
     threshold : float
-        The distance threshold value in which to center the pan matrix profile around
+        The distance `threshold` in which to center the pan matrix profile around
+        for best contrast and this value is also used for binarizing the pan matrix
+        profile
 
     bfs_indices : numpy.ndarray
         The breadth-first-search indices
 
     n_processed : numpy.ndarray
-        The number of breadth-first-search indices to binarize
+        The number of breadth-first-search indices that have been processed
+
+    norm : numpy.ndarray, default None
+        The normalization factor for each of the breadth-first-search indices
+
+    contrast : bool, default True
+        A flag for whether or not the values are contrasted
+
+    binary : bool, default True
+        A flag for whether or not the rows are binarized
+
+    clip : bool, default True
+        A flag for whether or not the rows are clipped between `0.0` and `1.0`
+
+    max_rows : int, default None
+        The maximum number of rows to transform at a time. When `max_rows = None`,
+        this is set so that roughly `2**20` values are transformed at a time.
 
     Returns
     -------
-    None
-    """
-    idx = bfs_indices[:n_processed]
-    pan[idx] = np.where(pan[idx] <= threshold, 0.0, 1.0)
+    nanmax : float
+        The maximum (non-NaN) value. If all values are NaN, then `np.nan` is
+        returned.
+    """
+    if n_processed == 0:
+        return np.nan
+
+    if contrast:
+        # Every processed value (including `np.nan`) is replaced by its contrasted
+        # percentile and all of the remaining transformations are non-decreasing.
+        # So, the maximum is attained by the largest percentile.
+        out = np.array([0.0])
+        if n_processed * pan.shape[1] > 1:
+            out[0] = 1.0
+        _apply_pan_transforms(
+            out, threshold, percentile=out.copy(), binary=binary, clip=clip
+        )
+        return out[0]
+
+    if max_rows is None:
+        max_rows = max(1, 2**20 // max(1, pan.shape[1]))
+
+    sorted_idx = np.sort(bfs_indices[:n_processed])
+    nanmax = np.nan
+    for start in range(0, sorted_idx.shape[0], max_rows):
+        rows = sorted_idx[start : start + max_rows]
+        out = _transform_pan_rows(
+            pan,
+            rows,
+            threshold,
+            bfs_indices,
+            n_processed,
+            norm=norm,
+            contrast=False,
+            binary=binary,
+            clip=clip,
+        )
+        nanmax = np.fmax(nanmax, np.fmax.reduce(out, axis=None))
+
+    return nanmax
 
 
 def _select_P_ABBA_value(P_ABBA, k, custom_func=None):
@@ -2714,6 +4074,345 @@ def _select_P_ABBA_value(P_ABBA, k, custom_func=None):
     return MPdist
 
 
+@njit(fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+def _sorted_replace(a, old, new):
+    """
+    Remove one occurrence of `old` from the sorted array, `a`, and insert `new` into
+    `a` so that `a` remains sorted (with `np.nan` values placed at the end). The array,
+    `a`, is updated in place.
+
+    Parameters
+    ----------
+    a : numpy.ndarray
+        A sorted 1-dimensional array that contains `old`
+
+    old : float
+        The value to be removed from `a`
+
+    new : float
+        The value to be inserted into `a`
+
+    Returns
+    -------
+    None
+    """
+    n = a.shape[0]
+    if np.isnan(old):
+        old_idx = n - 1
+    else:
+        old_idx = np.searchsorted(a, old)
+
+    if np.isnan(new):
+        new_idx = n
+    else:
+        new_idx = np.searchsorted(a, new)
+
+    if new_idx > old_idx:
+        a[old_idx : new_idx - 1] = a[old_idx + 1 : new_idx]
+        a[new_idx - 1] = new
+    else:
+        a[new_idx + 1 : old_idx + 1] = a[new_idx:old_idx].copy()
+        a[new_idx] = new
+
+
+@njit(fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+def _select_partial_P_ABBA_value(P_AB, P_BA, k):
+    """
+    Return the same `P_ABBA` value as `_select_P_ABBA_value` (without `custom_func`)
+    for the concatenation of the unsorted array, `P_AB`, and the sorted array, `P_BA`,
+    by partitioning `P_AB` and only the `k + 1` smallest values of `P_BA`
+
+    Parameters
+    ----------
+    P_AB : numpy.ndarray
+        An unsorted array
+
+    P_BA : numpy.ndarray
+        A sorted array (with `np.nan` values placed at the end)
+
+    k : int
+        Specify the `k`th value in the concatenated matrix profiles to return
+
+    Returns
+    -------
+    MPdist : float
+        The matrix profile distance
+    """
+    n_AB = P_AB.shape[0]
+    k = min(k, n_AB + P_BA.shape[0] - 1)
+    n_BA = min(k + 1, P_BA.shape[0])
+
+    P_ABBA = np.empty(n_AB + n_BA, dtype=np.float64)
+    P_ABBA[:n_AB] = P_AB
+    P_ABBA[n_AB:] = P_BA[:n_BA]
+    partition = np.partition(P_ABBA, k)
+    MPdist = partition[k]
+    if not np.isfinite(MPdist):
+        # Return the largest finite value amongst the `k` smallest values instead
+        n_finite = 0
+        for i in range(k):
+            if np.isfinite(partition[i]):
+                if n_finite == 0 or partition[i] > MPdist:
+                    MPdist = partition[i]
+                n_finite += 1
+        if n_finite == 0 and k > 0:
+            MPdist = np.sort(partition[:k])[0]
+
+    return MPdist
+
+
+@njit(
+    # "(f8[:, :], f8[:], i8, i8[:, :], f8[:])",
+    parallel=True,
+    fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+)
+def _compute_P_ABBA_values(rolling_row_min, col_min, k, ranges, MPdist_vect):
+    """
+    A Numba JIT-compiled and parallelized function for selecting the `k`th smallest
+    `P_ABBA` value for every window of the distance matrix. For each range of windows,
+    the sliding window of column minima is kept sorted and is updated incrementally
+    (one removal and one insertion per window) while the rolling row minima are only
+    partitioned (together with the `k + 1` smallest column minima) so that no window
+    requires a full sort.
+
+    Parameters
+    ----------
+    rolling_row_min : numpy.ndarray
+        The rolling (window size `j`) minimum of every row of the distance matrix
+
+    col_min : numpy.ndarray
+        The minimum of every column of the distance matrix
+
+    k : int
+        Specify the `k`th value in the concatenated matrix profiles to return
+
+    ranges : numpy.ndarray
+        The (start, stop) windows that are processed by each thread
+
+    MPdist_vect : numpy.ndarray
+        The output array of mpdist values, which is updated in place
+
+    Returns
+    -------
+    None
+    """
+    j = rolling_row_min.shape[0]
+    for thread_idx in prange(ranges.shape[0]):
+        start, stop = ranges[thread_idx]
+        if stop <= start:
+            continue
+
+        P_BA = np.sort(col_min[start : start + j])
+        for i in range(start, stop):
+            if i > start:
+                _sorted_replace(P_BA, col_min[i - 1], col_min[i + j - 1])
+            MPdist_vect[i] = _select_partial_P_ABBA_value(
+                rolling_row_min[:, i], P_BA, k
+            )
+
+
+@njit(
+    # "(f8[:, :], f8[:, :], f8[:, :], i8)",
+    parallel=True,
+    fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+)
+def _update_rolling_row_min(suffix_min, D, rolling_row_min, offset):
+    """
+    A Numba JIT-compiled and parallelized function for computing the rolling (window
+    size `j`) minimum of every row of the distance matrix from a new block of its
+    columns and the suffix minima of the (`j - 1`) columns that precede the block
+
+    Parameters
+    ----------
+    suffix_min : numpy.ndarray
+        The `j x (j - 1)` suffix minima of the `j - 1` columns that precede `D`, where
+        `suffix_min[:, c]` is the minimum of the `c`th through the last of these
+        columns. This is updated in place for the last `j - 1` columns of `D`.
+
+    D : numpy.ndarray
+        A block of columns of the distance matrix
+
+    rolling_row_min : numpy.ndarray
+        The output array of the rolling minima, which is updated in place. The rolling
+        minimum of the window that ends with the `t`th column of `D` is stored in
+        column `t + offset` (and it is not stored when `t + offset < 0`).
+
+    offset : int
+        The offset of the output columns in `rolling_row_min`
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    The columns of `D` are processed in chunks of (at most) `j - 1` columns so that
+    every window consists of a suffix of the preceding columns and a prefix of the
+    chunk (van Herk/Gil-Werman). Non-finite distances (i.e., `np.nan`) are ignored.
+    """
+    j = suffix_min.shape[0]
+    w = max(1, j - 1)
+    n_cols = D.shape[1]
+    for r in prange(j):
+        for chunk_start in range(0, n_cols, w):
+            n = min(w, n_cols - chunk_start)
+            prefix_min = np.inf
+            for t in range(n):
+                if D[r, chunk_start + t] < prefix_min:
+                    prefix_min = D[r, chunk_start + t]
+                idx = chunk_start + t + offset
+                if idx >= 0:
+                    if j > 1 and suffix_min[r, t] < prefix_min:
+                        rolling_row_min[r, idx] = suffix_min[r, t]
+                    else:
+                        rolling_row_min[r, idx] = prefix_min
+
+            if j == 1:
+                continue
+
+            # Shift the suffix minima by `n` columns and append the chunk
+            for c in range(j - 1 - n):
+                suffix_min[r, c] = min(suffix_min[r, c + n], prefix_min)
+            suffix_min_c = np.inf
+            for c in range(j - 2, j - 2 - n, -1):
+                value = D[r, chunk_start + n - (j - 1) + c]
+                if value < suffix_min_c:
+                    suffix_min_c = value
+                suffix_min[r, c] = suffix_min_c
+
+
+def _get_mpdist_vect_block_size(j, l):
+    """
+    Get the number of columns of the `j x l` distance matrix that are processed at
+    once by `_compute_mpdist_vect` so that its `j x (2b + j - 1)` intermediate arrays
+    fit within `config.STUMPY_MPDIST_MEMORY_BUDGET` bytes
+
+    Parameters
+    ----------
+    j : int
+        The number of subsequences in `Q`
+
+    l : int
+        The number of subsequences in `T`
+
+    Returns
+    -------
+    b : int
+        The number of columns per block
+    """
+    itemsize = np.dtype(np.float64).itemsize
+    n_elements = config.STUMPY_MPDIST_MEMORY_BUDGET // itemsize
+    b = (n_elements // j - j + 1) // 2
+    if b < 1:
+        raise ValueError(
+            f"Computing the mpdist vector for {j} subsequences requires at least "
+            f"{j * (j + 1) * itemsize} bytes but `config.STUMPY_MPDIST_MEMORY_BUDGET` "
+            f"is set to {config.STUMPY_MPDIST_MEMORY_BUDGET} bytes. Please increase "
+            "`config.STUMPY_MPDIST_MEMORY_BUDGET`."
+        )
+
+    return min(b, l)
+
+
+def _compute_mpdist_vect(compute_distance_matrix, j, l, k, custom_func=None):
+    """
+    Compute the matrix profile distance measure vector from blocks of columns of the
+    distance matrix so that the full `j x l` distance matrix is never allocated
+
+    Parameters
+    ----------
+    compute_distance_matrix : function
+        A function with the signature `compute_distance_matrix(start, stop, D)` that
+        fills the distance matrix, `D`, with the distances between all of the `j`
+        subsequences of `Q` and the subsequences of `T` that start at indices `start`
+        through `stop - 1`
+
+    j : int
+        The number of subsequences in `Q`
+
+    l : int
+        The number of subsequences in `T`
+
+    k : int
+        Specify the `k`th value in the concatenated matrix profiles to return. This
+        parameter is ignored when `custom_func` is not None.
+
+    custom_func : object, default None
+        A custom user defined function for selecting the desired value from the
+        unsorted `P_ABBA` array. This function may need to leverage `functools.partial`
+        and should take `P_ABBA` as its only input parameter and return a single
+        `MPdist` value. The `k` parameter is ignored when `custom_func` is not None.
+
+    Returns
+    -------
+    MPdist_vect : numpy.ndarray
+        The mpdist-based distance profile of `Q` with `T`
+
+    Notes
+    -----
+    Every column of the distance matrix is computed exactly once. The columns are
+    processed in blocks of `b` columns and only the column minima and the suffix
+    minima of every row over the last `j - 1` columns are carried forward from one
+    block to the next. `b` is chosen so that the `j x (2b + j - 1)` intermediate
+    arrays fit within `config.STUMPY_MPDIST_MEMORY_BUDGET` bytes and a `ValueError`
+    is raised when this is not possible (i.e., when `b < 1`).
+    """
+    n_vect = l - j + 1
+    MPdist_vect = np.empty(n_vect, dtype=np.float64)
+    P_ABBA = np.empty(2 * j, dtype=np.float64)
+
+    k = min(int(k), P_ABBA.shape[0] - 1)
+
+    n_threads = numba.config.NUMBA_NUM_THREADS
+
+    b = _get_mpdist_vect_block_size(j, l)
+    # Flat buffers ensure that every (smaller) block is C-contiguous
+    D_buffer = np.empty(j * b, dtype=np.float64)
+    rolling_row_min_buffer = np.empty(j * b, dtype=np.float64)
+    suffix_min = np.full((j, max(0, j - 1)), np.inf, dtype=np.float64)
+    col_min = np.empty(l, dtype=np.float64)
+
+    for start in range(0, l, b):
+        stop = min(start + b, l)
+        D = D_buffer[: j * (stop - start)].reshape(j, -1)
+        D[:, :] = np.inf
+        compute_distance_matrix(start, stop, D)
+        col_min[start:stop] = np.nanmin(D, axis=0)
+
+        # Only the (complete) windows that end with the columns of this block
+        vect_start = max(0, start - j + 1)
+        vect_stop = max(vect_start, stop - j + 1)
+        rolling_row_min = rolling_row_min_buffer[
+            : j * (vect_stop - vect_start)
+        ].reshape(j, -1)
+        _update_rolling_row_min(
+            suffix_min, D, rolling_row_min, start - j + 1 - vect_start
+        )
+        if vect_stop == vect_start:
+            continue
+
+        if custom_func is None:
+            ranges = _get_array_ranges(
+                np.ones(vect_stop - vect_start, dtype=np.int64), n_threads, False
+            )
+            _compute_P_ABBA_values(
+                rolling_row_min,
+                col_min[vect_start : vect_stop + j - 1],
+                k,
+                ranges,
+                MPdist_vect[vect_start:vect_stop],
+            )
+        else:
+            for i in range(vect_stop - vect_start):
+                P_ABBA[:j] = rolling_row_min[:, i]
+                P_ABBA[j:] = col_min[vect_start + i : vect_start + i + j]
+                MPdist_vect[vect_start + i] = _select_P_ABBA_value(
+                    P_ABBA, k, custom_func
+                )
+
+    return MPdist_vect
+
+
 @njit
 def _merge_topk_PI(PA, PB, IA, IB):
     """
@@ -2909,6 +4608,57 @@ def _shift_insert_at_index(a, idx, v, shift="right"):
             a[idx] = v
 
 
+@njit(
+    # "(f8[:], f8[:, :], i8[:, :], i8)",
+    parallel=True,
+)
+def _update_incremental_PI(D, P, I, I_offset):
+    """
+    Update the (top-k) matrix profile and matrix profile indices (in place) with the
+    distance profile, `D`, of a newly ingressed subsequence. The newly ingressed
+    subsequence must correspond to the last row of `P` (and `I`) and it is inserted
+    into the top-k of all other rows (in parallel) whenever it is closer than their
+    current k-th nearest neighbor. Then, the last row of `P` (and `I`) is overwritten
+    by the top-k of `D`.
+
+    Parameters
+    ----------
+    D : numpy.ndarray
+        The distance profile of the newly ingressed subsequence with respect to all
+        subsequences that correspond to the rows of `P`
+
+    P : numpy.ndarray
+        The (top-k) matrix profile, sorted in ascending order per row, with exactly
+        `len(D)` rows
+
+    I : numpy.ndarray
+        The (top-k) matrix profile indices with exactly `len(D)` rows
+
+    I_offset : int
+        The offset that is added to the row index of each subsequence (e.g., the number
+        of data points that have been egressed) before it is stored in `I`
+
+    Returns
+    -------
+    None
+    """
+    j = D.shape[0] - 1
+
+    for i in prange(j):
+        if D[i] < P[i, -1]:
+            idx = np.searchsorted(P[i], D[i], side="right")
+            _shift_insert_at_index(P[i], idx, D[i])
+            _shift_insert_at_index(I[i], idx, j + I_offset)
+
+    P[j] = np.inf
+    I[j] = -1
+    for i in range(D.shape[0]):
+        if D[i] < P[j, -1]:
+            idx = np.searchsorted(P[j], D[i], side="right")
+            _shift_insert_at_index(P[j], idx, D[i])
+            _shift_insert_at_index(I[j], idx, i + I_offset)
+
+
 def _check_P(P, threshold=1e-6):
     """
     Check if the 1-dimensional matrix profile values are too small and
@@ -2934,6 +4684,197 @@ def _check_P(P, threshold=1e-6):
         warnings.warn(msg)
 
 
+def _concatenate_series(Ts, m):
+    """
+    Concatenate a collection of 1-dimensional time series into a single time series
+    and identify the subsequences that are fully contained within one time series
+
+    Parameters
+    ----------
+    Ts : list
+        A list of 1-dimensional time series (or a 2-dimensional array where each row
+        is a time series)
+
+    m : int
+        Window size
+
+    Returns
+    -------
+    T : numpy.ndarray
+        The concatenated time series
+
+    T_starts : numpy.ndarray
+        The start index of each time series within `T`
+
+    T_subseq_isvalid : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` is fully contained
+        within one of the original time series (True) or straddles two or more time
+        series (False)
+
+    Notes
+    -----
+    Since every subsequence that straddles two adjacent time series is invalid,
+    the valid subsequences of different time series are always separated by at
+    least `m - 1` invalid subsequences
+    """
+    Ts = [_preprocess(T) for T in Ts]
+    for T in Ts:
+        if T.ndim != 1:  # pragma: no cover
+            raise ValueError(
+                f"T is {T.ndim}-dimensional and all time series must be "
+                "1-dimensional"
+            )
+
+    T_lengths = np.array([T.shape[0] for T in Ts], dtype=np.int64)
+    T_starts = np.zeros(len(Ts), dtype=np.int64)
+    T_starts[1:] = np.cumsum(T_lengths)[:-1]
+    T = np.concatenate(Ts)
+    check_window_size(m, max_size=T.shape[0])
+
+    T_subseq_isvalid = np.zeros(T.shape[0] - m + 1, dtype=bool)
+    for start, length in zip(T_starts, T_lengths):
+        if length >= m:
+            T_subseq_isvalid[start : start + length - m + 1] = True
+
+    return T, T_starts, T_subseq_isvalid
+
+
+def _find_series_matches(
+    D, excl_zone, T_starts, max_distance=None, max_matches=None, atol=1e-8
+):
+    """
+    Find all matches of a query `Q` across a collection of time series whose
+    concatenated distance profile is `D` (see `_concatenate_series`)
+
+    Parameters
+    ----------
+    D : numpy.ndarray
+        The distance profile of `Q` with the concatenated time series. Subsequences
+        that straddle two or more time series must have a distance of `np.inf`.
+
+    excl_zone : int
+        Size of the exclusion zone
+
+    T_starts : numpy.ndarray
+        The start index of each time series within the concatenated time series
+
+    max_distance : float or function, default None
+        Maximum distance between `Q` and a subsequence `S` for `S` to be considered a
+        match. See `_find_matches`.
+
+    max_matches : int, default None
+        The maximum amount of similar occurrences to be returned across all of the
+        time series. If `None`, then all occurrences are returned.
+
+    atol : float, default 1e-8
+        The absolute tolerance parameter. This value will be added to `max_distance`
+        when comparing distances between subsequences.
+
+    Returns
+    -------
+    distances : numpy.ndarray
+        The (float64) distances of the matches, sorted by distance (lowest to highest)
+
+    series_indices : numpy.ndarray
+        The (int64) index of the time series that contains each match
+
+    indices : numpy.ndarray
+        The (int64) start index of each match within its time series
+
+    Notes
+    -----
+    Since `excl_zone` is smaller than the `m - 1` invalid subsequences that separate
+    adjacent time series, an exclusion zone never reaches into another time series
+    and selecting the matches of the concatenated distance profile is identical to
+    selecting the matches within each time series separately.
+    """
+    distances, indices = _find_matches(
+        D,
+        excl_zone,
+        max_distance=max_distance,
+        max_matches=max_matches,
+        atol=atol,
+    )
+    series_indices = np.searchsorted(T_starts, indices, side="right") - 1
+
+    return distances, series_indices, indices - T_starts[series_indices]
+
+
+@njit(
+    # "Tuple((f8[:], i8[:]))(f8[:], i8, f8, i8, i8, f8)",
+    fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+)
+def _select_matches(D, excl_zone, max_distance, max_matches, query_idx, atol):
+    """
+    A Numba JIT-compiled function for selecting the matches from a distance profile,
+    `D`, in order of increasing distance while skipping any candidate that falls
+    within the exclusion zone of a previously selected match.
+
+    Only the candidates that are within `max_distance` are sorted so that the
+    cost is `O(n + c log c)`, where `c` is the number of candidates.
+
+    Parameters
+    ----------
+    D : numpy.ndarray
+        The distance profile of `Q` with `T`
+
+    excl_zone : int
+        Size of the exclusion zone
+
+    max_distance : float
+        Maximum distance between `Q` and a subsequence `S` for `S` to be considered a
+        match
+
+    max_matches : int
+        The maximum amount of similar occurrences to be returned
+
+    query_idx : int
+        This is the index position along the time series, `T`, where the query
+        subsequence, `Q`, is located. This will always be selected first. A negative
+        value indicates that there is no query index.
+
+    atol : float
+        The absolute tolerance parameter. This value will be added to `max_distance`
+        when comparing distances between subsequences.
+
+    Returns
+    -------
+    distances : numpy.ndarray
+        The distances of the matches, sorted from lowest to highest
+
+    indices : numpy.ndarray
+        The start indices of the matches
+    """
+    l = D.shape[0]
+    threshold = max_distance + atol
+    excluded = np.zeros(l, dtype=np.bool_)
+    distances = np.empty(min(l, max_matches), dtype=np.float64)
+    indices = np.empty(min(l, max_matches), dtype=np.int64)
+
+    candidates = np.flatnonzero(np.isfinite(D) & (D <= threshold))
+    # A stable sort ensures that ties are resolved by the smallest index
+    candidates = candidates[np.argsort(D[candidates], kind="mergesort")]
+
+    n_matches = 0
+    if query_idx >= 0:
+        if not np.isfinite(D[query_idx]) or D[query_idx] > threshold:
+            return distances[:0], indices[:0]
+        candidates = np.concatenate((np.array([query_idx]), candidates))
+
+    for idx in candidates:
+        if n_matches >= max_matches:
+            break
+        if excluded[idx]:
+            continue
+
+        distances[n_matches] = D[idx]
+        indices[n_matches] = idx
+        n_matches += 1
+        excluded[max(0, idx - excl_zone) : min(l, idx + excl_zone + 1)] = True
+
+    return distances[:n_matches], indices[:n_matches]
+
+
 def _find_matches(
     D, excl_zone, max_distance=None, max_matches=None, query_idx=None, atol=1e-8
 ):
@@ -2981,19 +4922,20 @@ def _find_matches(
 
     Returns
     -------
-    out : numpy.ndarray
-        The first column consists of values selected from `D`. These are the distances
-        of subsequences of `T` whose distances to `Q` are less than or equal to
-        `max_distance`, sorted by distance (lowest to highest). The second column
-        consists of the corresponding indices in `D`. These are in fact the start index
+    distances : numpy.ndarray
+        The (float64) values selected from `D`. These are the distances of
+        subsequences of `T` whose distances to `Q` are less than or equal to
+        `max_distance`, sorted by distance (lowest to highest).
+
+    indices : numpy.ndarray
+        The (int64) corresponding indices in `D`. These are in fact the start index
         of susequences in `T` selected as the match of `Q`.
 
     """
-    D = D.copy()
     if max_distance is None:
 
         def max_distance(D):
-            D_copy = D.copy().astype(np.float64)
+            D_copy = D.astype(np.float64)
             D_copy[np.isinf(D_copy)] = np.nan
             return np.nanmax(
                 [np.nanmean(D_copy) - 2.0 * np.nanstd(D_copy), np.nanmin(D_copy)]
@@ -3002,28 +4944,47 @@ def _find_matches(
     if not isinstance(max_distance, float):
         max_distance = max_distance(D)
 
-    if max_matches is None:
-        max_matches = np.inf
+    if max_matches is None or max_matches > len(D):
+        max_matches = len(D)
 
-    if query_idx is not None:
-        candidate_idx = query_idx
-    else:
-        candidate_idx = np.argmin(D)
+    if query_idx is None:
+        query_idx = -1
 
-    matches = []
-    for _ in range(len(D)):
-        if (
-            D[candidate_idx] > atol + max_distance
-            or ~np.isfinite(D[candidate_idx])
-            or len(matches) >= max_matches
-        ):
-            break
+    return _select_matches(
+        D.astype(np.float64),
+        excl_zone,
+        float(max_distance),
+        int(max_matches),
+        int(query_idx),
+        atol,
+    )
+
+
+def _matches_to_array(*columns):
+    """
+    Stack the columns of the matches (e.g., the output of `_find_matches`) into the
+    `dtype=object` array that is returned by the public matching functions, which
+    keeps the distances as floats and the indices as integers
+
+    Parameters
+    ----------
+    columns : numpy.ndarray
+        The columns of the matches, which must all have the same length
+
+    Returns
+    -------
+    out : numpy.ndarray
+        The `dtype=object` array whose `i`th column consists of `columns[i]`. When
+        there are no matches, an empty 1D array is returned instead.
+    """
+    if columns[0].shape[0] == 0:
+        return np.empty(0, dtype=object)
 
-        matches.append([D[candidate_idx], candidate_idx])
-        apply_exclusion_zone(D, candidate_idx, excl_zone, np.inf)
-        candidate_idx = np.argmin(D)
+    out = np.empty((columns[0].shape[0], len(columns)), dtype=object)
+    for i, column in enumerate(columns):
+        out[:, i] = column
 
-    return np.array(matches, dtype=object)
+    return out
 
 
 @cuda.jit(device=True)
@@ -3,9 +3,11 @@
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
 import copy
+import functools
 
 import numpy as np
 import scipy.stats
+from numba import njit
 
 from . import core, config
 
@@ -47,42 +49,38 @@ def _nnmark(I):
     return nnmark.cumsum()
 
 
-def _iac(
-    width, bidirectional=True, n_iter=1000, n_samples=1000, seed=0
-):  # pragma: no cover
+@functools.lru_cache(maxsize=128)
+def _fit_iac(width, bidirectional, n_iter, n_samples, seed):  # pragma: no cover
     """
-    Compute the bidirectional idealized arc curve (IAC). This is based
-    on a beta distribution that is scaled with a width that is identical
-    to the length of the matrix profile index. The height of the idealized
-    parabolic curve is assumed to be exactly half the width.
-
-    If `bidirectional=False` then the 1-dimensional IAC is computed instead.
+    Fit a beta distribution, scaled to `width`, to the arc curve of a randomly
+    generated idealized matrix profile index. Since the fit is deterministic for a
+    given `seed`, the results for the most recently used arguments are memoized and
+    must not be modified in place.
 
     Parameters
     ----------
     width : int
-        The width of the bidirectional idealized arc curve. This is equal
-        to the length of the matrix profile index.
+        The width of the idealized arc curve. This is equal to the length of the
+        matrix profile index.
 
-    bidirectional : bool, default True
-        Flag for computing a bidirectional (`True`) or 1-dimensional (`False`)
+    bidirectional : bool
+        Flag for fitting a bidirectional (`True`) or 1-dimensional (`False`)
         idealized arc curve
 
-    n_iter : int, default 1000
+    n_iter : int
         Number of iterations to average over when determining the parameters for
         beta distribution
 
-    n_samples : int, default 1000
+    n_samples : int
         Number of distribution samples to draw during each iteration
 
-    seed : int, default 0
-        NumPy random seed used in sampling the beta distribution. Set this to your
-        desired value for reproducibility purposes. The default value is set to `0`.
+    seed : int
+        NumPy random seed used in sampling the beta distribution
 
     Returns
     -------
     IAC : numpy.ndarray
-        Idealized arc curve (IAC)
+        A read-only idealized arc curve (IAC)
     """
     np.random.seed(seed)
 
@@ -112,6 +110,58 @@ def _iac(
     slope, _, _, _ = np.linalg.lstsq(IAC.reshape(-1, 1), target_AC, rcond=None)
 
     IAC *= slope
+    IAC.flags.writeable = False
+
+    return IAC
+
+
+def _iac(
+    width, bidirectional=True, n_iter=1000, n_samples=1000, seed=0
+):  # pragma: no cover
+    """
+    Compute the bidirectional idealized arc curve (IAC). For a bidirectional matrix
+    profile index, this is the analytic parabolic curve with a width that is identical
+    to the length of the matrix profile index and a height that is exactly half the
+    width.
+
+    If `bidirectional=False` then the 1-dimensional IAC is computed instead. This is
+    based on a beta distribution that is fit to a randomly generated idealized
+    1-dimensional matrix profile index and then scaled by the width. This fit is
+    memoized so that it is only computed once for the same set of parameters.
+
+    Parameters
+    ----------
+    width : int
+        The width of the bidirectional idealized arc curve. This is equal
+        to the length of the matrix profile index.
+
+    bidirectional : bool, default True
+        Flag for computing a bidirectional (`True`) or 1-dimensional (`False`)
+        idealized arc curve
+
+    n_iter : int, default 1000
+        Number of iterations to average over when determining the parameters for
+        beta distribution. This parameter is ignored when `bidirectional=True`.
+
+    n_samples : int, default 1000
+        Number of distribution samples to draw during each iteration. This parameter
+        is ignored when `bidirectional=True`.
+
+    seed : int, default 0
+        NumPy random seed used in sampling the beta distribution. Set this to your
+        desired value for reproducibility purposes. The default value is set to `0`.
+        This parameter is ignored when `bidirectional=True`.
+
+    Returns
+    -------
+    IAC : numpy.ndarray
+        Idealized arc curve (IAC)
+    """
+    if bidirectional:
+        x = np.arange(width, dtype=np.float64)
+        IAC = 2.0 * x * (width - x) / width
+    else:
+        IAC = _fit_iac(width, False, n_iter, n_samples, seed).copy()
 
     return IAC
 
@@ -164,12 +214,40 @@ def _cac(I, L, bidirectional=True, excl_factor=5, custom_iac=None, seed=0):
     """
     k = I.shape[0]
     AC = _nnmark(I)
-    CAC = np.zeros(k, dtype=np.float64)
 
     if custom_iac is None:
         IAC = _iac(k, bidirectional, seed=seed)
     else:
         IAC = custom_iac
+
+    return _correct_arc_curve(AC, IAC, L, excl_factor)
+
+
+def _correct_arc_curve(AC, IAC, L, excl_factor=5):
+    """
+    Correct the arc curve (AC) with an idealized arc curve (IAC)
+
+    Parameters
+    ----------
+    AC : numpy.ndarray
+        The arc curve (i.e., the counts of nearest neighbor overhead crossings)
+
+    IAC : numpy.ndarray
+        The idealized arc curve (IAC) that will used for correcting the arc curve
+
+    L : int
+        The subsequence length that is set roughly to be one period length.
+
+    excl_factor : int, default 5
+        The multiplying factor for the first and last regime exclusion zones
+
+    Returns
+    -------
+    output : numpy.ndarray
+        A corrected arc curve (CAC)
+    """
+    CAC = np.zeros(AC.shape[0], dtype=np.float64)
+
     IAC[IAC == 0.0] = 10**-10  # Avoid divide by zero
     CAC[:] = AC / IAC
     CAC[CAC > 1.0] = 1.0  # Equivalent to min
@@ -295,6 +373,201 @@ def fluss(I, L, n_regimes, excl_factor=5, custom_iac=None):
     return cac, regime_locs
 
 
+@njit(fastmath=True)
+def _update_nnmark_diff(nnmark_diff, i, I_old, I_new):
+    """
+    Replace the nearest neighbor arc of the subsequence at index `i` within the
+    difference array of the arc curve so that its cumulative sum is equal to the
+    `_nnmark` output of the updated matrix profile indices.
+
+    Parameters
+    ----------
+    nnmark_diff : numpy.ndarray
+        The difference array of the nearest neighbor overhead crossings or arcs.
+        This is updated in place.
+
+    i : int
+        The subsequence index whose nearest neighbor arc is replaced
+
+    I_old : int
+        The (relative) matrix profile index of the arc to be removed
+
+    I_new : int
+        The (relative) matrix profile index of the arc to be added
+
+    Returns
+    -------
+    None
+    """
+    # Index values that are less than zero are replaced with their own
+    # positional index (see `_nnmark`)
+    j = I_old
+    if j < 0:
+        j = i
+    nnmark_diff[min(i, j)] -= 1
+    nnmark_diff[max(i, j)] += 1
+
+    j = I_new
+    if j < 0:
+        j = i
+    nnmark_diff[min(i, j)] += 1
+    nnmark_diff[max(i, j)] -= 1
+
+
+@njit(fastmath=True)
+def _update_right_mp(mp, D, nnmark_diff, I_new, n_appended):
+    """
+    Replace (in place) the right nearest neighbor of every subsequence that is closer
+    to the newly ingressed subsequence than to its current right nearest neighbor and
+    update the difference array of the arc curve accordingly
+
+    Parameters
+    ----------
+    mp : numpy.ndarray
+        The matrix profile, where the first column consists of the (right) matrix
+        profile and the fourth column consists of the right matrix profile indices
+
+    D : numpy.ndarray
+        The distance profile of the newly ingressed subsequence
+
+    nnmark_diff : numpy.ndarray
+        The difference array of the nearest neighbor overhead crossings or arcs.
+        This is updated in place.
+
+    I_new : int
+        The (absolute) index of the newly ingressed subsequence
+
+    n_appended : int
+        The total number of data points that have been ingressed, which is used to
+        convert absolute indices into relative indices
+
+    Returns
+    -------
+    None
+    """
+    for i in range(D.shape[0]):
+        if D[i] < mp[i, 0]:
+            _update_nnmark_diff(
+                nnmark_diff,
+                i,
+                np.int64(mp[i, 3]) - n_appended,
+                I_new - n_appended,
+            )
+            mp[i, 0] = D[i]
+            mp[i, 3] = I_new
+
+
+@njit(fastmath=True)
+def _update_distance_profile(D, QT, T, t_drop, M_T, Σ_T, T_subseq_isfinite):
+    """
+    A Numba JIT-compiled function for updating the sliding dot product, `QT`, (in
+    place) after the oldest data point, `t_drop`, has been egressed from and a new data
+    point has been ingressed into the time series, `T`, and then computing the
+    z-normalized distance profile of the last subsequence in `T` (in place)
+
+    Parameters
+    ----------
+    D : numpy.ndarray
+        The output distance profile
+
+    QT : numpy.ndarray
+        The sliding dot product between the last subsequence of `T` and all of the
+        subsequences of `T` prior to the egress/ingress
+
+    T : numpy.ndarray
+        The time series after the egress/ingress with all non-finite values replaced
+        by zero
+
+    t_drop : float
+        The (finite) data point that was egressed from `T`
+
+    M_T : numpy.ndarray
+        Sliding mean of `T`, including that of the last subsequence
+
+    Σ_T : numpy.ndarray
+        Sliding standard deviation of `T`, including that of the last subsequence
+
+    T_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` contains a
+        `np.nan`/`np.inf` value (False)
+
+    Returns
+    -------
+    None
+    """
+    k = QT.shape[0]
+    m = T.shape[0] - k + 1
+    t = T[-1]
+
+    for i in range(1, k):
+        QT[i] = QT[i] - T[i - 1] * t_drop + T[i + m - 1] * t
+    QT[0] = np.dot(T[:m], T[k - 1 :])
+
+    for i in range(k):
+        if T_subseq_isfinite[i] and T_subseq_isfinite[-1]:
+            D[i] = np.sqrt(
+                core._calculate_squared_distance(
+                    m, QT[i], M_T[-1], Σ_T[-1], M_T[i], Σ_T[i]
+                )
+            )
+        else:
+            D[i] = np.inf
+
+
+@njit(fastmath=True)
+def _update_aamp_distance_profile(D, p_norm, T, t_drop, T_subseq_isfinite):
+    """
+    A Numba JIT-compiled function for updating the squared (i.e., `p=2`) non-normalized
+    distance profile, `p_norm`, (in place) after the oldest data point, `t_drop`, has
+    been egressed from and a new data point has been ingressed into the time series,
+    `T`, and then computing the non-normalized distance profile of the last
+    subsequence in `T` (in place)
+
+    Parameters
+    ----------
+    D : numpy.ndarray
+        The output distance profile
+
+    p_norm : numpy.ndarray
+        The squared non-normalized distance profile of the last subsequence of `T`
+        prior to the egress/ingress
+
+    T : numpy.ndarray
+        The time series after the egress/ingress with all non-finite values replaced
+        by zero
+
+    t_drop : float
+        The (finite) data point that was egressed from `T`
+
+    T_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` contains a
+        `np.nan`/`np.inf` value (False)
+
+    Returns
+    -------
+    None
+    """
+    k = p_norm.shape[0]
+    m = T.shape[0] - k + 1
+    t = T[-1]
+
+    for i in range(1, k):
+        p_norm[i] = (
+            p_norm[i]
+            - (T[i - 1] - t_drop) * (T[i - 1] - t_drop)
+            + (T[i + m - 1] - t) * (T[i + m - 1] - t)
+        )
+    p_norm[0] = np.sum((T[:m] - T[k - 1 :]) * (T[:m] - T[k - 1 :]))
+
+    for i in range(k):
+        if p_norm[i] < config.STUMPY_P_NORM_THRESHOLD:
+            p_norm[i] = 0.0
+        if T_subseq_isfinite[i] and T_subseq_isfinite[-1]:
+            D[i] = np.sqrt(p_norm[i])
+        else:
+            D[i] = np.inf
+
+
 class floss:
     """
     Compute the Fast Low-cost Online Semantic Segmentation (FLOSS) for
@@ -457,7 +730,7 @@ class floss:
             When set to `True`, this z-normalizes subsequences prior to computing
             distances
         """
-        self._mp = copy.deepcopy(np.asarray(mp))
+        self._mp = np.array(mp, dtype=np.float64)
         self._T = copy.deepcopy(np.asarray(T))
         self._m = m
         self._L = L
@@ -473,7 +746,10 @@ class floss:
         self._T_isfinite = np.isfinite(self._T)
         self._finite_T = self._T.copy()
         self._finite_T[~np.isfinite(self._finite_T)] = 0.0
-        self._finite_Q = self._finite_T[-self._m :].copy()
+        excl_zone = int(np.ceil(self._m / config.STUMPY_EXCL_ZONE_DENOM))
+        # Note that the start of the exclusion zone is relative to
+        # the unchanging length of the matrix profile index
+        self._zone_start = max(0, self._k - excl_zone)
 
         if self._custom_iac is None:  # pragma: no cover
             self._custom_iac = _iac(
@@ -513,6 +789,72 @@ class floss:
         self._mp[inf_indices, 3] = inf_indices
 
         self._cac = np.ones(self._k, dtype=np.float64) * -1
+        # The arc curve is maintained as a difference array (relative to the number
+        # of ingressed data points) and the CAC is only materialized when requested
+        self._nnmark_diff = np.diff(_nnmark(self._mp[:, 3]), prepend=0)
+        self._cac_is_stale = False
+
+        # The rolling statistics and the sliding dot product (or the squared distance
+        # profile) of the last subsequence are maintained incrementally
+        self._T_subseq_isfinite = core.rolling_isfinite(self._T_isfinite, self._m)
+        finite_Q = self._finite_T[-self._m :]
+        if self._normalize:
+            _, self._M_T, self._Σ_T = core.preprocess(self._T, self._m)
+            self._QT = core.sliding_dot_product(finite_Q, self._finite_T)
+        else:
+            self._p_norm = np.square(core._mass_absolute(finite_Q, self._finite_T))
+        self._D = np.empty(self._k, dtype=np.float64)
+
+        # Every array that egresses its oldest value on each update is a view into a
+        # preallocated buffer that is `n` elements longer than the array. This way,
+        # `update` only needs to advance the views by one element instead of shifting
+        # the arrays and the views are moved back to the start of the buffers once
+        # every `n` updates.
+        rolling_names = [
+            "_T",
+            "_T_isfinite",
+            "_finite_T",
+            "_T_subseq_isfinite",
+            "_mp",
+            "_nnmark_diff",
+        ]
+        if self._normalize:
+            rolling_names += ["_M_T", "_Σ_T"]
+        self._buffers = {}
+        for name in rolling_names:
+            a = getattr(self, name)
+            buffer = np.empty((a.shape[0] + self._n,) + a.shape[1:], dtype=a.dtype)
+            buffer[: a.shape[0]] = a
+            self._buffers[name] = buffer
+            setattr(self, name, buffer[: a.shape[0]])
+        self._buffer_start = 0
+
+    def _egress(self):
+        """
+        Egress the oldest value from each of the rolling arrays by advancing their
+        views into the preallocated buffers by one element. The last element of each
+        array is left for the ingress to fill.
+
+        Returns
+        -------
+        None
+        """
+        start = self._buffer_start
+        if start == self._n:
+            # Copy the remaining values back to the start of the buffers. Note that
+            # the source and destination never overlap since each array is at most
+            # `n` elements long.
+            for name, buffer in self._buffers.items():
+                l = getattr(self, name).shape[0]
+                buffer[: l - 1] = buffer[start + 1 : start + l]
+            start = 0
+        else:
+            start += 1
+
+        for name, buffer in self._buffers.items():
+            l = getattr(self, name).shape[0]
+            setattr(self, name, buffer[start : start + l])
+        self._buffer_start = start
 
     def update(self, t):
         """
@@ -535,56 +877,65 @@ class floss:
         This is the implementation for Fast Low-cost Online Semantic
         Segmentation (FLOSS).
         """
-        self._T[:-1] = self._T[1:]
-        self._T_isfinite[:-1] = self._T_isfinite[1:]
-        self._finite_T[:-1] = self._finite_T[1:]
-        self._finite_Q[:-1] = self._finite_Q[1:]
+        t_drop = self._finite_T[self._k - 1]
+
+        # Egress
+        # Remove the arc of the first element from the arc curve and then
+        # remove the first element from all of the rolling arrays, which shifts the
+        # arc curve to be relative to the newly ingressed data point
+        _update_nnmark_diff(
+            self._nnmark_diff, 0, np.int64(self._mp[0, 3]) - self._n_appended, -1
+        )
+        self._egress()
+
+        # Ingress
         self._T[-1] = t
         self._T_isfinite[-1] = np.isfinite(t)
-        self._finite_T[-1] = t
-        if not np.isfinite(t):
+        if self._T_isfinite[-1]:
+            self._finite_T[-1] = t
+        else:
             self._finite_T[-1] = 0.0
-        self._finite_Q[-1] = self._finite_T[-1]
-        excl_zone = int(np.ceil(self._m / config.STUMPY_EXCL_ZONE_DENOM))
-        # Note that the start of the exclusion zone is relative to
-        # the unchanging length of the matrix profile index
-        zone_start = max(0, self._k - excl_zone)
-
-        # Egress
-        # Remove the first element in the matrix profile index
-        # Shift mp up by one and replace the last row with new values
-        self._mp[:-1, :] = self._mp[1:, :]
+        self._T_subseq_isfinite[-1] = np.all(self._T_isfinite[-self._m :])
         self._mp[-1, 0] = np.inf
+        self._mp[-1, 1] = -1
+        self._mp[-1, 2] = -1
         self._mp[-1, 3] = self._last_idx
+        self._nnmark_diff[-1] = 0
+        _update_nnmark_diff(
+            self._nnmark_diff,
+            self._k - 1,
+            -1,
+            self._last_idx - self._n_appended - 1,
+        )
 
-        # Ingress
+        # Only the rolling statistics of the last subsequence need to be computed
+        D = self._D
         if self._normalize:
-            M_T, Σ_T = core.compute_mean_std(self._T, self._m)
-            D = core.mass(self._finite_Q, self._finite_T, M_T, Σ_T)
+            _, M_T, Σ_T = core.preprocess(self._T[-self._m :], self._m)
+            self._M_T[-1] = M_T[0]
+            self._Σ_T[-1] = Σ_T[0]
+            _update_distance_profile(
+                D,
+                self._QT,
+                self._finite_T,
+                t_drop,
+                self._M_T,
+                self._Σ_T,
+                self._T_subseq_isfinite,
+            )
         else:
-            D = core.mass_absolute(self._T[-self._m :], self._T)
-
-        D[zone_start:] = np.inf
-
-        T_subseq_isfinite = core.rolling_isfinite(self._T_isfinite, self._m)
+            _update_aamp_distance_profile(
+                D, self._p_norm, self._finite_T, t_drop, self._T_subseq_isfinite
+            )
 
-        D[~T_subseq_isfinite] = np.inf
-        if not T_subseq_isfinite[-1]:
-            D[:] = np.inf
+        D[self._zone_start :] = np.inf
 
         # Update nearest neighbor for old data if any old subsequences
         # are closer to the newly arrived subsequence
-        update_idx = np.argwhere(D < self._mp[:, 0]).flatten()
-        self._mp[update_idx, 0] = D[update_idx]
-        self._mp[update_idx, 3] = self._last_idx
-
-        self._cac[:] = _cac(
-            self._mp[:, 3] - self._n_appended - 1,
-            self._L,
-            bidirectional=False,
-            excl_factor=self._excl_factor,
-            custom_iac=self._custom_iac,
+        _update_right_mp(
+            self._mp, D, self._nnmark_diff, self._last_idx, self._n_appended + 1
         )
+        self._cac_is_stale = True
 
         self._last_idx += 1
         self._n_appended += 1
@@ -594,6 +945,15 @@ class floss:
         """
         Get the updated 1-dimensional corrected arc curve (CAC_1D)
         """
+        if self._cac_is_stale:
+            self._cac[:] = _correct_arc_curve(
+                np.cumsum(self._nnmark_diff),
+                self._custom_iac,
+                self._L,
+                excl_factor=self._excl_factor,
+            )
+            self._cac_is_stale = False
+
         return self._cac.astype(np.float64)
 
     @property
@@ -2,6 +2,7 @@
 # Copyright 2019 TD Ameritrade. Released under the terms of the 3-Clause BSD license.
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
+import numpy as np
 from . import gpu_aamp
 from .aamp_stimp import _aamp_stimp
 
@@ -38,6 +39,17 @@ class gpu_aamp_stimp(_aamp_stimp):
     p : float, default 2.0
         The p-norm to apply for computing the Minkowski distance.
 
+    dtype : dtype, default np.float64
+        The data type in which the (raw) pan matrix profile is stored in host memory.
+        The GPU devices compute the non-normalized distances in `np.float64` and each
+        matrix profile is only cast to `dtype` after it has been copied back to the
+        host.
+
+    mmap_path : str, default None
+        The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+        a memory-mapped array (rather than in memory). Any existing file is
+        overwritten.
+
     Attributes
     ----------
     PAN_ : numpy.ndarray
@@ -69,6 +81,8 @@ class gpu_aamp_stimp(_aamp_stimp):
         step=1,
         device_id=0,
         p=2.0,
+        dtype=np.float64,
+        mmap_path=None,
     ):
         """
         Initialize the `stimp` object and compute the Pan Matrix Profile
@@ -98,6 +112,17 @@ class gpu_aamp_stimp(_aamp_stimp):
 
         p : float, default 2.0
             The p-norm to apply for computing the Minkowski distance.
+
+        dtype : dtype, default np.float64
+            The data type in which the (raw) pan matrix profile is stored in host
+            memory. The GPU devices compute the non-normalized distances in `np.float64`
+            and each matrix profile is only cast to `dtype` after it has been copied
+            back to the host.
+
+        mmap_path : str, default None
+            The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+            a memory-mapped array (rather than in memory). Any existing file is
+            overwritten.
         """
         super().__init__(
             T,
@@ -109,4 +134,6 @@ class gpu_aamp_stimp(_aamp_stimp):
             device_id=device_id,
             mp_func=gpu_aamp,
             p=2.0,
+            dtype=dtype,
+            mmap_path=mmap_path,
         )
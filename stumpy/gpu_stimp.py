@@ -2,6 +2,7 @@
 # Copyright 2019 TD Ameritrade. Released under the terms of the 3-Clause BSD license.
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
+import numpy as np
 from . import core, gpu_stump
 from .gpu_aamp_stimp import gpu_aamp_stimp
 from .stimp import _stimp
@@ -50,6 +51,16 @@ class gpu_stimp(_stimp):
         The p-norm to apply for computing the Minkowski distance. This parameter is
         ignored when `normalize == True`.
 
+    dtype : dtype, default np.float64
+        The data type in which the (raw) pan matrix profile is stored in host memory.
+        The GPU devices compute in `np.float64` and each matrix profile is only cast to
+        `dtype` after it has been copied back to the host.
+
+    mmap_path : str, default None
+        The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+        a memory-mapped array (rather than in memory). Any existing file is
+        overwritten.
+
     Attributes
     ----------
     PAN_ : numpy.ndarray
@@ -101,6 +112,8 @@ class gpu_stimp(_stimp):
         device_id=0,
         normalize=True,
         p=2.0,
+        dtype=np.float64,
+        mmap_path=None,
     ):
         """
         Initialize the `stimp` object and compute the Pan Matrix Profile
@@ -137,6 +150,16 @@ class gpu_stimp(_stimp):
         p : float, default 2.0
             The p-norm to apply for computing the Minkowski distance. This parameter is
             ignored when `normalize == True`.
+
+        dtype : dtype, default np.float64
+            The data type in which the (raw) pan matrix profile is stored in host
+            memory. The GPU devices compute in `np.float64` and each matrix profile is
+            only cast to `dtype` after it has been copied back to the host.
+
+        mmap_path : str, default None
+            The path of a `.npy` file in which the (raw) pan matrix profile is stored as
+            a memory-mapped array (rather than in memory). Any existing file is
+            overwritten.
         """
         super().__init__(
             T,
@@ -147,4 +170,6 @@ class gpu_stimp(_stimp):
             pre_scrump=False,
             device_id=device_id,
             mp_func=gpu_stump,
+            dtype=dtype,
+            mmap_path=mmap_path,
         )
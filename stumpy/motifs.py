@@ -3,10 +3,11 @@
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
 import warnings
+import weakref
 
 import numpy as np
 
-from .aamp_motifs import aamp_motifs, aamp_match
+from .aamp_motifs import aamp_motifs, aamp_match, aamp_match_many
 from . import core, config
 
 
@@ -86,13 +87,17 @@ def _motifs(
         Note that the first column always corresponds to the index for the
         self-match/trivial-match for each motif.
     """
-    n = T.shape[1]
+    d, n = T.shape
     l = P.shape[1]
     m = n - l + 1
 
     motif_indices = []
     motif_distances = []
 
+    # The spectrum of `T` is computed once and shared by all candidate motifs
+    T_fft, nfft = core._rfft_spectrum(T, m)
+    D = np.empty((d, l), dtype=np.float64)
+
     candidate_idx = np.argmin(P[-1])
     for _ in range(l):
         if len(motif_indices) >= max_motifs:
@@ -111,27 +116,29 @@ def _motifs(
             break
 
         Q = T[:, candidate_idx : candidate_idx + m]
-
-        query_matches = match(
-            Q,
-            T,
-            M_T=M_T,
-            Σ_T=Σ_T,
-            max_matches=None,
+        QT = core._sliding_dot_product_from_spectrum(Q, T_fft, nfft, n)
+        for i in range(d):
+            μ_Q, σ_Q = core.compute_mean_std(Q[i], m)
+            D[i, :] = core._mass(Q[i], T[i], QT[i], μ_Q[0], σ_Q[0], M_T[i], Σ_T[i])
+
+        distances, indices = core._find_matches(
+            np.mean(D, axis=0),
+            excl_zone,
             max_distance=max_distance,
-            atol=atol,
+            max_matches=None,
             query_idx=candidate_idx,
+            atol=atol,
         )
 
-        if len(query_matches) > min_neighbors:
-            motif_distances.append(query_matches[:max_matches, 0])
-            motif_indices.append(query_matches[:max_matches, 1])
+        if len(indices) > min_neighbors:
+            motif_distances.append(distances[:max_matches])
+            motif_indices.append(indices[:max_matches])
 
-        if len(query_matches) == 0:  # pragma: no cover
-            query_matches = np.array([[np.nan, candidate_idx]])
+        if len(indices) == 0:  # pragma: no cover
+            indices = np.array([candidate_idx])
 
-        for idx in query_matches[:, 1]:
-            core.apply_exclusion_zone(P, int(idx), excl_zone, np.inf)
+        for idx in indices:
+            core.apply_exclusion_zone(P, idx, excl_zone, np.inf)
 
         candidate_idx = np.argmin(P[-1])
 
@@ -344,6 +351,7 @@ def match(
     normalize=True,
     p=2.0,
     T_subseq_isfinite=None,
+    early_abandon=False,
 ):
     """
     Find all matches of a query `Q` in a time series `T`
@@ -407,6 +415,16 @@ def match(
         `np.nan`/`np.inf` value (False). This parameter is ignored when
         `normalize=True`.
 
+    early_abandon : bool, default False
+        By default, the full distance profile is computed with the MASS algorithm.
+        When set to `True`, the distances are instead computed by scanning `T`
+        directly and any subsequence is abandoned as soon as a lower bound of its
+        distance to `Q` exceeds `max_distance`. If `None`, then the faster option is
+        automatically chosen based on the length of `T`, the length of `Q`, and
+        `max_distance`. Early abandoning is only supported when `max_distance` is a
+        float and `Q` is 1-dimensional, and a `ValueError` is raised if it is
+        explicitly requested otherwise. Both options return the same matches.
+
     Returns
     -------
     out : numpy.ndarray
@@ -455,12 +473,31 @@ def match(
     if len(Σ_T.shape) == 1:
         Σ_T = Σ_T[np.newaxis, :]
 
+    if not isinstance(max_distance, float) or d > 1:
+        if early_abandon:
+            raise ValueError(
+                "`early_abandon=True` requires `max_distance` to be a float and `Q` "
+                "to be 1-dimensional. Set `early_abandon=False` instead."
+            )
+        early_abandon = False
+    if early_abandon is None:
+        # The expected squared difference between two random z-normalized values is 2
+        early_abandon = core._is_early_abandon_faster(
+            n, m, np.square(max_distance + atol) / 2.0
+        )
+
     D = np.empty((d, n - m + 1))
-    for i in range(d):
-        D[i, :] = core.mass(Q[i], T[i], M_T[i], Σ_T[i])
+    if early_abandon:
+        μ_Q, σ_Q = core.compute_mean_std(Q[0], m)
+        D[0, :] = core._mass_early_abandon(
+            Q[0], T[0], μ_Q[0], σ_Q[0], M_T[0], Σ_T[0], max_distance + atol
+        )
+    else:
+        for i in range(d):
+            D[i, :] = core.mass(Q[i], T[i], M_T[i], Σ_T[i])
     D = np.mean(D, axis=0)
 
-    return core._find_matches(
+    distances, indices = core._find_matches(
         D,
         excl_zone,
         max_distance=max_distance,
@@ -468,3 +505,198 @@ def match(
         query_idx=query_idx,
         atol=atol,
     )
+
+    return core._matches_to_array(distances, indices)
+
+
+_PREPROCESSED_SERIES_CACHE = {}
+
+
+def _get_cached_preprocessed_series(Ts, m):
+    """
+    Concatenate and preprocess a collection of time series and compute the real FFT
+    spectrum of the concatenated time series. Up to
+    `config.STUMPY_MATCH_MANY_CACHE_SIZE` of the most recently preprocessed collections
+    are kept so that searching the same time series with many queries of the same
+    length does not repeat this work.
+
+    Parameters
+    ----------
+    Ts : list
+        A list of 1-dimensional time series (or a 2-dimensional array where each row
+        is a time series). The results are only cached when the time series are numpy
+        arrays, which are then identified by their identity. Note that modifying a
+        time series in place does not invalidate its cached results.
+
+    m : int
+        Window size
+
+    Returns
+    -------
+    T : numpy.ndarray
+        The (preprocessed) concatenated time series
+
+    T_starts : numpy.ndarray
+        The start index of each time series within `T`
+
+    M_T : numpy.ndarray
+        Sliding mean of `T`, where the subsequences that straddle two or more time
+        series are set to `np.inf`
+
+    Σ_T : numpy.ndarray
+        Sliding standard deviation of `T`
+
+    T_fft : numpy.ndarray
+        The real FFT spectrum of `T` (see `core._rfft_spectrum`)
+
+    nfft : int
+        The length of the zero-padded `T` that `T_fft` was computed from
+    """
+    T_inputs = (Ts,) if isinstance(Ts, np.ndarray) else tuple(Ts)
+    is_cached = config.STUMPY_MATCH_MANY_CACHE_SIZE > 0 and all(
+        isinstance(T_input, np.ndarray) for T_input in T_inputs
+    )
+    if is_cached:
+        # Evict the results of the time series that no longer exist
+        for key in [
+            key
+            for key, (T_refs, _) in _PREPROCESSED_SERIES_CACHE.items()
+            if any(T_ref() is None for T_ref in T_refs)
+        ]:
+            del _PREPROCESSED_SERIES_CACHE[key]
+
+        key = (tuple(id(T_input) for T_input in T_inputs), m)
+        if key in _PREPROCESSED_SERIES_CACHE:
+            return _PREPROCESSED_SERIES_CACHE[key][1]
+
+    T, T_starts, T_subseq_isvalid = core._concatenate_series(Ts, m)
+    T, M_T, Σ_T = core.preprocess(T, m)
+    M_T[~T_subseq_isvalid] = np.inf
+    T_fft, nfft = core._rfft_spectrum(T, m)
+    out = (T, T_starts, M_T, Σ_T, T_fft, nfft)
+
+    if is_cached:
+        for a in out[:-1]:
+            a.flags.writeable = False
+        while len(_PREPROCESSED_SERIES_CACHE) >= config.STUMPY_MATCH_MANY_CACHE_SIZE:
+            # Evict the oldest results (dictionaries preserve insertion order)
+            _PREPROCESSED_SERIES_CACHE.pop(next(iter(_PREPROCESSED_SERIES_CACHE)))
+        _PREPROCESSED_SERIES_CACHE[key] = (
+            tuple(weakref.ref(T_input) for T_input in T_inputs),
+            out,
+        )
+
+    return out
+
+
+@core.non_normalized(aamp_match_many)
+def match_many(
+    Q,
+    Ts,
+    max_distance=None,
+    max_matches=None,
+    atol=1e-8,
+    normalize=True,
+    p=2.0,
+):
+    """
+    Find all matches of a query `Q` across a collection of time series, `Ts`
+
+    The subsequences whose distances to `Q` are less than or equal to `max_distance`,
+    sorted by distance (lowest to highest). Within each time series, an exclusion zone
+    is applied around each occurrence before searching for the next.
+
+    Parameters
+    ----------
+    Q : numpy.ndarray
+        The query sequence. It doesn't have to be a subsequence of any time series
+
+    Ts : list
+        A list of 1-dimensional time series of interest. The time series may have
+        different lengths.
+
+    max_distance : float or function, default None
+        Maximum distance between `Q` and a subsequence `S` for `S` to be considered a
+        match.
+        If a function, then it has to be a function of one argument `D`, which will be
+        the distance profile of `Q` with all of the concatenated time series (where
+        subsequences that straddle two time series have a distance of `np.inf`).
+        If None, this defaults to
+        `np.nanmax([np.nanmean(D) - 2 * np.nanstd(D), np.nanmin(D)])` (i.e. at
+        least the closest match will be returned).
+
+    max_matches : int, default None
+        The maximum amount of similar occurrences to be returned across all of the
+        time series. The resulting occurrences are sorted by distance, so a value of
+        `10` means that the `10` most similar subsequences are returned. If `None`,
+        then all occurrences are returned.
+
+    atol : float, default 1e-8
+        The absolute tolerance parameter. This value will be added to `max_distance`
+        when comparing distances between subsequences.
+
+    normalize : bool, default True
+        When set to `True`, this z-normalizes subsequences prior to computing distances.
+        Otherwise, this function gets re-routed to its complementary non-normalized
+        equivalent set in the `@core.non_normalized` function decorator.
+
+    p : float, default 2.0
+        The p-norm to apply for computing the Minkowski distance. This parameter is
+        ignored when `normalize == True`.
+
+    Returns
+    -------
+    out : numpy.ndarray
+        The first column consists of distances of subsequences whose distances to `Q`
+        are less than or equal to `max_distance`, sorted by distance (lowest to
+        highest). The second column consists of the corresponding indices in `Ts`
+        (i.e., which time series) and the third column consists of the corresponding
+        start indices within that time series.
+
+    See Also
+    --------
+    stumpy.match : Find all matches of a query `Q` in a time series `T`
+
+    Notes
+    -----
+    All of the time series are concatenated and the distance profiles of every time
+    series are computed in a single pass from the FFT spectrum of the concatenated
+    time series. When `config.STUMPY_MATCH_MANY_CACHE_SIZE > 0` and the time series
+    are numpy arrays, the concatenated time series, its sliding statistics, and its
+    spectrum are kept and reused by later calls with the same (unmodified) time series
+    and a query of the same length.
+
+    Examples
+    --------
+    >>> stumpy.match_many(
+    ...     np.array([-11.1, 23.4, 79.5, 1001.0]),
+    ...     [np.array([584., -11., 23., 79., 1001., 0., -19.]),
+    ...      np.array([-11., 23., 80., 1000., 1.])],
+    ...     max_distance=0.1
+    ...     )
+    array([[0.0011129739302218461, 0, 1],
+           [0.0016137511332714194, 1, 0]], dtype=object)
+    """
+    Q = core._preprocess(Q)
+    if np.any(np.isnan(Q)) or np.any(np.isinf(Q)):  # pragma: no cover
+        raise ValueError("Q contains illegal values (NaN or inf)")
+
+    m = Q.shape[0]
+    excl_zone = int(np.ceil(m / config.STUMPY_EXCL_ZONE_DENOM))
+
+    T, T_starts, M_T, Σ_T, T_fft, nfft = _get_cached_preprocessed_series(Ts, m)
+
+    μ_Q, σ_Q = core.compute_mean_std(Q, m)
+    QT = core._sliding_dot_product_from_spectrum(Q, T_fft, nfft, T.shape[0])
+    D = core._mass(Q, T, QT, μ_Q[0], σ_Q[0], M_T, Σ_T)
+
+    distances, series_indices, indices = core._find_series_matches(
+        D,
+        excl_zone,
+        T_starts,
+        max_distance=max_distance,
+        max_matches=max_matches,
+        atol=atol,
+    )
+
+    return core._matches_to_array(distances, series_indices, indices)
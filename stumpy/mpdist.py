@@ -4,6 +4,7 @@
 
 import numpy as np
 import math
+import numba
 
 from . import core, stump, stumped
 from .aampdist import aampdist, aampdisted
@@ -174,6 +175,8 @@ def _mpdist_vect(
     percentage=0.05,
     k=None,
     custom_func=None,
+    T_fft=None,
+    nfft=None,
 ):
     """
     Compute the matrix profile distance measure vector between `Q` and each subsequence,
@@ -220,6 +223,21 @@ def _mpdist_vect(
         `MPdist` value. The `percentage` and `k` parameters are ignored when
         `custom_func` is not None.
 
+    T_fft : numpy.ndarray, default None
+        The (precomputed) real FFT spectrum of `T`, where all non-finite values have
+        been replaced by zero (see `core._rfft_spectrum`). When `T_fft` is not `None`,
+        the sliding dot products are computed from this spectrum (and for many rows at
+        once) rather than from scratch for every subsequence of `Q`. This is useful
+        when `_mpdist_vect` is called repeatedly for the same `T`. When the distance
+        matrix does not fit within `config.STUMPY_MPDIST_MEMORY_BUDGET` and is
+        processed in blocks of columns, the spectrum of the subsequences of `Q` is
+        computed once and reused by every block (together with the spectrum of the
+        block's slice of `T`) instead.
+
+    nfft : int, default None
+        The length of the zero-padded `T` that `T_fft` was computed from. This
+        parameter is ignored when `T_fft` is `None`.
+
     Returns
     -------
     MPdist_vect : numpy.ndarray
@@ -229,27 +247,68 @@ def _mpdist_vect(
     """
     j = Q.shape[0] - m + 1  # `k` is reserved for `P_ABBA` selection
     l = T.shape[0] - m + 1
-    MPdist_vect = np.empty(T.shape[0] - Q.shape[0] + 1, dtype=np.float64)
-    distance_matrix = np.full((j, l), np.inf, dtype=np.float64)
-    P_ABBA = np.empty(2 * j, dtype=np.float64)
 
     if k is None:
         percentage = np.clip(percentage, 0.0, 1.0)
         k = min(math.ceil(percentage * (2 * Q.shape[0])), 2 * j - 1)
 
-    k = min(int(k), P_ABBA.shape[0] - 1)
-
-    core._mass_distance_matrix(Q, T, m, distance_matrix, μ_Q, σ_Q, M_T, Σ_T)
-
-    rolling_row_min = core.rolling_nanmin(distance_matrix, j)
-    col_min = np.nanmin(distance_matrix, axis=0)
-
-    for i in range(MPdist_vect.shape[0]):
-        P_ABBA[:j] = rolling_row_min[:, i]
-        P_ABBA[j:] = col_min[i : i + j]
-        MPdist_vect[i] = core._select_P_ABBA_value(P_ABBA, k, custom_func)
-
-    return MPdist_vect
+    def compute_distance_matrix_slice(start, stop, distance_matrix):
+        core._mass_distance_matrix(
+            Q,
+            T[start : stop + m - 1],
+            m,
+            distance_matrix,
+            μ_Q,
+            σ_Q,
+            M_T[start:stop],
+            Σ_T[start:stop],
+        )
+
+    if T_fft is None:
+        compute_distance_matrix = compute_distance_matrix_slice
+    else:
+        Q_subseqs = core.rolling_window(Q, m)
+        Q_subseq_isfinite = core.rolling_isfinite(Q, m)
+        workers = numba.config.NUMBA_NUM_THREADS
+        b = core._get_mpdist_vect_block_size(j, l)
+        if b < l:
+            # The spectrum of `T` cannot be sliced by columns so, instead, every block
+            # pairs the spectrum of its slice of `T` with the (same length) spectrum of
+            # the subsequences of `Q`, which is computed only once
+            T_finite = np.where(np.isfinite(T), T, 0.0)
+            nfft = core._get_nfft(b + m - 1, m)
+            Q_fft = core._rfft_query_spectrum(Q_subseqs, nfft, workers)
+
+        def compute_distance_matrix(start, stop, distance_matrix):
+            if b < l:
+                T_block_fft, _ = core._rfft_spectrum(
+                    T_finite[start : stop + m - 1], m, nfft
+                )
+                QT = core._sliding_dot_product_from_spectrum(
+                    Q_subseqs,
+                    T_block_fft,
+                    nfft,
+                    stop - start + m - 1,
+                    workers,
+                    Q_fft=Q_fft,
+                )
+            else:
+                QT = core._sliding_dot_product_from_spectrum(
+                    Q_subseqs, T_fft, nfft, T.shape[0], workers
+                )
+            core._mass_distance_matrix_from_QT(
+                m,
+                QT,
+                μ_Q,
+                σ_Q,
+                Q_subseq_isfinite,
+                M_T[start:stop],
+                Σ_T[start:stop],
+                distance_matrix,
+            )
+
+    # The distance matrix is processed in blocks of columns to bound the memory usage
+    return core._compute_mpdist_vect(compute_distance_matrix, j, l, k, custom_func)
 
 
 @core.non_normalized(aampdist)
@@ -2,9 +2,10 @@
 # Copyright 2019 TD Ameritrade. Released under the terms of the 3-Clause BSD license.
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
+import numba
 import numpy as np
 
-from . import core, stump, stumped
+from . import core, stump
 from .aamp_ostinato import aamp_ostinato, aamp_ostinatoed
 
 
@@ -131,7 +132,142 @@ def _get_central_motif(Ts, bsf_radius, bsf_Ts_idx, bsf_subseq_idx, m, M_Ts, Σ_T
     return bsf_radius, bsf_Ts_idx, bsf_subseq_idx
 
 
-def _ostinato(Ts, m, M_Ts, Σ_Ts, client=None, device_id=None, mp_func=stump):
+def _ostinato_series(
+    Ts,
+    j,
+    P,
+    m,
+    M_Ts,
+    Σ_Ts,
+    Ts_fft,
+    bsf_radius=np.inf,
+    n_candidates=None,
+    share_bsf_radius=None,
+):
+    """
+    Find the subsequence in `Ts[j]` with the smallest radius that is below the
+    best-so-far radius
+
+    Parameters
+    ----------
+    Ts : list
+        A list of time series for which to find the consensus motif
+
+    j : int
+        The index of the time series in `Ts` whose subsequences are the candidates
+
+    P : numpy.ndarray
+        The (AB-join) matrix profile of `Ts[j]` with respect to the next time series
+        in `Ts` (i.e., `Ts[(j + 1) % len(Ts)]`)
+
+    m : int
+        Window size
+
+    M_Ts : list
+        A list of rolling window means for each time series in `Ts`
+
+    Σ_Ts : list
+        A list of rolling window standard deviations for each time series in `Ts`
+
+    Ts_fft : list
+        A list of `(T_fft, nfft)` spectra for each time series in `Ts` (see
+        `core._rfft_spectrum`)
+
+    bsf_radius : float, default np.inf
+        The best-so-far radius. Only candidates with a smaller radius are returned.
+
+    n_candidates : int, default None
+        The number of candidate subsequences whose radii are evaluated at once (in
+        parallel). When `n_candidates = None`, this is set to the number of Numba
+        threads.
+
+    share_bsf_radius : function, default None
+        A function (e.g., `core._shared_bsf_radius`) that is called with the
+        best-so-far radius before each block of candidates is evaluated and that
+        returns a best-so-far radius that is shared with other (concurrent) searches.
+        Candidates with a radius greater than the shared radius are pruned.
+
+    Returns
+    -------
+    bsf_radius : float
+        The updated best-so-far radius
+
+    bsf_subseq_idx : int
+        The subsequence index in `Ts[j]` that has radius `bsf_radius`. This is `-1`
+        when no candidate has a radius below the (initial) best-so-far radius.
+    """
+    bsf_subseq_idx = -1
+
+    k = len(Ts)
+    if j < (k - 1):
+        h = j + 1
+    else:
+        h = 0
+
+    # The candidates are evaluated in blocks (in parallel) and the spectrum of each
+    # time series is reused for all of the candidates
+    if n_candidates is None:
+        n_candidates = numba.get_num_threads()
+    si = np.argsort(P)
+    T_j_subseqs = core.rolling_window(Ts[j], m)
+    for start in range(0, si.shape[0], n_candidates):
+        max_radius = bsf_radius
+        if share_bsf_radius is not None:
+            # Ties with the shared radius are kept so that the first of the smallest
+            # radii is found regardless of which search found the shared radius
+            max_radius = min(
+                max_radius, np.nextafter(share_bsf_radius(bsf_radius), np.inf)
+            )
+        q = si[start : start + n_candidates]
+        radii = P[q].astype(np.float64)
+        # Since `si` is sorted, no remaining candidate can beat `max_radius`
+        q = q[radii < max_radius]
+        radii = radii[radii < max_radius]
+        if q.shape[0] == 0:
+            break
+        for i in range(k):
+            if i != j and i != h:
+                active = np.flatnonzero(radii < max_radius)
+                if active.shape[0] == 0:
+                    break
+                T_fft, nfft = Ts_fft[i]
+                QT = core._sliding_dot_product_from_spectrum(
+                    T_j_subseqs[q[active]],
+                    T_fft,
+                    nfft,
+                    Ts[i].shape[0],
+                    workers=numba.get_num_threads(),
+                )
+                D = np.empty((active.shape[0], QT.shape[1]), dtype=np.float64)
+                core._mass_distance_matrix_from_QT(
+                    m,
+                    QT,
+                    M_Ts[j][q[active]],
+                    Σ_Ts[j][q[active]],
+                    np.ones(active.shape[0], dtype=bool),
+                    M_Ts[i],
+                    Σ_Ts[i],
+                    D,
+                )
+                radii[active] = np.maximum(radii[active], np.min(D, axis=1))
+        # The first of the smallest radii is kept as in a serial search
+        idx = np.argmin(radii)
+        if radii[idx] < max_radius:
+            bsf_radius, bsf_subseq_idx = radii[idx], q[idx]
+
+    return bsf_radius, bsf_subseq_idx
+
+
+def _ostinato(
+    Ts,
+    m,
+    M_Ts,
+    Σ_Ts,
+    client=None,
+    device_id=None,
+    mp_func=stump,
+    n_candidates=None,
+):
     """
     Find the consensus motif amongst a list of time series
 
@@ -163,6 +299,11 @@ def _ostinato(Ts, m, M_Ts, Σ_Ts, client=None, device_id=None, mp_func=stump):
     mp_func : object, default stump
         Specify a custom matrix profile function to use for computing matrix profiles
 
+    n_candidates : int, default None
+        The number of candidate subsequences whose radii are evaluated at once (in
+        parallel). When `n_candidates = None`, this is set to the number of Numba
+        threads.
+
     Returns
     -------
     bsf_radius : float
@@ -204,6 +345,7 @@ def _ostinato(Ts, m, M_Ts, Σ_Ts, client=None, device_id=None, mp_func=stump):
     )
 
     k = len(Ts)
+    Ts_fft = [core._rfft_spectrum(T, m) for T in Ts]
     for j in range(k):
         if j < (k - 1):
             h = j + 1
@@ -211,34 +353,191 @@ def _ostinato(Ts, m, M_Ts, Σ_Ts, client=None, device_id=None, mp_func=stump):
             h = 0
 
         mp = partial_mp_func(Ts[j], m, Ts[h], ignore_trivial=False)
-        si = np.argsort(mp[:, 0])
-        for q in si:
-            radius = mp[q, 0]
-            if radius >= bsf_radius:
-                break
-            for i in range(k):
-                if i != j and i != h:
-                    QT = core.sliding_dot_product(Ts[j][q : q + m], Ts[i])
-                    radius = np.max(
-                        (
-                            radius,
-                            np.min(
-                                core._mass(
-                                    Ts[j][q : q + m],
-                                    Ts[i],
-                                    QT,
-                                    M_Ts[j][q],
-                                    Σ_Ts[j][q],
-                                    M_Ts[i],
-                                    Σ_Ts[i],
-                                )
-                            ),
-                        )
-                    )
-                    if radius >= bsf_radius:
-                        break
-            if radius < bsf_radius:
-                bsf_radius, bsf_Ts_idx, bsf_subseq_idx = radius, j, q
+        radius, subseq_idx = _ostinato_series(
+            Ts,
+            j,
+            mp[:, 0].astype(np.float64),
+            m,
+            M_Ts,
+            Σ_Ts,
+            Ts_fft,
+            bsf_radius=bsf_radius,
+            n_candidates=n_candidates,
+        )
+        if radius < bsf_radius:
+            bsf_radius, bsf_Ts_idx, bsf_subseq_idx = radius, j, subseq_idx
+
+    return bsf_radius, bsf_Ts_idx, bsf_subseq_idx
+
+
+def _ostinato_series_range(Ts, m, M_Ts, Σ_Ts, Ts_fft, start, stop, bsf_radius_name):
+    """
+    Find the consensus motif candidate with the smallest radius amongst the time
+    series `Ts[start : stop]` while sharing the best-so-far radius with the rest of
+    the Dask cluster
+
+    Parameters
+    ----------
+    Ts : list
+        A list of time series for which to find the consensus motif
+
+    m : int
+        Window size
+
+    M_Ts : list
+        A list of rolling window means for each time series in `Ts`
+
+    Σ_Ts : list
+        A list of rolling window standard deviations for each time series in `Ts`
+
+    Ts_fft : list
+        A list of `(T_fft, nfft)` spectra for each time series in `Ts` (see
+        `core._rfft_spectrum`)
+
+    start : int
+        The index of the first time series in `Ts` to search for candidates
+
+    stop : int
+        The (exclusive) index of the last time series in `Ts` to search for candidates
+
+    bsf_radius_name : str
+        The name of the Dask `Variable` that holds the cluster-wide best-so-far radius
+
+    Returns
+    -------
+    bsf_radius : float
+        The best-so-far radius found in `Ts[start : stop]`. This is `np.inf` when no
+        candidate beats the cluster-wide best-so-far radius.
+
+    bsf_Ts_idx : int
+        The time series index in `Ts` which contains the candidate
+
+    bsf_subseq_idx : int
+        The subsequence index within time series `Ts[bsf_Ts_idx]` the contains the
+        candidate
+    """
+    bsf_radius = np.inf
+    bsf_Ts_idx = 0
+    bsf_subseq_idx = 0
+
+    share_bsf_radius = core._shared_bsf_radius(bsf_radius_name)
+
+    k = len(Ts)
+    for j in range(start, stop):
+        if j < (k - 1):
+            h = j + 1
+        else:
+            h = 0
+
+        mp = stump(Ts[j], m, Ts[h], ignore_trivial=False)
+        radius, subseq_idx = _ostinato_series(
+            Ts,
+            j,
+            mp[:, 0].astype(np.float64),
+            m,
+            M_Ts,
+            Σ_Ts,
+            Ts_fft,
+            bsf_radius=bsf_radius,
+            share_bsf_radius=share_bsf_radius,
+        )
+        if radius < bsf_radius:
+            bsf_radius, bsf_Ts_idx, bsf_subseq_idx = radius, j, subseq_idx
+
+    share_bsf_radius(bsf_radius)
+
+    return bsf_radius, bsf_Ts_idx, bsf_subseq_idx
+
+
+def _dask_ostinato(dask_client, Ts, m, M_Ts, Σ_Ts):
+    """
+    Find the consensus motif amongst a list of time series with a distributed Dask
+    cluster
+
+    The time series are split into contiguous ranges (one per worker) and each worker
+    computes the AB-join matrix profiles and evaluates the candidate radii for its own
+    range of time series. The best-so-far radius is shared across the cluster via a
+    Dask `Variable` so that candidates are pruned cluster-wide.
+
+    Parameters
+    ----------
+    dask_client : client
+        A Dask Distributed client. Setting up a distributed cluster is beyond
+        the scope of this library. Please refer to the Dask Distributed
+        documentation.
+
+    Ts : list
+        A list of time series for which to find the consensus motif
+
+    m : int
+        Window size
+
+    M_Ts : list
+        A list of rolling window means for each time series in `Ts`
+
+    Σ_Ts : list
+        A list of rolling window standard deviations for each time series in `Ts`
+
+    Returns
+    -------
+    bsf_radius : float
+        The (best-so-far) Radius of the consensus motif
+
+    bsf_Ts_idx : int
+        The time series index in `Ts` which contains the consensus motif
+
+    bsf_subseq_idx : int
+        The subsequence index within time series `Ts[bsf_Ts_idx]` the contains the
+        consensus motif
+    """
+    from dask.distributed import Variable
+
+    hosts = list(dask_client.ncores().keys())
+    nworkers = len(hosts)
+
+    l = np.array([T.shape[0] - m + 1 for T in Ts], dtype=np.int64)
+    Ts_ranges = core._get_array_ranges(l, nworkers, True)
+
+    bsf_radius_var = Variable(client=dask_client)
+    bsf_radius_var.set(np.inf)
+
+    # Every worker needs the spectrum of every time series so they are only
+    # computed once and then scattered along with the data
+    Ts_fft = [core._rfft_spectrum(T, m) for T in Ts]
+
+    # Scatter data to Dask cluster
+    Ts_future = dask_client.scatter(Ts, broadcast=True, hash=False)
+    M_Ts_future = dask_client.scatter(M_Ts, broadcast=True, hash=False)
+    Σ_Ts_future = dask_client.scatter(Σ_Ts, broadcast=True, hash=False)
+    Ts_fft_future = dask_client.scatter(Ts_fft, broadcast=True, hash=False)
+
+    futures = []
+    for i in range(Ts_ranges.shape[0]):
+        futures.append(
+            dask_client.submit(
+                _ostinato_series_range,
+                Ts_future,
+                m,
+                M_Ts_future,
+                Σ_Ts_future,
+                Ts_fft_future,
+                Ts_ranges[i, 0],
+                Ts_ranges[i, 1],
+                bsf_radius_var.name,
+                workers=[hosts[i]],
+                pure=False,
+            )
+        )
+
+    results = dask_client.gather(futures)
+    bsf_radius_var.delete()
+
+    # The ranges are ordered so the first of the smallest radii is kept as in a
+    # serial search
+    bsf_radius, bsf_Ts_idx, bsf_subseq_idx = results[0]
+    for radius, Ts_idx, subseq_idx in results[1:]:
+        if radius < bsf_radius:
+            bsf_radius, bsf_Ts_idx, bsf_subseq_idx = radius, Ts_idx, subseq_idx
 
     return bsf_radius, bsf_Ts_idx, bsf_subseq_idx
 
@@ -425,9 +724,7 @@ def ostinatoed(client, Ts, m, normalize=True, p=2.0):
     for i, T in enumerate(Ts):
         Ts[i], M_Ts[i], Σ_Ts[i] = core.preprocess(T, m)
 
-    bsf_radius, bsf_Ts_idx, bsf_subseq_idx = _ostinato(
-        Ts, m, M_Ts, Σ_Ts, client=client, mp_func=stumped
-    )
+    bsf_radius, bsf_Ts_idx, bsf_subseq_idx = _dask_ostinato(client, Ts, m, M_Ts, Σ_Ts)
 
     (
         central_radius,
@@ -2,6 +2,8 @@
 # Copyright 2019 TD Ameritrade. Released under the terms of the 3-Clause BSD license.
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
+import time
+
 import numpy as np
 from numba import njit, prange
 import numba
@@ -551,14 +553,30 @@ class scraamp:
     right_I_ : numpy.ndarray
         The updated right (top-1) matrix profile indices
 
+    coverage_ : float
+        The fraction of the distance matrix that has been covered so far
+
     Methods
     -------
-    update()
+    update(time_budget=None)
         Update the matrix profile and the matrix profile indices by computing
         additional new distances (limited by `percentage`) that make up the full
         distance matrix. It updates the (top-k) matrix profile, (top-1) left
         matrix profile, (top-1) right matrix profile, (top-k) matrix profile indices,
         (top-1) left matrix profile indices, and (top-1) right matrix profile indices.
+        When `time_budget` is not `None`, new distances are computed for
+        (approximately) `time_budget` seconds instead.
+
+    run_until(deadline)
+        Update the matrix profile and the matrix profile indices until the `deadline`
+        (in seconds since the epoch) is reached and return the fraction of the
+        distance matrix that has been covered so far.
+
+    save(path)
+        Save a checkpoint of the current state to a binary `.npz` file.
+
+    load(path)
+        Load a checkpoint (class method) and resume from where it left off.
 
     Notes
     -----
@@ -568,6 +586,35 @@ class scraamp:
     See Algorithm 1 and Algorithm 2
     """
 
+    _CHECKPOINT_ATTRIBUTES = (
+        "ignore_trivial",
+        "m",
+        "p",
+        "T_A",
+        "T_A_subseq_isfinite",
+        "T_B",
+        "T_B_subseq_isfinite",
+        "n_A",
+        "n_B",
+        "l",
+        "k",
+        "P",
+        "PL",
+        "PR",
+        "I",
+        "IL",
+        "IR",
+        "excl_zone",
+        "diags",
+        "percentage",
+        "n_chunks",
+        "ndist_counts",
+        "chunk_diags_ranges",
+        "chunk_idx",
+        "diags_idx",
+        "ndist_cumsum",
+    )
+
     def __init__(
         self,
         T_A,
@@ -621,25 +668,162 @@ class scraamp:
             profile. Note that this will increase the total computational time and
             memory usage when k > 1.
         """
-        self._ignore_trivial = ignore_trivial
-        self._p = p
-
         if T_B is None:
             T_B = T_A
-            self._ignore_trivial = True
+            ignore_trivial = True
+
+        self._initialize(
+            m,
+            core.preprocess_non_normalized(T_A, m),
+            core.preprocess_non_normalized(T_B, m),
+            ignore_trivial,
+            percentage,
+            pre_scraamp,
+            s,
+            p,
+            k,
+        )
+
+    @classmethod
+    def _from_preprocessed(
+        cls,
+        m,
+        T_A_preprocessed,
+        T_B_preprocessed=None,
+        ignore_trivial=True,
+        percentage=0.01,
+        pre_scraamp=False,
+        s=None,
+        p=2.0,
+        k=1,
+    ):
+        """
+        Create a `scraamp` object from time series that have already been preprocessed
+        (e.g., with `core._preprocess_non_normalized_from_cumsum`) rather than
+        preprocessing them again
+
+        Parameters
+        ----------
+        m : int
+            Window size
+
+        T_A_preprocessed : tuple
+            The outputs of `core.preprocess_non_normalized` for `T_A`
+
+        T_B_preprocessed : tuple, default None
+            The outputs of `core.preprocess_non_normalized` for `T_B`. When
+            `T_B_preprocessed = None`, a self-join is performed.
+
+        ignore_trivial : bool, default True
+            Set to `True` if this is a self-join. Otherwise, for AB-join, set this to
+            `False`.
+
+        percentage : float, default 0.01
+            Approximate percentage completed. The value is between 0.0 and 1.0.
+
+        pre_scraamp : bool, default False
+            A flag for whether or not to perform the PreSCRIMP calculation prior to
+            computing SCRIMP
+
+        s : int, default None
+            The size of the PreSCRIMP fixed interval
+
+        p : float, default 2.0
+            The p-norm to apply for computing the Minkowski distance.
+
+        k : int, default 1
+            The number of top `k` smallest distances used to construct the matrix
+            profile
+
+        Returns
+        -------
+        obj : scraamp
+            The `scraamp` object
+        """
+        if T_B_preprocessed is None:
+            T_B_preprocessed = T_A_preprocessed
+            ignore_trivial = True
+
+        obj = cls.__new__(cls)
+        obj._initialize(
+            m,
+            T_A_preprocessed,
+            T_B_preprocessed,
+            ignore_trivial,
+            percentage,
+            pre_scraamp,
+            s,
+            p,
+            k,
+        )
+
+        return obj
+
+    def _initialize(
+        self,
+        m,
+        T_A_preprocessed,
+        T_B_preprocessed,
+        ignore_trivial,
+        percentage,
+        pre_scraamp,
+        s,
+        p,
+        k,
+    ):
+        """
+        Initialize the `scraamp` object from the preprocessed time series
+
+        Parameters
+        ----------
+        m : int
+            Window size
 
+        T_A_preprocessed : tuple
+            The outputs of `core.preprocess_non_normalized` for `T_A`
+
+        T_B_preprocessed : tuple
+            The outputs of `core.preprocess_non_normalized` for `T_B`
+
+        ignore_trivial : bool
+            Set to `True` if this is a self-join. Otherwise, for AB-join, set this to
+            `False`.
+
+        percentage : float
+            Approximate percentage completed. The value is between 0.0 and 1.0.
+
+        pre_scraamp : bool
+            A flag for whether or not to perform the PreSCRIMP calculation prior to
+            computing SCRIMP
+
+        s : int
+            The size of the PreSCRIMP fixed interval
+
+        p : float
+            The p-norm to apply for computing the Minkowski distance.
+
+        k : int
+            The number of top `k` smallest distances used to construct the matrix
+            profile
+
+        Returns
+        -------
+        None
+        """
+        self._ignore_trivial = ignore_trivial
+        self._p = p
         self._m = m
 
         (
             self._T_A,
             self._T_A_subseq_isfinite,
             self._T_A_subseq_isconstant,
-        ) = core.preprocess_non_normalized(T_A, self._m)
+        ) = T_A_preprocessed
         (
             self._T_B,
             self._T_B_subseq_isfinite,
             self.T_B_subseq_isconstant,
-        ) = core.preprocess_non_normalized(T_B, self._m)
+        ) = T_B_preprocessed
 
         if self._T_A.ndim != 1:  # pragma: no cover
             raise ValueError(
@@ -653,7 +837,7 @@ class scraamp:
                 "For multidimensional STUMP use `stumpy.mstump` or `stumpy.mstumped`"
             )
 
-        core.check_window_size(m, max_size=min(T_A.shape[0], T_B.shape[0]))
+        core.check_window_size(m, max_size=min(self._T_A.shape[0], self._T_B.shape[0]))
         self._ignore_trivial = core.check_ignore_trivial(
             self._T_A, self._T_B, self._ignore_trivial
         )
@@ -679,32 +863,22 @@ class scraamp:
                 s = int(np.ceil(self._m / config.STUMPY_EXCL_ZONE_DENOM))
 
         if pre_scraamp:
+            # Reuse the preprocessing above rather than preprocessing again
             if self._ignore_trivial:
-                (
-                    T_A,
-                    T_B,
-                    T_A_subseq_isfinite,
-                    T_B_subseq_isfinite,
-                    indices,
-                    s,
-                    excl_zone,
-                ) = _preprocess_prescraamp(T_A, m, s=s)
+                T_B = self._T_A
+                T_B_subseq_isfinite = self._T_A_subseq_isfinite
+                excl_zone = self._excl_zone
             else:
-                (
-                    T_A,
-                    T_B,
-                    T_A_subseq_isfinite,
-                    T_B_subseq_isfinite,
-                    indices,
-                    s,
-                    excl_zone,
-                ) = _preprocess_prescraamp(T_A, m, T_B=T_B, s=s)
+                T_B = self._T_B
+                T_B_subseq_isfinite = self._T_B_subseq_isfinite
+                excl_zone = None
+            indices = np.random.permutation(range(0, self._l, s)).astype(np.int64)
 
             P, I = _prescraamp(
-                T_A,
+                self._T_A,
                 T_B,
                 m,
-                T_A_subseq_isfinite,
+                self._T_A_subseq_isfinite,
                 T_B_subseq_isfinite,
                 p,
                 indices,
@@ -740,42 +914,194 @@ class scraamp:
         )
         self._n_chunks = self._chunk_diags_ranges.shape[0]
         self._chunk_idx = 0
+        self._diags_idx = 0
+        self._ndist_cumsum = np.zeros(self._diags.shape[0] + 1, dtype=np.int64)
+        self._ndist_cumsum[1:] = np.cumsum(self._ndist_counts)
+        self._ndist_per_second = None
 
-    def update(self):
+    def update(self, time_budget=None):
         """
         Update the (top-k) matrix profile and the (top-k) matrix profile indices by
         computing additional new distances (limited by `percentage`) that make up
         the full distance matrix.
-        """
-        if self._chunk_idx < self._n_chunks:
-            start_idx, stop_idx = self._chunk_diags_ranges[self._chunk_idx]
 
-            P, PL, PR, I, IL, IR = _aamp(
-                self._T_A,
-                self._T_B,
-                self._m,
-                self._T_A_subseq_isfinite,
-                self._T_B_subseq_isfinite,
-                self._p,
-                self._diags[start_idx:stop_idx],
-                self._ignore_trivial,
-                self._k,
+        Parameters
+        ----------
+        time_budget : float, default None
+            The (approximate) number of seconds to spend on computing new distances.
+            When `time_budget` is not `None`, the `percentage`-sized chunks are
+            ignored and, instead, the diagonals are processed in chunks that are
+            sized adaptively from the measured throughput (i.e., the number of
+            distances computed per second) until the budget is spent or the full
+            distance matrix is covered.
+        """
+        if time_budget is not None:
+            deadline = time.perf_counter() + time_budget
+            n_diags = self._diags.shape[0]
+            while self._diags_idx < n_diags:
+                remaining_time = deadline - time.perf_counter()
+                if remaining_time <= 0.0:
+                    break
+
+                start_idx = self._diags_idx
+                if self._ndist_per_second is None:
+                    # Probe the throughput with a small number of distances
+                    ndist = config.STUMPY_TIME_BUDGET_PROBE_NDIST
+                else:
+                    # Aim for half of the remaining time in order to not overshoot
+                    ndist = int(0.5 * remaining_time * self._ndist_per_second)
+                target = self._ndist_cumsum[start_idx] + ndist
+                stop_idx = np.searchsorted(self._ndist_cumsum, target, "right") - 1
+                stop_idx = min(max(stop_idx, start_idx + 1), n_diags)
+
+                tic = time.perf_counter()
+                self._compute_diags(start_idx, stop_idx)
+                elapsed_time = time.perf_counter() - tic
+                if elapsed_time > 0.0:
+                    ndist = self._ndist_cumsum[stop_idx] - self._ndist_cumsum[start_idx]
+                    self._ndist_per_second = ndist / elapsed_time
+
+            # Only chunks that have been fully processed are considered complete
+            self._chunk_idx = np.searchsorted(
+                self._chunk_diags_ranges[:, 1], self._diags_idx, "right"
             )
+        elif self._chunk_idx < self._n_chunks:
+            stop_idx = self._chunk_diags_ranges[self._chunk_idx, 1]
+            self._compute_diags(self._diags_idx, stop_idx)
+            self._chunk_idx += 1
 
-            # Update (top-k) matrix profile and indices
-            core._merge_topk_PI(self._P, P, self._I, I)
+    def run_until(self, deadline):
+        """
+        Update the (top-k) matrix profile and the (top-k) matrix profile indices
+        until the `deadline` (in seconds since the epoch, see `time.time`) is reached
+        or the full distance matrix is covered
 
-            # update left matrix profile and indices
-            mask = PL < self._PL
-            self._PL[mask] = PL[mask]
-            self._IL[mask] = IL[mask]
+        Parameters
+        ----------
+        deadline : float
+            The time (in seconds since the epoch) by which the computation should
+            return
+
+        Returns
+        -------
+        coverage : float
+            The fraction of the distance matrix that has been covered so far
+        """
+        self.update(time_budget=deadline - time.time())
 
-            # update right matrix profile and indices
-            mask = PR < self._PR
-            self._PR[mask] = PR[mask]
-            self._IR[mask] = IR[mask]
+        return self.coverage_
 
-            self._chunk_idx += 1
+    def _compute_diags(self, start_idx, stop_idx):
+        """
+        Compute the distances along the diagonals, `self._diags[start_idx:stop_idx]`,
+        and update the (top-k) matrix profile and the (top-k) matrix profile indices
+
+        Parameters
+        ----------
+        start_idx : int
+            The (inclusive) start index of the diagonals
+
+        stop_idx : int
+            The (exclusive) stop index of the diagonals
+
+        Returns
+        -------
+        None
+        """
+        P, PL, PR, I, IL, IR = _aamp(
+            self._T_A,
+            self._T_B,
+            self._m,
+            self._T_A_subseq_isfinite,
+            self._T_B_subseq_isfinite,
+            self._p,
+            self._diags[start_idx:stop_idx],
+            self._ignore_trivial,
+            self._k,
+        )
+
+        # Update (top-k) matrix profile and indices
+        core._merge_topk_PI(self._P, P, self._I, I)
+
+        # update left matrix profile and indices
+        mask = PL < self._PL
+        self._PL[mask] = PL[mask]
+        self._IL[mask] = IL[mask]
+
+        # update right matrix profile and indices
+        mask = PR < self._PR
+        self._PR[mask] = PR[mask]
+        self._IR[mask] = IR[mask]
+
+        self._diags_idx = stop_idx
+
+    def save(self, path):
+        """
+        Save a checkpoint of the `scraamp` object (i.e., the preprocessed time series,
+        the permuted diagonals, the current chunk index, and the matrix profiles) to
+        a binary `.npz` file so that the computation can be resumed with
+        `scraamp.load`
+
+        Parameters
+        ----------
+        path : str
+            The file name (or path) of the checkpoint. A `.npz` extension is appended
+            to the file name if it does not already have one. The checkpoint is first
+            written to a temporary file (in the same directory) that then replaces
+            any existing checkpoint so that an interrupted save never corrupts it.
+
+        Returns
+        -------
+        None
+        """
+        core._savez_atomic(
+            path,
+            normalize=False,
+            **{name: getattr(self, "_" + name) for name in self._CHECKPOINT_ATTRIBUTES},
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a `scraamp` object from a checkpoint that was saved with `scraamp.save` and
+        resume from where it left off without preprocessing the time series again
+
+        Parameters
+        ----------
+        path : str
+            The file name (or path) of the `.npz` checkpoint. A `.npz` extension is
+            appended to the file name if it does not already have one (as with
+            `save`).
+
+        Returns
+        -------
+        obj : scraamp
+            The `scraamp` object
+        """
+        path = core._get_npz_path(path)
+        with np.load(path, allow_pickle=False) as checkpoint:
+            if checkpoint["normalize"]:  # pragma: no cover
+                raise ValueError(
+                    f"{path} is a z-normalized checkpoint. Please use "
+                    "`stumpy.scrump.load` instead."
+                )
+
+            obj = cls.__new__(cls)
+            for name in cls._CHECKPOINT_ATTRIBUTES:
+                value = checkpoint[name]
+                setattr(obj, "_" + name, value.item() if value.ndim == 0 else value)
+
+        obj._n_threads = numba.config.NUMBA_NUM_THREADS
+        obj._ndist_per_second = None
+
+        return obj
+
+    @property
+    def coverage_(self):
+        """
+        Get the fraction of the distance matrix that has been covered so far
+        """
+        return self._ndist_cumsum[self._diags_idx] / max(1, self._ndist_cumsum[-1])
 
     @property
     def P_(self):
@@ -2,12 +2,14 @@
 # Copyright 2019 TD Ameritrade. Released under the terms of the 3-Clause BSD license.
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
+import time
+
 import numpy as np
 from numba import njit, prange
 import numba
 
 from . import core, scraamp, config
-from .stump import _stump
+from .stump import _stump_ρI, _ρI_to_PI
 
 
 def _preprocess_prescrump(T_A, m, T_B=None, s=None):
@@ -87,6 +89,46 @@ def _preprocess_prescrump(T_A, m, T_B=None, s=None):
     return (T_A, T_B, μ_Q, σ_Q, M_T, Σ_T, indices, s, excl_zone)
 
 
+def _get_mean_std_from_diagonal(
+    M_T, Σ_T_inverse, T_subseq_isfinite, T_subseq_isconstant
+):
+    """
+    Derive the sliding mean and sliding standard deviation that are expected by the
+    prescrump algorithm from the outputs of `core.preprocess_diagonal` so that the
+    time series does not need to be preprocessed again
+
+    Parameters
+    ----------
+    M_T : numpy.ndarray
+        Sliding mean of the (preprocessed) time series, `T`
+
+    Σ_T_inverse : numpy.ndarray
+        Inverse sliding standard deviation of the (preprocessed) time series, `T`
+
+    T_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` contains a
+        `np.nan`/`np.inf` value (False)
+
+    T_subseq_isconstant : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T` is constant (True)
+
+    Returns
+    -------
+    M_T : numpy.ndarray
+        Sliding mean of `T`, where the mean of every subsequence that contains a
+        `np.nan`/`np.inf` value is set to `np.inf`
+
+    Σ_T : numpy.ndarray
+        Sliding standard deviation of `T`
+    """
+    M_T = M_T.copy()
+    M_T[~T_subseq_isfinite] = np.inf
+    Σ_T = 1.0 / Σ_T_inverse
+    Σ_T[T_subseq_isconstant] = 0.0  # Undo the divide-by-zero guard
+
+    return M_T, Σ_T
+
+
 @njit(fastmath=True)
 def _compute_PI(
     T_A,
@@ -598,15 +640,31 @@ class scrump:
     right_I_ : numpy.ndarray
         The updated right (top-1) matrix profile indices
 
+    coverage_ : float
+        The fraction of the distance matrix that has been covered so far
+
 
     Methods
     -------
-    update()
+    update(time_budget=None)
         Update the matrix profile and the matrix profile indices by computing
         additional new distances (limited by `percentage`) that make up the full
         distance matrix. It updates the (top-k) matrix profile, (top-1) left
         matrix profile, (top-1) right matrix profile, (top-k) matrix profile indices,
         (top-1) left matrix profile indices, and (top-1) right matrix profile indices.
+        When `time_budget` is not `None`, new distances are computed for
+        (approximately) `time_budget` seconds instead.
+
+    run_until(deadline)
+        Update the matrix profile and the matrix profile indices until the `deadline`
+        (in seconds since the epoch) is reached and return the fraction of the
+        distance matrix that has been covered so far.
+
+    save(path)
+        Save a checkpoint of the current state to a binary `.npz` file.
+
+    load(path)
+        Load a checkpoint (class method) and resume from where it left off.
 
     See Also
     --------
@@ -623,26 +681,60 @@ class scrump:
 
     See Algorithm 1 and Algorithm 2
 
+    In order to avoid reducing them after every update, the per-thread (top-k)
+    Pearson correlations and their indices are kept alive across updates, which
+    takes up an additional `NUMBA_NUM_THREADS * (n_A - m + 1) * (k + 2)` 64-bit
+    floats and as many 64-bit integers. These are freed once the full distance matrix
+    has been covered and the matrix profile has been requested.
+
     Examples
     --------
     >>> approx_mp = stumpy.scrump(
     ...     np.array([584., -11., 23., 79., 1001., 0., -19.]),
     ...     m=3)
     >>> approx_mp.update()
-    >>> approx_mp._P
-    array([[2.982409  ,        inf, 2.982409  ],
-           [3.28412702,        inf, 3.28412702],
-           [       inf,        inf,        inf],
-           [2.982409  , 2.982409  ,        inf],
-           [3.28412702, 3.28412702,        inf]])
-    >>> approx_mp._I
-    array([[ 3, -1,  3],
-           [ 4, -1,  4],
-           [-1, -1, -1],
-           [ 0,  0, -1],
-           [ 1,  1, -1]])
+    >>> approx_mp.P_
+    array([2.982409  , 3.28412702,        inf, 2.982409  , 3.28412702])
+    >>> approx_mp.I_
+    array([ 3,  4, -1,  0,  1])
     """
 
+    _CHECKPOINT_ATTRIBUTES = (
+        "ignore_trivial",
+        "m",
+        "T_A",
+        "μ_Q",
+        "σ_Q_inverse",
+        "μ_Q_m_1",
+        "T_A_subseq_isfinite",
+        "T_A_subseq_isconstant",
+        "T_B",
+        "M_T",
+        "Σ_T_inverse",
+        "M_T_m_1",
+        "T_B_subseq_isfinite",
+        "T_B_subseq_isconstant",
+        "n_A",
+        "n_B",
+        "l",
+        "k",
+        "P",
+        "PL",
+        "PR",
+        "I",
+        "IL",
+        "IR",
+        "excl_zone",
+        "diags",
+        "percentage",
+        "n_chunks",
+        "ndist_counts",
+        "chunk_diags_ranges",
+        "chunk_idx",
+        "diags_idx",
+        "ndist_cumsum",
+    )
+
     def __init__(
         self,
         T_A,
@@ -703,12 +795,139 @@ class scrump:
             profile. Note that this will increase the total computational time and
             memory usage when k > 1.
         """
-        self._ignore_trivial = ignore_trivial
-
         if T_B is None:
             T_B = T_A
-            self._ignore_trivial = True
+            ignore_trivial = True
+
+        self._initialize(
+            m,
+            core.preprocess_diagonal(T_A, m),
+            core.preprocess_diagonal(T_B, m),
+            ignore_trivial,
+            percentage,
+            pre_scrump,
+            s,
+            k,
+        )
+
+    @classmethod
+    def _from_preprocessed(
+        cls,
+        m,
+        T_A_preprocessed,
+        T_B_preprocessed=None,
+        ignore_trivial=True,
+        percentage=0.01,
+        pre_scrump=False,
+        s=None,
+        k=1,
+    ):
+        """
+        Create a `scrump` object from time series that have already been preprocessed
+        (e.g., with `core._preprocess_diagonal_from_cumsum`) rather than preprocessing
+        them again
+
+        Parameters
+        ----------
+        m : int
+            Window size
+
+        T_A_preprocessed : tuple
+            The outputs of `core.preprocess_diagonal` for `T_A`
+
+        T_B_preprocessed : tuple, default None
+            The outputs of `core.preprocess_diagonal` for `T_B`. When
+            `T_B_preprocessed = None`, a self-join is performed.
+
+        ignore_trivial : bool, default True
+            Set to `True` if this is a self-join. Otherwise, for AB-join, set this to
+            `False`.
+
+        percentage : float, default 0.01
+            Approximate percentage completed. The value is between 0.0 and 1.0.
+
+        pre_scrump : bool, default False
+            A flag for whether or not to perform the PreSCRIMP calculation prior to
+            computing SCRIMP
+
+        s : int, default None
+            The size of the PreSCRIMP fixed interval
+
+        k : int, default 1
+            The number of top `k` smallest distances used to construct the matrix
+            profile
+
+        Returns
+        -------
+        obj : scrump
+            The `scrump` object
+        """
+        if T_B_preprocessed is None:
+            T_B_preprocessed = T_A_preprocessed
+            ignore_trivial = True
+
+        obj = cls.__new__(cls)
+        obj._initialize(
+            m,
+            T_A_preprocessed,
+            T_B_preprocessed,
+            ignore_trivial,
+            percentage,
+            pre_scrump,
+            s,
+            k,
+        )
+
+        return obj
+
+    def _initialize(
+        self,
+        m,
+        T_A_preprocessed,
+        T_B_preprocessed,
+        ignore_trivial,
+        percentage,
+        pre_scrump,
+        s,
+        k,
+    ):
+        """
+        Initialize the `scrump` object from the preprocessed time series
+
+        Parameters
+        ----------
+        m : int
+            Window size
+
+        T_A_preprocessed : tuple
+            The outputs of `core.preprocess_diagonal` for `T_A`
+
+        T_B_preprocessed : tuple
+            The outputs of `core.preprocess_diagonal` for `T_B`
+
+        ignore_trivial : bool
+            Set to `True` if this is a self-join. Otherwise, for AB-join, set this to
+            `False`.
 
+        percentage : float
+            Approximate percentage completed. The value is between 0.0 and 1.0.
+
+        pre_scrump : bool
+            A flag for whether or not to perform the PreSCRIMP calculation prior to
+            computing SCRIMP
+
+        s : int
+            The size of the PreSCRIMP fixed interval
+
+        k : int
+            The number of top `k` smallest distances used to construct the matrix
+            profile
+
+        Returns
+        -------
+        None
+        """
+        self._ignore_trivial = ignore_trivial
         self._m = m
         (
             self._T_A,
@@ -717,7 +936,7 @@ class scrump:
             self._μ_Q_m_1,
             self._T_A_subseq_isfinite,
             self._T_A_subseq_isconstant,
-        ) = core.preprocess_diagonal(T_A, self._m)
+        ) = T_A_preprocessed
 
         (
             self._T_B,
@@ -726,7 +945,7 @@ class scrump:
             self._M_T_m_1,
             self._T_B_subseq_isfinite,
             self._T_B_subseq_isconstant,
-        ) = core.preprocess_diagonal(T_B, self._m)
+        ) = T_B_preprocessed
 
         if self._T_A.ndim != 1:  # pragma: no cover
             raise ValueError(
@@ -740,7 +959,7 @@ class scrump:
                 "For multidimensional STUMP use `stumpy.mstump` or `stumpy.mstumped`"
             )
 
-        core.check_window_size(m, max_size=min(T_A.shape[0], T_B.shape[0]))
+        core.check_window_size(m, max_size=min(self._T_A.shape[0], self._T_B.shape[0]))
         self._ignore_trivial = core.check_ignore_trivial(
             self._T_A, self._T_B, self._ignore_trivial
         )
@@ -766,32 +985,31 @@ class scrump:
                 s = int(np.ceil(self._m / config.STUMPY_EXCL_ZONE_DENOM))
 
         if pre_scrump:
+            # Reuse the diagonal preprocessing rather than preprocessing again
+            μ_Q, σ_Q = _get_mean_std_from_diagonal(
+                self._μ_Q,
+                self._σ_Q_inverse,
+                self._T_A_subseq_isfinite,
+                self._T_A_subseq_isconstant,
+            )
             if self._ignore_trivial:
-                (
-                    T_A,
-                    T_B,
-                    μ_Q,
-                    σ_Q,
-                    M_T,
-                    Σ_T,
-                    indices,
-                    s,
-                    excl_zone,
-                ) = _preprocess_prescrump(T_A, m, s=s)
+                T_B = self._T_A
+                M_T, Σ_T = μ_Q, σ_Q
+                excl_zone = self._excl_zone
             else:
-                (
-                    T_A,
-                    T_B,
-                    μ_Q,
-                    σ_Q,
-                    M_T,
-                    Σ_T,
-                    indices,
-                    s,
-                    excl_zone,
-                ) = _preprocess_prescrump(T_A, m, T_B=T_B, s=s)
-
-            P, I = _prescrump(T_A, T_B, m, μ_Q, σ_Q, M_T, Σ_T, indices, s, excl_zone, k)
+                T_B = self._T_B
+                M_T, Σ_T = _get_mean_std_from_diagonal(
+                    self._M_T,
+                    self._Σ_T_inverse,
+                    self._T_B_subseq_isfinite,
+                    self._T_B_subseq_isconstant,
+                )
+                excl_zone = None
+            indices = np.random.permutation(range(0, self._l, s)).astype(np.int64)
+
+            P, I = _prescrump(
+                self._T_A, T_B, m, μ_Q, σ_Q, M_T, Σ_T, indices, s, excl_zone, k
+            )
             core._merge_topk_PI(self._P, P, self._I, I)
 
         if self._ignore_trivial:
@@ -820,33 +1038,183 @@ class scrump:
         )
         self._n_chunks = self._chunk_diags_ranges.shape[0]
         self._chunk_idx = 0
+        self._diags_idx = 0
+        self._ndist_cumsum = np.zeros(self._diags.shape[0] + 1, dtype=np.int64)
+        self._ndist_cumsum[1:] = np.cumsum(self._ndist_counts)
+        self._ndist_per_second = None
 
-    def update(self):
+        # The per-thread Pearson correlations are kept alive across updates and are
+        # only reduced (and merged) when the matrix profile is requested
+        self._allocate_ρI()
+
+    def update(self, time_budget=None):
         """
         Update the (top-k) matrix profile and the (top-k) matrix profile indices by
         computing additional new distances (limited by `percentage`) that make up
         the full distance matrix.
+
+        Parameters
+        ----------
+        time_budget : float, default None
+            The (approximate) number of seconds to spend on computing new distances.
+            When `time_budget` is not `None`, the `percentage`-sized chunks are
+            ignored and, instead, the diagonals are processed in chunks that are
+            sized adaptively from the measured throughput (i.e., the number of
+            distances computed per second) until the budget is spent or the full
+            distance matrix is covered.
+        """
+        if time_budget is not None:
+            deadline = time.perf_counter() + time_budget
+            n_diags = self._diags.shape[0]
+            while self._diags_idx < n_diags:
+                remaining_time = deadline - time.perf_counter()
+                if remaining_time <= 0.0:
+                    break
+
+                start_idx = self._diags_idx
+                if self._ndist_per_second is None:
+                    # Probe the throughput with a small number of distances
+                    ndist = config.STUMPY_TIME_BUDGET_PROBE_NDIST
+                else:
+                    # Aim for half of the remaining time in order to not overshoot
+                    ndist = int(0.5 * remaining_time * self._ndist_per_second)
+                target = self._ndist_cumsum[start_idx] + ndist
+                stop_idx = np.searchsorted(self._ndist_cumsum, target, "right") - 1
+                stop_idx = min(max(stop_idx, start_idx + 1), n_diags)
+
+                tic = time.perf_counter()
+                self._compute_diags(start_idx, stop_idx)
+                elapsed_time = time.perf_counter() - tic
+                if elapsed_time > 0.0:
+                    ndist = self._ndist_cumsum[stop_idx] - self._ndist_cumsum[start_idx]
+                    self._ndist_per_second = ndist / elapsed_time
+
+            # Only chunks that have been fully processed are considered complete
+            self._chunk_idx = np.searchsorted(
+                self._chunk_diags_ranges[:, 1], self._diags_idx, "right"
+            )
+        elif self._chunk_idx < self._n_chunks:
+            stop_idx = self._chunk_diags_ranges[self._chunk_idx, 1]
+            self._compute_diags(self._diags_idx, stop_idx)
+            self._chunk_idx += 1
+
+    def run_until(self, deadline):
         """
-        if self._chunk_idx < self._n_chunks:
-            start_idx, stop_idx = self._chunk_diags_ranges[self._chunk_idx]
+        Update the (top-k) matrix profile and the (top-k) matrix profile indices
+        until the `deadline` (in seconds since the epoch, see `time.time`) is reached
+        or the full distance matrix is covered
+
+        Parameters
+        ----------
+        deadline : float
+            The time (in seconds since the epoch) by which the computation should
+            return
+
+        Returns
+        -------
+        coverage : float
+            The fraction of the distance matrix that has been covered so far
+        """
+        self.update(time_budget=deadline - time.time())
+
+        return self.coverage_
+
+    def _compute_diags(self, start_idx, stop_idx):
+        """
+        Compute the distances along the diagonals, `self._diags[start_idx:stop_idx]`,
+        and update the (top-k) matrix profile and the (top-k) matrix profile indices
+
+        Parameters
+        ----------
+        start_idx : int
+            The (inclusive) start index of the diagonals
+
+        stop_idx : int
+            The (exclusive) stop index of the diagonals
 
-            P, PL, PR, I, IL, IR = _stump(
-                self._T_A,
-                self._T_B,
+        Returns
+        -------
+        None
+        """
+        _stump_ρI(
+            self._T_A,
+            self._T_B,
+            self._m,
+            self._M_T,
+            self._μ_Q,
+            self._Σ_T_inverse,
+            self._σ_Q_inverse,
+            self._M_T_m_1,
+            self._μ_Q_m_1,
+            self._T_A_subseq_isfinite,
+            self._T_B_subseq_isfinite,
+            self._T_A_subseq_isconstant,
+            self._T_B_subseq_isconstant,
+            self._diags[start_idx:stop_idx],
+            self._ignore_trivial,
+            self._ρ,
+            self._ρL,
+            self._ρR,
+            self._I_ρ,
+            self._IL_ρ,
+            self._IR_ρ,
+        )
+        self._ρI_is_merged = False
+
+        self._diags_idx = stop_idx
+
+    def _allocate_ρI(self):
+        """
+        Allocate the per-thread Pearson correlations and their matrix profile indices
+        that are kept alive across updates. Nothing is allocated when all of the
+        diagonals have already been processed.
+
+        Returns
+        -------
+        None
+        """
+        if self._diags_idx < self._diags.shape[0]:
+            self._ρ = np.full((self._n_threads, self._l, self._k), np.NINF)
+            self._I_ρ = np.full((self._n_threads, self._l, self._k), -1, dtype=np.int64)
+            self._ρL = np.full((self._n_threads, self._l), np.NINF)
+            self._IL_ρ = np.full((self._n_threads, self._l), -1, dtype=np.int64)
+            self._ρR = np.full((self._n_threads, self._l), np.NINF)
+            self._IR_ρ = np.full((self._n_threads, self._l), -1, dtype=np.int64)
+        else:
+            self._free_ρI()
+        self._ρI_is_merged = True
+
+    def _free_ρI(self):
+        """
+        Free the per-thread Pearson correlations and their matrix profile indices
+
+        Returns
+        -------
+        None
+        """
+        self._ρ = None
+        self._I_ρ = None
+        self._ρL = None
+        self._IL_ρ = None
+        self._ρR = None
+        self._IR_ρ = None
+
+    def _merge_ρI(self):
+        """
+        Reduce the per-thread Pearson correlations, convert them to distances, and
+        merge them into the (top-k) matrix profile, the (top-1) left matrix profile,
+        the (top-1) right matrix profile, and their matrix profile indices. Once all
+        of the diagonals have been processed, the per-thread arrays are freed.
+        """
+        if not self._ρI_is_merged:
+            P, PL, PR, I, IL, IR = _ρI_to_PI(
                 self._m,
-                self._M_T,
-                self._μ_Q,
-                self._Σ_T_inverse,
-                self._σ_Q_inverse,
-                self._M_T_m_1,
-                self._μ_Q_m_1,
-                self._T_A_subseq_isfinite,
-                self._T_B_subseq_isfinite,
-                self._T_A_subseq_isconstant,
-                self._T_B_subseq_isconstant,
-                self._diags[start_idx:stop_idx],
-                self._ignore_trivial,
-                self._k,
+                self._ρ,
+                self._ρL,
+                self._ρR,
+                self._I_ρ,
+                self._IL_ρ,
+                self._IR_ρ,
             )
 
             # Update (top-k) matrix profile and indices
@@ -862,7 +1230,76 @@ class scrump:
             self._PR[mask] = PR[mask]
             self._IR[mask] = IR[mask]
 
-            self._chunk_idx += 1
+            self._ρI_is_merged = True
+            if self._diags_idx >= self._diags.shape[0]:
+                self._free_ρI()
+
+    def save(self, path):
+        """
+        Save a checkpoint of the `scrump` object (i.e., the preprocessed time series,
+        the permuted diagonals, the current chunk index, and the matrix profiles) to
+        a binary `.npz` file so that the computation can be resumed with
+        `scrump.load`
+
+        Parameters
+        ----------
+        path : str
+            The file name (or path) of the checkpoint. A `.npz` extension is appended
+            to the file name if it does not already have one. The checkpoint is first
+            written to a temporary file (in the same directory) that then replaces
+            any existing checkpoint so that an interrupted save never corrupts it.
+
+        Returns
+        -------
+        None
+        """
+        self._merge_ρI()
+        core._savez_atomic(
+            path,
+            normalize=True,
+            **{name: getattr(self, "_" + name) for name in self._CHECKPOINT_ATTRIBUTES},
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a `scrump` object from a checkpoint that was saved with `scrump.save` and
+        resume from where it left off without preprocessing the time series again
+
+        Parameters
+        ----------
+        path : str
+            The file name (or path) of the `.npz` checkpoint. A `.npz` extension is
+            appended to the file name if it does not already have one (as with
+            `save`).
+
+        Returns
+        -------
+        obj : scrump
+            The `scrump` object
+        """
+        path = core._get_npz_path(path)
+        with np.load(path, allow_pickle=False) as checkpoint:
+            if not checkpoint["normalize"]:
+                return scraamp.scraamp.load(path)
+
+            obj = cls.__new__(cls)
+            for name in cls._CHECKPOINT_ATTRIBUTES:
+                value = checkpoint[name]
+                setattr(obj, "_" + name, value.item() if value.ndim == 0 else value)
+
+        obj._n_threads = numba.config.NUMBA_NUM_THREADS
+        obj._ndist_per_second = None
+        obj._allocate_ρI()
+
+        return obj
+
+    @property
+    def coverage_(self):
+        """
+        Get the fraction of the distance matrix that has been covered so far
+        """
+        return self._ndist_cumsum[self._diags_idx] / max(1, self._ndist_cumsum[-1])
 
     @property
     def P_(self):
@@ -872,6 +1309,7 @@ class scrump:
         output is a 2D array that has exactly `k` columns consisting of the updated
         top-k matrix profile.
         """
+        self._merge_ρI()
         if self._k == 1:
             return self._P.flatten().astype(np.float64)
         else:
@@ -885,6 +1323,7 @@ class scrump:
         `k > 1`, the output is a 2D array that has exactly `k` columns consisting
         of the updated top-k matrix profile indices.
         """
+        self._merge_ρI()
         if self._k == 1:
             return self._I.flatten().astype(np.int64)
         else:
@@ -895,6 +1334,7 @@ class scrump:
         """
         Get the updated left (top-1) matrix profile indices
         """
+        self._merge_ρI()
         return self._IL.astype(np.int64)
 
     @property
@@ -902,4 +1342,5 @@ class scrump:
         """
         Get the updated right (top-1) matrix profile indices
         """
+        self._merge_ρI()
         return self._IR.astype(np.int64)
@@ -0,0 +1,445 @@
+# STUMPY
+# Copyright 2019 TD Ameritrade. Released under the terms of the 3-Clause BSD license.
+# STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
+
+import os
+
+import numpy as np
+from numba import njit, prange
+
+from . import core, config
+
+
+@njit(
+    # "f8[:](f8[:], f8[:], f8, f8, f8[:], f8[:], f8[:], i8, f8)",
+    parallel=True,
+    fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+)
+def _paa_early_abandon(Q, T, μ_Q, σ_Q, M_T, Σ_T, M_T_paa, s, max_distance):
+    """
+    A Numba JIT-compiled and parallelized function for computing the z-normalized
+    distance profile where any distance that is larger than `max_distance` is
+    pruned with a piecewise aggregate approximation (PAA) lower bound or abandoned
+    early and set to `np.inf`
+
+    Parameters
+    ----------
+    Q : numpy.ndarray
+        Query array or subsequence
+
+    T : numpy.ndarray
+        Time series or sequence
+
+    μ_Q : float
+        Mean of `Q`
+
+    σ_Q : float
+        Standard deviation of `Q`
+
+    M_T : numpy.ndarray
+        Sliding mean of `T`
+
+    Σ_T : numpy.ndarray
+        Sliding standard deviation of `T`
+
+    M_T_paa : numpy.ndarray
+        Sliding mean of `T` with a window size of `s` (i.e., the PAA segment means
+        of all subsequences in `T`)
+
+    s : int
+        The length of each PAA segment
+
+    max_distance : float
+        The largest distance that is computed exactly
+
+    Returns
+    -------
+    output : numpy.ndarray
+        Distance profile where all distances that are larger than `max_distance` are
+        set to `np.inf`
+
+    Notes
+    -----
+    `DOI: 10.1007/PL00011669 \
+    <https://www.cs.ucr.edu/~eamonn/kais_2000.pdf>`__
+
+    See Section 4
+    """
+    m = Q.shape[0]
+    l = M_T.shape[0]
+    w = m // s
+    max_D_squared = max_distance * max_distance
+    D = np.full(l, np.inf, dtype=np.float64)
+
+    if σ_Q < config.STUMPY_STDDEV_THRESHOLD:
+        Q_z = np.zeros(m, dtype=np.float64)
+    else:
+        Q_z = (Q - μ_Q) / σ_Q
+
+    Q_paa = np.empty(w, dtype=np.float64)
+    for k in range(w):
+        Q_paa[k] = np.mean(Q_z[k * s : (k + 1) * s])
+
+    Q_order = np.argsort(-np.abs(Q_z))
+    Q_z = Q_z[Q_order]
+
+    for i in prange(l):
+        if np.isinf(M_T[i]):
+            continue
+
+        if (
+            σ_Q < config.STUMPY_STDDEV_THRESHOLD
+            or Σ_T[i] < config.STUMPY_STDDEV_THRESHOLD
+        ):
+            D_squared = core._calculate_squared_distance(
+                m, 0.0, μ_Q, σ_Q, M_T[i], Σ_T[i]
+            )
+        else:
+            # The PAA lower bound of the squared distance
+            D_squared = 0.0
+            for k in range(w):
+                D_squared += (
+                    s * ((M_T_paa[i + k * s] - M_T[i]) / Σ_T[i] - Q_paa[k]) ** 2
+                )
+                if D_squared > max_D_squared:
+                    break
+            if D_squared > max_D_squared:
+                continue
+
+            D_squared = 0.0
+            for j in range(m):
+                D_squared += ((T[i + Q_order[j]] - M_T[i]) / Σ_T[i] - Q_z[j]) ** 2
+                if D_squared > max_D_squared:
+                    break
+
+            if D_squared < config.STUMPY_P_NORM_THRESHOLD:
+                D_squared = 0.0
+
+        if D_squared <= max_D_squared:
+            D[i] = np.sqrt(D_squared)
+
+    return D
+
+
+class search_index:
+    """
+    A reusable index of the time series, `T`, for repeatedly finding all matches of
+    (z-normalized) queries with one of several window sizes
+
+    The rolling statistics of `T` for each window size, the FFT spectrum of `T`, and
+    a piecewise aggregate approximation (PAA) summary of all subsequences are computed
+    once and are shared by all subsequent queries.
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        The time series of interest
+
+    m_range : int or iterable
+        The window size(s) (i.e., the length of the queries) to index
+
+    n_segments : int, default 8
+        The number of PAA segments that each subsequence is summarized by. The PAA
+        summary provides a lower bound for pruning subsequences whose distance is
+        larger than `max_distance`.
+
+    Attributes
+    ----------
+    T_ : numpy.ndarray
+        The indexed time series, `T`
+
+    m_range_ : numpy.ndarray
+        The indexed window sizes
+
+    Methods
+    -------
+    match(Q, max_distance=None, max_matches=None, atol=1e-8, query_idx=None, \
+        early_abandon=False)
+        Find all matches of a query `Q` in the indexed time series `T`
+
+    save(dirname)
+        Save the index to the directory, `dirname`
+
+    load(dirname, mmap_mode=None)
+        Load an index that was saved to the directory, `dirname`
+
+    Examples
+    --------
+    >>> index = stumpy.search_index(
+    ...     np.array([584., -11., 23., 79., 1001., 0., -19.]),
+    ...     m_range=[3, 4])
+    >>> index.match(np.array([-11.1, 23.4, 79.5, 1001.0]))
+    array([[0.0011129739302218461, 1]], dtype=object)
+    """
+
+    def __init__(self, T, m_range, n_segments=8):
+        """
+        Initialize the `search_index` object
+
+        Parameters
+        ----------
+        T : numpy.ndarray
+            The time series of interest
+
+        m_range : int or iterable
+            The window size(s) (i.e., the length of the queries) to index
+
+        n_segments : int, default 8
+            The number of PAA segments that each subsequence is summarized by. The
+            PAA summary provides a lower bound for pruning subsequences whose
+            distance is larger than `max_distance`.
+        """
+        self._T = core._preprocess(T)
+        if self._T.ndim != 1:  # pragma: no cover
+            raise ValueError(
+                f"T is {self._T.ndim}-dimensional and must be 1-dimensional. "
+            )
+
+        self._m_range = np.unique(np.atleast_1d(np.asarray(m_range, dtype=np.int64)))
+        for m in self._m_range:
+            core.check_window_size(m, max_size=self._T.shape[0])
+        self._n_segments = n_segments
+
+        self._T_finite = self._T.copy()
+        self._T_finite[~np.isfinite(self._T_finite)] = 0.0
+
+        self._T_fft, self._nfft = core._rfft_spectrum(self._T_finite, self._m_range[-1])
+
+        self._M_T = {}
+        self._Σ_T = {}
+        self._M_T_paa = {}
+        for m in self._m_range:
+            _, self._M_T[m], self._Σ_T[m] = core.preprocess(self._T, m)
+            s = self._get_segment_length(m)
+            self._M_T_paa[m], _ = core.compute_mean_std(self._T_finite, s)
+
+    def _get_segment_length(self, m):
+        """
+        Get the length of each PAA segment for the window size, `m`
+
+        Parameters
+        ----------
+        m : int
+            Window size
+
+        Returns
+        -------
+        s : int
+            The length of each PAA segment
+        """
+        return max(1, m // self._n_segments)
+
+    def match(
+        self,
+        Q,
+        max_distance=None,
+        max_matches=None,
+        atol=1e-8,
+        query_idx=None,
+        early_abandon=False,
+    ):
+        """
+        Find all matches of a query `Q` in the indexed time series `T`
+
+        The indices of subsequences whose distances to `Q` are less than or equal to
+        `max_distance`, sorted by distance (lowest to highest). Around each occurrence
+        an exclusion zone is applied before searching for the next.
+
+        Parameters
+        ----------
+        Q : numpy.ndarray
+            The query sequence. It doesn't have to be a subsequence of `T` but its
+            length must be one of the indexed window sizes.
+
+        max_distance : float or function, default None
+            Maximum distance between `Q` and a subsequence `S` for `S` to be
+            considered a match.
+            If a function, then it has to be a function of one argument `D`, which
+            will be the distance profile of `Q` with `T` (a 1D numpy array of size
+            `n-m+1`).
+            If None, this defaults to
+            `np.nanmax([np.nanmean(D) - 2 * np.nanstd(D), np.nanmin(D)])` (i.e. at
+            least the closest match will be returned).
+
+        max_matches : int, default None
+            The maximum amount of similar occurrences to be returned. The resulting
+            occurrences are sorted by distance, so a value of `10` means that the
+            indices of the most similar `10` subsequences is returned. If `None`,
+            then all occurrences are returned.
+
+        atol : float, default 1e-8
+            The absolute tolerance parameter. This value will be added to
+            `max_distance` when comparing distances between subsequences.
+
+        query_idx : int, default None
+            This is the index position along the time series, `T`, where the query
+            subsequence, `Q`, is located. If `query_idx` is set to a specific integer
+            value, then this will help ensure that the self-match will be returned
+            first.
+
+        early_abandon : bool, default False
+            By default, the full distance profile is computed from the indexed FFT
+            spectrum. When set to `True`, subsequences are instead pruned with the PAA
+            lower bound and their distances are abandoned as soon as they exceed
+            `max_distance`. If `None`, then the faster option is automatically chosen.
+            Early abandoning is only supported when `max_distance` is a float, and a
+            `ValueError` is raised if it is explicitly requested otherwise.
+
+        Returns
+        -------
+        out : numpy.ndarray
+            The first column consists of distances of subsequences of `T` whose
+            distances to `Q` are less than or equal to `max_distance`, sorted by
+            distance (lowest to highest). The second column consists of the
+            corresponding indices in `T`.
+        """
+        Q = core._preprocess(Q)
+        if np.any(np.isnan(Q)) or np.any(np.isinf(Q)):  # pragma: no cover
+            raise ValueError("Q contains illegal values (NaN or inf)")
+        if Q.ndim != 1:  # pragma: no cover
+            raise ValueError(f"Q is {Q.ndim}-dimensional and must be 1-dimensional. ")
+
+        n = self._T.shape[0]
+        m = Q.shape[0]
+        if m not in self._m_range:
+            raise ValueError(
+                f"The length of `Q` ({m}) is not one of the indexed window sizes "
+                f"{self._m_range.tolist()}"
+            )
+        excl_zone = int(np.ceil(m / config.STUMPY_EXCL_ZONE_DENOM))
+
+        if not isinstance(max_distance, float):
+            if early_abandon:
+                raise ValueError(
+                    "`early_abandon=True` requires `max_distance` to be a float. Set "
+                    "`early_abandon=False` instead."
+                )
+            early_abandon = False
+        if early_abandon is None:
+            # The expected squared difference between two random z-normalized values
+            # is 2
+            early_abandon = core._is_early_abandon_faster(
+                n, m, np.square(max_distance + atol) / 2.0
+            )
+
+        M_T = self._M_T[m]
+        Σ_T = self._Σ_T[m]
+        μ_Q, σ_Q = core.compute_mean_std(Q, m)
+        if early_abandon:
+            D = _paa_early_abandon(
+                Q,
+                self._T_finite,
+                μ_Q[0],
+                σ_Q[0],
+                M_T,
+                Σ_T,
+                self._M_T_paa[m],
+                self._get_segment_length(m),
+                max_distance + atol,
+            )
+        else:
+            QT = core._sliding_dot_product_from_spectrum(Q, self._T_fft, self._nfft, n)
+            D = core._mass(Q, self._T_finite, QT, μ_Q[0], σ_Q[0], M_T, Σ_T)
+
+        distances, indices = core._find_matches(
+            D,
+            excl_zone,
+            max_distance=max_distance,
+            max_matches=max_matches,
+            query_idx=query_idx,
+            atol=atol,
+        )
+
+        return core._matches_to_array(distances, indices)
+
+    def save(self, dirname):
+        """
+        Save the index to the directory, `dirname`, as a collection of `.npy` files
+        so that it can be reloaded (or memory-mapped) with `search_index.load`
+
+        Parameters
+        ----------
+        dirname : str
+            The directory to save the index to. It is created if it does not exist.
+
+        Returns
+        -------
+        None
+        """
+        os.makedirs(dirname, exist_ok=True)
+        np.save(os.path.join(dirname, "T.npy"), self._T, allow_pickle=False)
+        np.save(
+            os.path.join(dirname, "params.npy"),
+            np.array([self._n_segments, self._nfft], dtype=np.int64),
+            allow_pickle=False,
+        )
+        np.save(os.path.join(dirname, "m_range.npy"), self._m_range, allow_pickle=False)
+        np.save(os.path.join(dirname, "T_fft.npy"), self._T_fft, allow_pickle=False)
+        for m in self._m_range:
+            np.save(os.path.join(dirname, f"M_T_{m}.npy"), self._M_T[m])
+            np.save(os.path.join(dirname, f"Σ_T_{m}.npy"), self._Σ_T[m])
+            np.save(os.path.join(dirname, f"M_T_paa_{m}.npy"), self._M_T_paa[m])
+
+    @classmethod
+    def load(cls, dirname, mmap_mode=None):
+        """
+        Load an index that was saved to the directory, `dirname`
+
+        Parameters
+        ----------
+        dirname : str
+            The directory that the index was saved to
+
+        mmap_mode : str, default None
+            If not `None`, then the arrays of the index are memory-mapped using the
+            given mode (see `numpy.load`) rather than being read into memory
+
+        Returns
+        -------
+        index : search_index
+            The loaded index
+        """
+        index = cls.__new__(cls)
+        index._T = np.load(os.path.join(dirname, "T.npy"), allow_pickle=False)
+        index._n_segments, index._nfft = np.load(
+            os.path.join(dirname, "params.npy"), allow_pickle=False
+        ).tolist()
+        index._m_range = np.load(
+            os.path.join(dirname, "m_range.npy"), allow_pickle=False
+        )
+        index._T_fft = np.load(
+            os.path.join(dirname, "T_fft.npy"), mmap_mode=mmap_mode, allow_pickle=False
+        )
+
+        index._T_finite = index._T.copy()
+        index._T_finite[~np.isfinite(index._T_finite)] = 0.0
+
+        index._M_T = {}
+        index._Σ_T = {}
+        index._M_T_paa = {}
+        for m in index._m_range:
+            index._M_T[m] = np.load(
+                os.path.join(dirname, f"M_T_{m}.npy"), mmap_mode=mmap_mode
+            )
+            index._Σ_T[m] = np.load(
+                os.path.join(dirname, f"Σ_T_{m}.npy"), mmap_mode=mmap_mode
+            )
+            index._M_T_paa[m] = np.load(
+                os.path.join(dirname, f"M_T_paa_{m}.npy"), mmap_mode=mmap_mode
+            )
+
+        return index
+
+    @property
+    def T_(self):
+        """
+        Get the indexed time series, `T`
+        """
+        return self._T.astype(np.float64)
+
+    @property
+    def m_range_(self):
+        """
+        Get the indexed window sizes
+        """
+        return self._m_range.astype(np.int64)
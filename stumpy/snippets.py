@@ -3,8 +3,9 @@
 # STUMPY is a trademark of TD Ameritrade IP Company, Inc. All rights reserved.
 
 import math
+import weakref
 import numpy as np
-from . import core
+from . import config, core
 from .core import check_window_size, _get_mask_slices
 from .mpdist import _mpdist_vect
 from .aampdist_snippets import aampdist_snippets
@@ -97,6 +98,8 @@ def _get_all_profiles(
         s = min(math.ceil(percentage * m), m)
 
     M_T, Σ_T = core.compute_mean_std(T, s)
+    # The spectrum of `T` is shared by all of the non-overlapping subsequences
+    T_fft, nfft = core._rfft_spectrum(np.where(np.isfinite(T), T, 0.0), s)
 
     # Iterate over non-overlapping subsequences, see Definition 3
     for i in range((n_padded // m) - 1):
@@ -114,6 +117,8 @@ def _get_all_profiles(
             percentage=mpdist_percentage,
             k=mpdist_k,
             custom_func=mpdist_custom_func,
+            T_fft=T_fft,
+            nfft=nfft,
         )
 
     stop_idx = n_padded - m + 1 - right_pad
@@ -122,6 +127,93 @@ def _get_all_profiles(
     return D
 
 
+_PROFILES_CACHE = {}
+
+
+def _get_cached_all_profiles(
+    T,
+    m,
+    percentage=1.0,
+    s=None,
+    mpdist_percentage=0.05,
+    mpdist_k=None,
+    T_input=None,
+):
+    """
+    Return the (read-only) MPdist profiles from `_get_all_profiles` and keep up to
+    `config.STUMPY_SNIPPETS_CACHE_SIZE` of the most recently computed profiles so that
+    re-running `snippets` on the same time series with, say, a different number of
+    snippets, `k`, does not recompute them
+
+    Parameters
+    ----------
+    T : numpy.ndarray
+        The (preprocessed) time series or sequence for which to find the snippets
+
+    m : int
+        The window size for each non-overlapping subsequence, `S[i]`.
+
+    percentage : float, default 1.0
+        With the length of each non-overlapping subsequence, `S[i]`, set to `m`, this
+        is the percentage of `S[i]` (i.e., `percentage * m`) to set the `s` to.
+
+    s : int, default None
+        With the length of each non-overlapping subsequence, `S[i]`, set to `m`, this
+        is essentially the sub-subsequence length (i.e., a shorter part of `S[i]`).
+        When `s` is not `None`, then the `percentage` parameter is ignored.
+
+    mpdist_percentage : float, default 0.05
+        The percentage of distances that will be used to report `mpdist`. The value
+        is between 0.0 and 1.0.
+
+    mpdist_k : int
+        Specify the `k`th value in the concatenated matrix profiles to return. When
+        `mpdist_k` is not `None`, then the `mpdist_percentage` parameter is ignored.
+
+    T_input : numpy.ndarray, default None
+        The caller-supplied time series (i.e., prior to preprocessing) whose identity
+        is used to look up the cached profiles. The profiles are not cached when
+        `T_input` is not a numpy array. Note that modifying `T_input` in place does
+        not invalidate its cached profiles.
+
+    Returns
+    -------
+    D : numpy.ndarray
+        MPdist profiles
+    """
+    if config.STUMPY_SNIPPETS_CACHE_SIZE < 1 or not isinstance(T_input, np.ndarray):
+        return _get_all_profiles(
+            T,
+            m,
+            percentage=percentage,
+            s=s,
+            mpdist_percentage=mpdist_percentage,
+            mpdist_k=mpdist_k,
+        )
+
+    # Evict the profiles of the time series that no longer exist
+    for key in [key for key, (T_ref, _) in _PROFILES_CACHE.items() if T_ref() is None]:
+        del _PROFILES_CACHE[key]
+
+    key = (id(T_input), m, percentage, s, mpdist_percentage, mpdist_k)
+    if key not in _PROFILES_CACHE:
+        D = _get_all_profiles(
+            T,
+            m,
+            percentage=percentage,
+            s=s,
+            mpdist_percentage=mpdist_percentage,
+            mpdist_k=mpdist_k,
+        )
+        D.flags.writeable = False
+        while len(_PROFILES_CACHE) >= config.STUMPY_SNIPPETS_CACHE_SIZE:
+            # Evict the oldest profiles (dictionaries preserve insertion order)
+            _PROFILES_CACHE.pop(next(iter(_PROFILES_CACHE)))
+        _PROFILES_CACHE[key] = (weakref.ref(T_input), D)
+
+    return _PROFILES_CACHE[key][1]
+
+
 @core.non_normalized(aampdist_snippets)
 def snippets(
     T,
@@ -229,6 +321,7 @@ def snippets(
            [1, 1, 2],
            [1, 3, 4]]))
     """
+    T_input = T
     T = core._preprocess(T)
 
     if m > T.shape[0] // 2:  # pragma: no cover
@@ -239,13 +332,14 @@ def snippets(
 
     check_window_size(m, max_size=T.shape[0] // 2)
 
-    D = _get_all_profiles(
+    D = _get_cached_all_profiles(
         T,
         m,
         percentage=percentage,
         s=s,
         mpdist_percentage=mpdist_percentage,
         mpdist_k=mpdist_k,
+        T_input=T_input,
     )
 
     pad_width = (0, int(m * np.ceil(T.shape[0] / m) - T.shape[0]))
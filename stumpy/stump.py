@@ -247,13 +247,15 @@ def _compute_diagonal(
 
     return
 
+
 @njit(
     # "(f8[:], f8[:], i8, f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], b1[:], b1[:],"
-    # "b1[:], b1[:], i8[:], b1, i8)",
+    # "b1[:], b1[:], i8[:], b1, f8[:, :, :], f8[:, :], f8[:, :], i8[:, :, :],"
+    # "i8[:, :], i8[:, :])",
     parallel=True,
     fastmath=True,
 )
-def _stump(
+def _stump_ρI(
     T_A,
     T_B,
     m,
@@ -269,13 +271,18 @@ def _stump(
     T_B_subseq_isconstant,
     diags,
     ignore_trivial,
-    k,
+    ρ,
+    ρL,
+    ρR,
+    I,
+    IL,
+    IR,
 ):
     """
-    A Numba JIT-compiled version of STOMPopt with Pearson correlations for parallel
-    computation of the (top-k) matrix profile, the (top-k) matrix profile indices,
-    the top-1 left matrix profile and its matrix profile index, and the top-1 right
-    matrix profile and its matrix profile index.
+    A Numba JIT-compiled function for traversing the diagonals, `diags`, in parallel
+    and updating the per-thread (top-k) Pearson correlations and matrix profile
+    indices in place. Since the per-thread arrays are not reduced, they can be reused
+    (and kept alive) across many calls with different `diags`.
 
     Parameters
     ----------
@@ -328,97 +335,39 @@ def _stump(
 
     ignore_trivial : bool
         Set to `True` if this is a self-join. Otherwise, for AB-join, set this to
-        `False`. Default is `True`.
-
-    k : int
-        The number of top `k` smallest distances used to construct the matrix profile.
-        Note that this will increase the total computational time and memory usage
-        when k > 1.
+        `False`.
 
-    Returns
-    -------
-    out1 : numpy.ndarray
-        The (top-k) matrix profile
-
-    out2 : numpy.ndarray
-        The (top-1) left matrix profile
-
-    out3 : numpy.ndarray
-        The (top-1) right matrix profile
-
-    out4 : numpy.ndarray
-        The (top-k) matrix profile indices
-
-    out5 : numpy.ndarray
-        The (top-1) left matrix profile indices
-
-    out6 : numpy.ndarray
-        The (top-1) right matrix profile indices
-
-    Notes
-    -----
-    `DOI: 10.1007/s10115-017-1138-x \
-    <https://www.cs.ucr.edu/~eamonn/ten_quadrillion.pdf>`__
-
-    See Section 4.5
-
-    The above reference outlines a general approach for traversing the distance
-    matrix in a diagonal fashion rather than in a row-wise fashion.
-
-    `DOI: 10.1145/3357223.3362721 \
-    <https://www.cs.ucr.edu/~eamonn/public/GPU_Matrix_profile_VLDB_30DraftOnly.pdf>`__
-
-    See Section 3.1 and Section 3.3
-
-    The above reference outlines the use of the Pearson correlation via Welford's
-    centered sum-of-products along each diagonal of the distance matrix in place of the
-    sliding window dot product found in the original STOMP method.
-
-    `DOI: 10.1109/ICDM.2016.0085 \
-    <https://www.cs.ucr.edu/~eamonn/STOMP_GPU_final_submission_camera_ready.pdf>`__
-
-    See Table II
+    ρ : numpy.ndarray
+        The (top-k) Pearson correlations of each thread, sorted in ascending order per
+        row
 
-    Timeseries, T_A, will be annotated with the distance location
-    (or index) of all its subsequences in another times series, T_B.
+    ρL : numpy.ndarray
+        The top-1 left Pearson correlations of each thread
 
-    Return: For every subsequence, Q, in T_A, you will get a distance
-    and index for the closest subsequence in T_B. Thus, the array
-    returned will have length T_A.shape[0]-m+1. Additionally, the
-    left and right matrix profiles are also returned.
+    ρR : numpy.ndarray
+        The top-1 right Pearson correlations of each thread
 
-    Note: Unlike in the Table II where T_A.shape is expected to be equal
-    to T_B.shape, this implementation is generalized so that the shapes of
-    T_A and T_B can be different. In the case where T_A.shape == T_B.shape,
-    then our algorithm reduces down to the same algorithm found in Table II.
+    I : numpy.ndarray
+        The (top-k) matrix profile indices of each thread
 
-    Additionally, unlike STAMP where the exclusion zone is m/2, the default
-    exclusion zone for STOMP is m/4 (See Definition 3 and Figure 3).
+    IL : numpy.ndarray
+        The top-1 left matrix profile indices of each thread
 
-    For self-joins, set `ignore_trivial = True` in order to avoid the
-    trivial match.
+    IR : numpy.ndarray
+        The top-1 right matrix profile indices of each thread
 
-    Note that left and right matrix profiles are only available for self-joins.
+    Returns
+    -------
+    None
     """
     n_A = T_A.shape[0] # length A
     n_B = T_B.shape[0] # length B
-    l = n_A - m + 1 # l: startindex for last subsequence in T / number of subsequences in A
-    n_threads = numba.config.NUMBA_NUM_THREADS # default: num threads = num of CPU cores available (for gruenau8 36*2=72)
-
-    ρ = np.full((n_threads, l, k), np.NINF, dtype=np.float64) # init Pearson correlation matrix
-    I = np.full((n_threads, l, k), -1, dtype=np.int64) # init MPIndex matrix
-
-    ρL = np.full((n_threads, l), np.NINF, dtype=np.float64) # init Pearson correlation matrix left
-    IL = np.full((n_threads, l), -1, dtype=np.int64) # init MPIndex matrix left
-
-    ρR = np.full((n_threads, l), np.NINF, dtype=np.float64) # init Pearson correlation matrix right
-    IR = np.full((n_threads, l), -1, dtype=np.int64) # init MPIndex matrix right
+    n_threads = ρ.shape[0] # default: num threads = num of CPU cores available (for gruenau8 36*2=72)
 
     ndist_counts = core._count_diagonal_ndist(diags, m, n_A, n_B) # the number of distances that would be computed for each diagonal index referenced in `diags`
     diags_ranges = core._get_array_ranges(ndist_counts, n_threads, False) # splits ndist_counts into n_threads parts
 
-
-    cov_a = T_B[m - 1 :] - M_T_m_1[:-1] 
+    cov_a = T_B[m - 1 :] - M_T_m_1[:-1]
     cov_b = T_A[m - 1 :] - μ_Q_m_1[:-1]
     # The next lines are equivalent and left for reference
     # cov_c = np.roll(T_A, 1)
@@ -469,6 +418,65 @@ def _stump(
         )
 
 
+@njit(
+    # "(i8, f8[:, :, :], f8[:, :], f8[:, :], i8[:, :, :], i8[:, :], i8[:, :])",
+    parallel=True,
+    fastmath=True,
+)
+def _ρI_to_PI(m, ρ, ρL, ρR, I, IL, IR):
+    """
+    A Numba JIT-compiled function for reducing the per-thread (top-k) Pearson
+    correlations and matrix profile indices and converting the Pearson correlations
+    to z-normalized Euclidean distances. The reduction is performed in place into
+    the first thread, which only ever adds (already computed) correlations to it, so
+    the per-thread arrays may continue to be updated and reduced again afterward.
+
+    Parameters
+    ----------
+    m : int
+        Window size
+
+    ρ : numpy.ndarray
+        The (top-k) Pearson correlations of each thread, sorted in ascending order per
+        row
+
+    ρL : numpy.ndarray
+        The top-1 left Pearson correlations of each thread
+
+    ρR : numpy.ndarray
+        The top-1 right Pearson correlations of each thread
+
+    I : numpy.ndarray
+        The (top-k) matrix profile indices of each thread
+
+    IL : numpy.ndarray
+        The top-1 left matrix profile indices of each thread
+
+    IR : numpy.ndarray
+        The top-1 right matrix profile indices of each thread
+
+    Returns
+    -------
+    P : numpy.ndarray
+        The (top-k) matrix profile
+
+    PL : numpy.ndarray
+        The (top-1) left matrix profile
+
+    PR : numpy.ndarray
+        The (top-1) right matrix profile
+
+    I : numpy.ndarray
+        The (top-k) matrix profile indices
+
+    IL : numpy.ndarray
+        The (top-1) left matrix profile indices
+
+    IR : numpy.ndarray
+        The (top-1) right matrix profile indices
+    """
+    n_threads = ρ.shape[0]
+
     # Reduction of results from all threads
     for thread_idx in range(1, n_threads):
         # update top-k arrays
@@ -513,6 +521,197 @@ def _stump(
     )
 
 
+@njit(
+    # "(f8[:], f8[:], i8, f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], b1[:], b1[:],"
+    # "b1[:], b1[:], i8[:], b1, i8)",
+    fastmath=True,
+)
+def _stump(
+    T_A,
+    T_B,
+    m,
+    M_T,
+    μ_Q,
+    Σ_T_inverse,
+    σ_Q_inverse,
+    M_T_m_1,
+    μ_Q_m_1,
+    T_A_subseq_isfinite,
+    T_B_subseq_isfinite,
+    T_A_subseq_isconstant,
+    T_B_subseq_isconstant,
+    diags,
+    ignore_trivial,
+    k,
+):
+    """
+    A Numba JIT-compiled version of STOMPopt with Pearson correlations for parallel
+    computation of the (top-k) matrix profile, the (top-k) matrix profile indices,
+    the top-1 left matrix profile and its matrix profile index, and the top-1 right
+    matrix profile and its matrix profile index.
+
+    Parameters
+    ----------
+    T_A : numpy.ndarray
+        The time series or sequence for which to compute the matrix profile
+
+    T_B : numpy.ndarray
+        The time series or sequence that will be used to annotate T_A. For every
+        subsequence in T_A, its nearest neighbor in T_B will be recorded.
+
+    m : int
+        Window size
+
+    M_T : numpy.ndarray
+        Sliding mean of time series, `T`
+
+    μ_Q : numpy.ndarray
+        Mean of the query sequence, `Q`, relative to the current sliding window
+
+    Σ_T_inverse : numpy.ndarray
+        Inverse sliding standard deviation of time series, `T`
+
+    σ_Q_inverse : numpy.ndarray
+        Inverse standard deviation of the query sequence, `Q`, relative to the current
+        sliding window
+
+    M_T_m_1 : numpy.ndarray
+        Sliding mean of time series, `T`, using a window size of `m-1`
+
+    μ_Q_m_1 : numpy.ndarray
+        Mean of the query sequence, `Q`, relative to the current sliding window and
+        using a window size of `m-1`
+
+    T_A_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T_A` contains a
+        `np.nan`/`np.inf` value (False)
+
+    T_B_subseq_isfinite : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T_B` contains a
+        `np.nan`/`np.inf` value (False)
+
+    T_A_subseq_isconstant : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T_A` is constant (True)
+
+    T_B_subseq_isconstant : numpy.ndarray
+        A boolean array that indicates whether a subsequence in `T_B` is constant (True)
+
+    diags : numpy.ndarray
+        The diagonal indices
+
+    ignore_trivial : bool
+        Set to `True` if this is a self-join. Otherwise, for AB-join, set this to
+        `False`. Default is `True`.
+
+    k : int
+        The number of top `k` smallest distances used to construct the matrix profile.
+        Note that this will increase the total computational time and memory usage
+        when k > 1.
+
+    Returns
+    -------
+    out1 : numpy.ndarray
+        The (top-k) matrix profile
+
+    out2 : numpy.ndarray
+        The (top-1) left matrix profile
+
+    out3 : numpy.ndarray
+        The (top-1) right matrix profile
+
+    out4 : numpy.ndarray
+        The (top-k) matrix profile indices
+
+    out5 : numpy.ndarray
+        The (top-1) left matrix profile indices
+
+    out6 : numpy.ndarray
+        The (top-1) right matrix profile indices
+
+    Notes
+    -----
+    `DOI: 10.1007/s10115-017-1138-x \
+    <https://www.cs.ucr.edu/~eamonn/ten_quadrillion.pdf>`__
+
+    See Section 4.5
+
+    The above reference outlines a general approach for traversing the distance
+    matrix in a diagonal fashion rather than in a row-wise fashion.
+
+    `DOI: 10.1145/3357223.3362721 \
+    <https://www.cs.ucr.edu/~eamonn/public/GPU_Matrix_profile_VLDB_30DraftOnly.pdf>`__
+
+    See Section 3.1 and Section 3.3
+
+    The above reference outlines the use of the Pearson correlation via Welford's
+    centered sum-of-products along each diagonal of the distance matrix in place of the
+    sliding window dot product found in the original STOMP method.
+
+    `DOI: 10.1109/ICDM.2016.0085 \
+    <https://www.cs.ucr.edu/~eamonn/STOMP_GPU_final_submission_camera_ready.pdf>`__
+
+    See Table II
+
+    Timeseries, T_A, will be annotated with the distance location
+    (or index) of all its subsequences in another times series, T_B.
+
+    Return: For every subsequence, Q, in T_A, you will get a distance
+    and index for the closest subsequence in T_B. Thus, the array
+    returned will have length T_A.shape[0]-m+1. Additionally, the
+    left and right matrix profiles are also returned.
+
+    Note: Unlike in the Table II where T_A.shape is expected to be equal
+    to T_B.shape, this implementation is generalized so that the shapes of
+    T_A and T_B can be different. In the case where T_A.shape == T_B.shape,
+    then our algorithm reduces down to the same algorithm found in Table II.
+
+    Additionally, unlike STAMP where the exclusion zone is m/2, the default
+    exclusion zone for STOMP is m/4 (See Definition 3 and Figure 3).
+
+    For self-joins, set `ignore_trivial = True` in order to avoid the
+    trivial match.
+
+    Note that left and right matrix profiles are only available for self-joins.
+    """
+    l = T_A.shape[0] - m + 1 # l: startindex for last subsequence in T / number of subsequences in A
+    n_threads = numba.config.NUMBA_NUM_THREADS # default: num threads = num of CPU cores available (for gruenau8 36*2=72)
+
+    ρ = np.full((n_threads, l, k), np.NINF, dtype=np.float64) # init Pearson correlation matrix
+    I = np.full((n_threads, l, k), -1, dtype=np.int64) # init MPIndex matrix
+
+    ρL = np.full((n_threads, l), np.NINF, dtype=np.float64) # init Pearson correlation matrix left
+    IL = np.full((n_threads, l), -1, dtype=np.int64) # init MPIndex matrix left
+
+    ρR = np.full((n_threads, l), np.NINF, dtype=np.float64) # init Pearson correlation matrix right
+    IR = np.full((n_threads, l), -1, dtype=np.int64) # init MPIndex matrix right
+
+    _stump_ρI(
+        T_A,
+        T_B,
+        m,
+        M_T,
+        μ_Q,
+        Σ_T_inverse,
+        σ_Q_inverse,
+        M_T_m_1,
+        μ_Q_m_1,
+        T_A_subseq_isfinite,
+        T_B_subseq_isfinite,
+        T_A_subseq_isconstant,
+        T_B_subseq_isconstant,
+        diags,
+        ignore_trivial,
+        ρ,
+        ρL,
+        ρR,
+        I,
+        IL,
+        IR,
+    )
+
+    return _ρI_to_PI(m, ρ, ρL, ρR, I, IL, IR)
+
+
 @core.non_normalized(aamp)
 def stump(T_A, m, T_B=None, ignore_trivial=True, normalize=True, p=2.0, k=1):
     """
@@ -2026,3 +2026,37 @@ def find_matches(D, excl_zone, max_distance, max_matches=None):
         matches = [x for x in matches if x < idx - excl_zone or x > idx + excl_zone]
 
     return np.array(result[:max_matches], dtype=object)
+
+
+def atsc(IL, IR, j):
+    C = [j]
+    for i in range(IL.size):
+        if IR[j] == -1 or IL[IR[j]] != j:
+            break
+        else:
+            j = IR[j]
+            C.append(j)
+
+    return np.array(C, dtype=np.int64)
+
+
+def allc(IL, IR):
+    L = np.ones(IL.size, dtype=np.int64)
+    S = set()
+    for i in range(IL.size):
+        if L[i] == 1:
+            j = i
+            C = [j]
+            for k in range(IL.size):
+                if IR[j] == -1 or IL[IR[j]] != j:
+                    break
+                else:
+                    j = IR[j]
+                    L[j] = -1
+                    L[i] = L[i] + 1
+                    C.append(j)
+            S.update([tuple(C)])
+    C = atsc(IL, IR, L.argmax())
+    S = [np.array(s, dtype=np.int64) for s in S]
+
+    return S, C
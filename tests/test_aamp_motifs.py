@@ -2,10 +2,26 @@ import numpy as np
 import numpy.testing as npt
 import pytest
 
-from stumpy import core, aamp_motifs, aamp_match
+from stumpy import core, aamp_motifs, aamp_match, aamp_match_many
 
 import naive
 
+
+def naive_aamp_match_many(Q, Ts, excl_zone, max_distance, max_matches=None, p=2.0):
+    m = Q.shape[0]
+    result = []
+    for i, T in enumerate(Ts):
+        if T.shape[0] < m:
+            continue
+        D = naive.aamp_distance_profile(Q, T, m, p)
+        for dist, idx in naive.find_matches(D, excl_zone, max_distance):
+            result.append([dist, i, idx])
+
+    result.sort(key=lambda x: x[0])
+
+    return np.array(result[:max_matches], dtype=object)
+
+
 test_data = [
     (
         np.array([0.0, 1.0, 0.0]),
@@ -241,3 +257,105 @@ def test_aamp_match_T_subseq_isfinite(Q, T):
         )
 
         npt.assert_almost_equal(left, right)
+
+
+@pytest.mark.parametrize("Q, T", test_data)
+def test_aamp_match_early_abandon(Q, T):
+    m = Q.shape[0]
+    excl_zone = int(np.ceil(m / 4))
+    T = T.copy()
+    T[1] = np.nan
+
+    for p in [1.0, 2.0, 3.0]:
+        for max_distance in [0.3, 3.0, 2000.0]:
+            left = naive_aamp_match(
+                Q,
+                T,
+                p=p,
+                excl_zone=excl_zone,
+                max_distance=max_distance,
+            )
+
+            for early_abandon in [True, False, None]:
+                right = aamp_match(
+                    Q,
+                    T,
+                    p=p,
+                    max_distance=max_distance,
+                    early_abandon=early_abandon,
+                )
+
+                npt.assert_almost_equal(left, right)
+
+
+def test_aamp_match_early_abandon_unsupported():
+    Q = np.random.uniform(-1000, 1000, [8])
+    T = np.random.uniform(-1000, 1000, [64])
+
+    with pytest.raises(ValueError):
+        aamp_match(Q, T, max_distance=lambda D: 3.0, early_abandon=True)
+
+    with pytest.raises(ValueError):
+        aamp_match(
+            np.array([Q, Q]),
+            np.array([T, T]),
+            max_distance=3.0,
+            early_abandon=True,
+        )
+
+    left = aamp_match(Q, T, max_distance=lambda D: 3.0, early_abandon=False)
+    right = aamp_match(Q, T, max_distance=lambda D: 3.0, early_abandon=None)
+    npt.assert_almost_equal(left, right)
+
+
+def test_aamp_match_early_abandon_default(monkeypatch):
+    Q = np.random.uniform(-1000, 1000, [8])
+    T = np.random.uniform(-1000, 1000, [1024])
+
+    def fail(*args, **kwargs):  # pragma: no cover
+        raise AssertionError("Early abandoning must be opt-in")
+
+    monkeypatch.setattr(core, "_mass_absolute_early_abandon", fail)
+    left = aamp_match(Q, T, max_distance=0.3, early_abandon=False)
+    right = aamp_match(Q, T, max_distance=0.3)
+    npt.assert_almost_equal(left, right)
+
+
+def test_aamp_match_many():
+    m = 8
+    excl_zone = int(np.ceil(m / 4))
+    Q = np.random.uniform(-1000, 1000, [m])
+    Ts = [
+        np.random.uniform(-1000, 1000, [64]),
+        np.random.uniform(-1000, 1000, [m - 1]),
+        np.random.uniform(-1000, 1000, [m]),
+        np.random.uniform(-1000, 1000, [37]),
+    ]
+    Ts[3][[5, 20]] = np.nan
+    Ts[2] = Q.copy()
+    max_distance = 2000.0
+
+    for max_matches in [None, 5]:
+        for p in [1.0, 2.0, 3.0]:
+            ref = naive_aamp_match_many(
+                Q, Ts, excl_zone, max_distance, max_matches, p=p
+            )
+            comp = aamp_match_many(
+                Q, Ts, max_distance=max_distance, max_matches=max_matches, p=p
+            )
+
+            npt.assert_almost_equal(ref, comp)
+
+
+def test_aamp_match_many_max_distance_function():
+    Q = np.array([0.0, 1.0, 0.0])
+    Ts = [
+        np.array([0.0, 1.0, 0.0, -1.0, -1.0, 0.0, 1.0, 0.0, -0.5]),
+        np.array([0.1, 1.0, 2.0, 3.0, -1.0, 0.1, 1.0, 2.0, -0.5]),
+    ]
+    max_distance = 0.3
+
+    ref = aamp_match_many(Q, Ts, max_distance=max_distance)
+    comp = aamp_match_many(Q, Ts, max_distance=lambda D: max_distance)
+
+    npt.assert_almost_equal(ref, comp)
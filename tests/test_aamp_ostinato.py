@@ -2,6 +2,8 @@ import numpy as np
 import numpy.testing as npt
 from dask.distributed import Client, LocalCluster
 import stumpy
+from stumpy import core
+from stumpy.aamp_ostinato import _aamp_ostinato, _dask_aamp_ostinato
 import naive
 import pytest
 
@@ -79,3 +81,27 @@ def test_deterministic_ostinatoed(seed, dask_cluster):
             npt.assert_almost_equal(ref_radius, comp_radius)
             npt.assert_almost_equal(ref_Ts_idx, comp_Ts_idx)
             npt.assert_almost_equal(ref_subseq_idx, comp_subseq_idx)
+
+
+@pytest.mark.parametrize("seed", [79, 109, 112, 133, 151, 161, 251, 275, 309, 355])
+def test_dask_aamp_ostinato_many_series(seed, dask_cluster):
+    # More time series than workers so that each worker searches a range of series
+    with Client(dask_cluster) as dask_client:
+        m = 20
+        np.random.seed(seed)
+        Ts = [np.random.rand(n) for n in [64, 128, 256, 100, 80, 150, 64]]
+        Ts_subseq_isfinite = [None] * len(Ts)
+        for i, T in enumerate(Ts):
+            Ts[i], Ts_subseq_isfinite[i], _ = core.preprocess_non_normalized(T, m)
+
+        for p in [1.0, 2.0]:
+            ref_radius, ref_Ts_idx, ref_subseq_idx = _aamp_ostinato(
+                Ts, m, Ts_subseq_isfinite, p=p
+            )
+            comp_radius, comp_Ts_idx, comp_subseq_idx = _dask_aamp_ostinato(
+                dask_client, Ts, m, Ts_subseq_isfinite, p=p
+            )
+
+            npt.assert_almost_equal(ref_radius, comp_radius)
+            npt.assert_almost_equal(ref_Ts_idx, comp_Ts_idx)
+            npt.assert_almost_equal(ref_subseq_idx, comp_subseq_idx)
@@ -6,7 +6,6 @@ from dask.distributed import Client, LocalCluster
 import pytest
 import naive
 
-
 T = [
     np.array([584, -11, 23, 79, 1001, 0, -19], dtype=np.float64),
     np.random.uniform(-1000, 1000, [64]).astype(np.float64),
@@ -193,6 +192,73 @@ def test_aamp_stimp_100_percent(T):
     npt.assert_almost_equal(ref_pan, cmp_pan)
 
 
+@pytest.mark.parametrize("T", T)
+def test_aamp_stimp_pan_rows(T):
+    threshold = 0.2
+    pan = aamp_stimp(T, min_m=3, max_m=None, step=1, percentage=1.0)
+    for i in range(pan.M_.shape[0] // 2 + 1):
+        pan.update()
+
+    ref_pan = naive.transform_pan(
+        pan._PAN,
+        pan._M,
+        threshold,
+        pan._bfs_indices,
+        pan._n_processed,
+        T_min=np.min(T),
+        T_max=np.max(T),
+    )
+    for stop in range(1, pan.M_.shape[0] + 1):
+        for start in range(stop):
+            cmp_pan = pan.pan(threshold=threshold, start=start, stop=stop)
+            npt.assert_almost_equal(ref_pan[start:stop], cmp_pan)
+
+    for kwargs in [
+        {"normalize": False},
+        {"contrast": False},
+        {"binary": False},
+        {"contrast": False, "binary": False, "clip": False},
+    ]:
+        ref_pan = pan.pan(**kwargs)
+        cmp_pan = np.vstack(
+            [
+                pan.pan(start=start, stop=start + 2, **kwargs)
+                for start in range(0, pan.M_.shape[0], 2)
+            ]
+        )
+        npt.assert_almost_equal(ref_pan, cmp_pan)
+
+
+@pytest.mark.parametrize("T", T)
+def test_aamp_stimp_dtype_mmap_path(T, tmp_path):
+    ref_pan = aamp_stimp(T, min_m=3, max_m=None, step=1, percentage=1.0)
+
+    mmap_path = tmp_path / "pan.npy"
+    cmp_pan = aamp_stimp(
+        T, min_m=3, max_m=None, step=1, percentage=1.0, mmap_path=mmap_path
+    )
+    f4_pan = aamp_stimp(
+        T, min_m=3, max_m=None, step=1, percentage=1.0, dtype=np.float32
+    )
+
+    for i in range(3):
+        ref_pan.update()
+        cmp_pan.update()
+        f4_pan.update()
+
+    assert f4_pan._PAN.dtype == np.float32
+    npt.assert_almost_equal(ref_pan._PAN, np.load(mmap_path))
+    npt.assert_almost_equal(ref_pan._PAN, cmp_pan._PAN)
+    npt.assert_almost_equal(ref_pan._PAN, f4_pan._PAN, decimal=3)
+
+    npt.assert_almost_equal(ref_pan.PAN_, cmp_pan.PAN_)
+    npt.assert_almost_equal(
+        ref_pan.pan(binary=False, contrast=False),
+        f4_pan.pan(binary=False, contrast=False),
+        decimal=5,
+    )
+
+
 @pytest.mark.filterwarnings("ignore:numpy.dtype size changed")
 @pytest.mark.filterwarnings("ignore:numpy.ufunc size changed")
 @pytest.mark.filterwarnings("ignore:numpy.ndarray size changed")
@@ -246,3 +312,64 @@ def test_aamp_stimped(T, dask_cluster):
         naive.replace_inf(cmp_pan)
 
         npt.assert_almost_equal(ref_pan, cmp_pan)
+
+
+@pytest.mark.parametrize("T", T)
+def test_aamp_stimp_update_n(T):
+    ref_pan = aamp_stimp(T, min_m=3, max_m=None, step=1, percentage=1.0)
+    cmp_pan = aamp_stimp(T, min_m=3, max_m=None, step=1, percentage=1.0)
+
+    for i in range(3):
+        ref_pan.update()
+    cmp_pan.update(n=3)
+
+    npt.assert_equal(ref_pan._n_processed, cmp_pan._n_processed)
+    npt.assert_almost_equal(ref_pan._PAN, cmp_pan._PAN)
+
+    # Process the remaining window sizes and ensure that `n` is clipped
+    for i in range(ref_pan.M_.shape[0]):
+        ref_pan.update()
+    cmp_pan.update(n=ref_pan.M_.shape[0])
+
+    npt.assert_equal(ref_pan._n_processed, cmp_pan._n_processed)
+    npt.assert_almost_equal(ref_pan._PAN, cmp_pan._PAN)
+    npt.assert_almost_equal(ref_pan.PAN_, cmp_pan.PAN_)
+
+
+def test_aamp_stimp_update_workers():
+    # Spawned processes must recompile, so this is only checked once
+    T = np.random.uniform(-1000, 1000, [64]).astype(np.float64)
+    ref_pan = aamp_stimp(T, min_m=3, max_m=None, step=1, percentage=1.0)
+
+    for i in range(6):
+        ref_pan.update()
+    with aamp_stimp(T, min_m=3, max_m=None, step=1, percentage=1.0) as cmp_pan:
+        cmp_pan.update(n=4, workers=2)
+        executor = cmp_pan._executor
+        # The process pool is reused by later updates
+        cmp_pan.update(n=2, workers=2)
+        assert cmp_pan._executor is executor
+    # The process pool is shut down when the context is exited
+    assert cmp_pan._executor is None
+    assert executor._shutdown_thread
+
+    npt.assert_equal(ref_pan._n_processed, cmp_pan._n_processed)
+    npt.assert_almost_equal(ref_pan._PAN, cmp_pan._PAN)
+
+
+@pytest.mark.filterwarnings("ignore:numpy.dtype size changed")
+@pytest.mark.filterwarnings("ignore:numpy.ufunc size changed")
+@pytest.mark.filterwarnings("ignore:numpy.ndarray size changed")
+@pytest.mark.filterwarnings("ignore:\\s+Port 8787 is already in use:UserWarning")
+@pytest.mark.parametrize("T", T)
+def test_aamp_stimped_update_n(T, dask_cluster):
+    with Client(dask_cluster) as dask_client:
+        ref_pan = aamp_stimp(T, min_m=3, max_m=None, step=1, percentage=1.0)
+        cmp_pan = aamp_stimped(dask_client, T, min_m=3, max_m=None, step=1)
+
+        for i in range(3):
+            ref_pan.update()
+        cmp_pan.update(n=3)
+
+        npt.assert_equal(ref_pan._n_processed, cmp_pan._n_processed)
+        npt.assert_almost_equal(ref_pan._PAN, cmp_pan._PAN)
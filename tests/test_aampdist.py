@@ -4,6 +4,7 @@ from stumpy import aampdist, aampdisted
 from stumpy.aampdist import _aampdist_vect
 from dask.distributed import Client, LocalCluster
 import pytest
+from unittest.mock import patch
 import naive
 
 
@@ -59,6 +60,21 @@ def test_aampdist_vect_k(T_A, T_B, k):
     npt.assert_almost_equal(ref_aampdist_vect, comp_aampdist_vect)
 
 
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_aampdist_vect_memory_budget(T_A, T_B):
+    m = 3
+    for p in [1.0, 2.0, 3.0]:
+        ref_aampdist_vect = naive.aampdist_vect(T_A, T_B, m, p=p)
+
+        # Force the distance matrix to be processed in many small blocks of columns
+        j = T_A.shape[0] - m + 1
+        for budget in [8 * j * (j + 1), 8 * j * (T_A.shape[0] + 1)]:
+            with patch("stumpy.config.STUMPY_MPDIST_MEMORY_BUDGET", budget):
+                comp_aampdist_vect = _aampdist_vect(T_A, T_B, m, p=p)
+
+            npt.assert_almost_equal(ref_aampdist_vect, comp_aampdist_vect)
+
+
 @pytest.mark.parametrize("T_A, T_B", test_data)
 def test_aampdist(T_A, T_B):
     m = 3
@@ -1145,3 +1145,64 @@ def test_aampi_self_join_egress_KNN():
                 npt.assert_almost_equal(ref_I, comp_I)
                 npt.assert_almost_equal(ref_left_P, comp_left_P)
                 npt.assert_almost_equal(ref_left_I, comp_left_I)
+
+
+def test_aampi_self_join_egress_buffer_wraparound():
+    m = 3
+    n = 12
+    T_full = np.random.rand(n + 5 * n)
+
+    ref_mp = naive.aampi_egress(T_full[:n], m, k=2)
+    stream = aampi(T_full[:n], m, egress=True, k=2)
+
+    # Stream enough data points to wrap around the egress buffers multiple times
+    for i in range(n, T_full.shape[0]):
+        t = T_full[i]
+        ref_mp.update(t)
+        stream.update(t)
+
+        comp_P = stream.P_.copy()
+        ref_P = ref_mp.P_.copy()
+
+        naive.replace_inf(ref_P)
+        naive.replace_inf(comp_P)
+
+        npt.assert_almost_equal(ref_P, comp_P)
+        npt.assert_almost_equal(ref_mp.I_, stream.I_)
+        npt.assert_almost_equal(ref_mp.left_I_, stream.left_I_)
+        npt.assert_almost_equal(T_full[i - n + 1 : i + 1], stream.T_)
+
+
+@pytest.mark.parametrize("egress", [True, False])
+def test_aampi_self_join_update_batch(egress):
+    m = 3
+    for k in range(1, 3):
+        T = np.random.rand(30)
+        t = np.random.rand(40)
+        t[[3, 17]] = np.nan
+        t[25] = np.inf
+
+        ref_stream = aampi(T, m, egress=egress, k=k)
+        for i in range(t.shape[0]):
+            ref_stream.update(t[i])
+
+        comp_stream = aampi(T, m, egress=egress, k=k)
+        comp_stream.update(t[:5])
+        comp_stream.update(t[5:6])
+        comp_stream.update(t[6:])
+
+        ref_P = ref_stream.P_.copy()
+        ref_left_P = ref_stream.left_P_.copy()
+        comp_P = comp_stream.P_.copy()
+        comp_left_P = comp_stream.left_P_.copy()
+
+        naive.replace_inf(ref_P)
+        naive.replace_inf(ref_left_P)
+        naive.replace_inf(comp_P)
+        naive.replace_inf(comp_left_P)
+
+        npt.assert_almost_equal(ref_P, comp_P)
+        npt.assert_almost_equal(ref_stream.I_, comp_stream.I_)
+        npt.assert_almost_equal(ref_left_P, comp_left_P)
+        npt.assert_almost_equal(ref_stream.left_I_, comp_stream.left_I_)
+        npt.assert_almost_equal(ref_stream.T_, comp_stream.T_)
@@ -1,6 +1,8 @@
 import numpy as np
 import numpy.testing as npt
+import stumpy
 from stumpy import atsc, allc
+import naive
 import pytest
 
 test_data = [
@@ -38,3 +40,36 @@ def test_allc(Value, IR, IL):
 
     npt.assert_equal(S_ref, S_comp)
     npt.assert_equal(C_ref, C_comp)
+
+
+@pytest.mark.parametrize("Value, IR, IL", test_data)
+def test_allc_flat(Value, IR, IL):
+    S_ref, C_ref = allc(IL, IR)
+    (starts, members), C_comp = allc(IL, IR, flat=True)
+    S_comp = [members[starts[i] : starts[i + 1]] for i in range(len(starts) - 1)]
+
+    npt.assert_equal(S_ref, S_comp)
+    npt.assert_equal(C_ref, C_comp)
+    npt.assert_equal(np.sort(members), np.arange(IL.shape[0]))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3, 4])
+def test_random_allc(seed):
+    np.random.seed(seed)
+    m = 5
+    T = np.random.rand(500)
+    mp = stumpy.stump(T, m)
+    IL = mp[:, 2].astype(np.int64)
+    IR = mp[:, 3].astype(np.int64)
+
+    S_ref, C_ref = naive.allc(IL, IR)
+    S_comp, C_comp = allc(IL, IR)
+
+    S_ref = sorted(S_ref, key=lambda x: (len(x), list(x)))
+    S_comp = sorted(S_comp, key=lambda x: (len(x), list(x)))
+
+    npt.assert_equal(S_ref, S_comp)
+    npt.assert_equal(C_ref, C_comp)
+
+    for j in [0, C_ref[0], IL.shape[0] - 1]:
+        npt.assert_equal(naive.atsc(IL, IR, j), atsc(IL, IR, j))
@@ -8,6 +8,7 @@ import pytest
 from unittest.mock import patch
 import os
 import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import naive
 
@@ -191,6 +192,23 @@ def test_sliding_dot_product(Q, T):
     npt.assert_almost_equal(ref_mp, comp_mp)
 
 
+@pytest.mark.parametrize("Q, T", test_data)
+def test_sliding_dot_product_from_spectrum(Q, T):
+    m = Q.shape[0]
+    n = T.shape[0]
+    T_fft, nfft = core._rfft_spectrum(T, m)
+
+    ref_mp = naive_rolling_window_dot_product(Q, T)
+    comp_mp = core._sliding_dot_product_from_spectrum(Q, T_fft, nfft, n)
+    npt.assert_almost_equal(ref_mp, comp_mp)
+
+    # Multiple queries share the same spectrum
+    Qs = np.array([Q, Q[::-1]])
+    ref_mp = np.array([naive_rolling_window_dot_product(q, T) for q in Qs])
+    comp_mp = core._sliding_dot_product_from_spectrum(Qs, T_fft, nfft, n)
+    npt.assert_almost_equal(ref_mp, comp_mp)
+
+
 def test_welford_nanvar():
     T = np.random.rand(64)
     m = 10
@@ -872,6 +890,59 @@ def test_preprocess_diagonal():
     npt.assert_almost_equal(ref_M_m_1, comp_M_m_1)
 
 
+def test_preprocess_diagonal_from_cumsum():
+    T = np.random.uniform(-1000, 1000, [64])
+    T[1] = np.nan
+    T[8] = np.inf
+    T[20:30] = 5.0
+    T_cumsums = core._preprocess_cumsum(T)
+    for m in range(3, 12):
+        ref = core.preprocess_diagonal(T, m)
+        comp = core._preprocess_diagonal_from_cumsum(T_cumsums[0], m, *T_cumsums[1:])
+
+        npt.assert_almost_equal(ref[0], comp[0])
+        npt.assert_almost_equal(ref[1], comp[1])
+        npt.assert_almost_equal(ref[2], comp[2])
+        npt.assert_almost_equal(ref[3], comp[3])
+        npt.assert_equal(ref[4], comp[4])
+        npt.assert_equal(ref[5], comp[5])
+
+        ref = core.preprocess_non_normalized(T, m)
+        comp = core._preprocess_non_normalized_from_cumsum(
+            T_cumsums[0], m, *T_cumsums[1:]
+        )
+
+        npt.assert_almost_equal(ref[0], comp[0])
+        npt.assert_equal(ref[1], comp[1])
+        npt.assert_equal(ref[2], comp[2])
+
+
+def test_compute_mean_std_from_cumsum_ill_conditioned():
+    # The subsequence variances are tiny relative to the centered sum of squares
+    T = np.cumsum(np.random.rand(1000)) * 1000.0 + 1e6
+    T_cumsums = core._preprocess_cumsum(T)
+    for m in [3, 10, 50]:
+        ref_M, ref_Σ = naive.compute_mean_std(T, m)
+        comp_M, comp_Σ = core._compute_mean_std_from_cumsum(T_cumsums[0], m)
+
+        npt.assert_allclose(ref_M, comp_M, rtol=1e-12)
+        npt.assert_allclose(ref_Σ, comp_Σ, rtol=1e-7)
+
+
+def test_compute_mean_std_from_cumsum_long_trend():
+    # The level of `T` drifts far more than the spread of any subsequence
+    n = 200_000
+    T = np.arange(n) * 1e-3 + np.random.rand(n) * 1e-2 + 1e5
+    T[1000:1100] = T[1000]  # constant subsequences
+    T_cumsums = core._preprocess_cumsum(T)
+    for m in [3, 50, 2000]:
+        ref_M, ref_Σ = core.compute_mean_std(T, m)
+        comp_M, comp_Σ = core._compute_mean_std_from_cumsum(T_cumsums[0], m)
+
+        npt.assert_allclose(ref_M, comp_M, rtol=1e-14)
+        npt.assert_allclose(ref_Σ, comp_Σ, rtol=1e-10, atol=1e-12)
+
+
 def test_replace_distance():
     right = np.random.rand(30).reshape(5, 6)
     left = right.copy()
@@ -1124,6 +1195,37 @@ def test_select_P_ABBA_val_inf():
     npt.assert_almost_equal(ref, comp)
 
 
+def test_sorted_replace():
+    for _ in range(100):
+        a = np.random.rand(10)
+        a[np.random.rand(10) < 0.2] = np.inf
+        a[np.random.rand(10) < 0.2] = np.nan
+        old = a[np.random.randint(10)]
+        new = np.random.choice([np.random.rand(), np.inf, np.nan, a[0]])
+
+        ref = a.copy()
+        ref[np.flatnonzero((ref == old) | (np.isnan(ref) & np.isnan(old)))[0]] = new
+        ref.sort()
+
+        comp = np.sort(a)
+        core._sorted_replace(comp, old, new)
+
+        npt.assert_almost_equal(ref, comp)
+
+
+def test_select_partial_P_ABBA_value():
+    for k in range(20):
+        P_AB = np.random.rand(10)
+        P_BA = np.random.rand(10)
+        P_AB[np.random.rand(10) < 0.3] = np.inf
+        P_BA[np.random.rand(10) < 0.3] = np.nan
+
+        ref = core._select_P_ABBA_value(np.concatenate([P_AB, P_BA]), k)
+        comp = core._select_partial_P_ABBA_value(P_AB, np.sort(P_BA), k)
+
+        npt.assert_almost_equal(ref, comp)
+
+
 def test_merge_topk_PI_without_overlap():
     # This is to test function `core._merge_topk_PI(PA, PB, IA, IB)` when there
     # is no overlap between row IA[i] and row IB[i].
@@ -1406,6 +1508,34 @@ def test_shift_insert_at_index():
             npt.assert_almost_equal(ref, comp)
 
 
+def test_update_incremental_PI():
+    n = 50
+    for k in range(1, 4):
+        for I_offset in [0, 7]:
+            D = np.random.rand(n)
+            D[-1] = np.inf
+            P = np.sort(np.random.rand(n, k), axis=1)
+            I = np.random.randint(0, n, size=(n, k))
+
+            ref_P = P.copy()
+            ref_I = I.copy()
+            for i in range(n - 1):
+                if D[i] < ref_P[i, -1]:
+                    idx = np.searchsorted(ref_P[i], D[i], side="right")
+                    ref_P[i] = np.insert(ref_P[i], idx, D[i])[:-1]
+                    ref_I[i] = np.insert(ref_I[i], idx, n - 1 + I_offset)[:-1]
+            ref_I[-1] = np.argsort(D, kind="mergesort")[:k]
+            ref_P[-1] = D[ref_I[-1]]
+            ref_I[-1] += I_offset
+
+            comp_P = P.copy()
+            comp_I = I.copy()
+            core._update_incremental_PI(D, comp_P, comp_I, I_offset)
+
+            npt.assert_almost_equal(ref_P, comp_P)
+            npt.assert_almost_equal(ref_I, comp_I)
+
+
 def test_check_P():
     with pytest.raises(ValueError):
         core._check_P(np.random.rand(10).reshape(2, 5))
@@ -1417,9 +1547,15 @@ def test_find_matches_all():
     D = np.random.rand(64)
     for excl_zone in range(3):
         ref = naive.find_matches(D, excl_zone, max_distance, max_matches=None)
-        comp = core._find_matches(D, excl_zone, max_distance, max_matches=None)
+        comp_distances, comp_indices = core._find_matches(
+            D, excl_zone, max_distance, max_matches=None
+        )
 
-        npt.assert_almost_equal(ref, comp)
+        npt.assert_almost_equal(
+            ref, core._matches_to_array(comp_distances, comp_indices)
+        )
+        assert comp_distances.dtype == np.float64
+        assert comp_indices.dtype == np.int64
 
 
 def test_find_matches_maxmatch():
@@ -1428,9 +1564,48 @@ def test_find_matches_maxmatch():
     for excl_zone in range(3):
         max_matches = np.random.randint(0, 100)
         ref = naive.find_matches(D, excl_zone, max_distance, max_matches)
-        comp = core._find_matches(D, excl_zone, max_distance, max_matches)
+        comp_distances, comp_indices = core._find_matches(
+            D, excl_zone, max_distance, max_matches
+        )
 
-        npt.assert_almost_equal(ref, comp)
+        npt.assert_almost_equal(
+            ref, core._matches_to_array(comp_distances, comp_indices)
+        )
+        assert comp_distances.dtype == np.float64
+        assert comp_indices.dtype == np.int64
+
+
+def test_find_matches_max_distance():
+    D = np.random.rand(64)
+    max_distance = 0.5
+    for excl_zone in range(3):
+        ref = naive.find_matches(D, excl_zone, max_distance)
+        comp_distances, comp_indices = core._find_matches(D, excl_zone, max_distance)
+
+        npt.assert_almost_equal(
+            ref, core._matches_to_array(comp_distances, comp_indices)
+        )
+        assert comp_distances.dtype == np.float64
+        assert comp_indices.dtype == np.int64
+
+
+def test_select_matches():
+    D = np.random.rand(64)
+    D[[3, 17]] = np.inf
+    max_distance = 0.5
+    atol = 1e-8
+    for excl_zone in range(3):
+        ref = naive.find_matches(D, excl_zone, max_distance + atol)
+        ref_distances = ref[:, 0].astype(np.float64)
+        ref_indices = ref[:, 1].astype(np.int64)
+        comp_distances, comp_indices = core._select_matches(
+            D, excl_zone, max_distance, D.shape[0], -1, atol
+        )
+
+        assert comp_distances.dtype == np.float64
+        assert comp_indices.dtype == np.int64
+        npt.assert_almost_equal(ref_distances, comp_distances)
+        npt.assert_almost_equal(ref_indices, comp_indices)
 
 
 @pytest.mark.filterwarnings("ignore", category=NumbaPerformanceWarning)
@@ -1485,3 +1660,82 @@ def test_gpu_searchsorted():
 def test_client_to_func():
     with pytest.raises(NotImplementedError):
         core._client_to_func(core)
+
+
+def test_shared_bsf_radius():
+    cluster_radius = [np.inf]
+    n_shares = [0]
+
+    def share_bsf_radius(name, radius):
+        n_shares[0] += 1
+        cluster_radius[0] = min(cluster_radius[0], radius)
+        return cluster_radius[0]
+
+    with patch("stumpy.core._share_bsf_radius", share_bsf_radius), patch(
+        "stumpy.config.STUMPY_OSTINATO_SHARE_INTERVAL", 10
+    ):
+        shared_bsf_radius = core._shared_bsf_radius("bsf_radius")
+        # The cluster-wide radius is read by the first call
+        assert shared_bsf_radius(np.inf) == np.inf
+        assert n_shares[0] == 1
+
+        # ... and then only once every 10 calls
+        cluster_radius[0] = 5.0
+        for _ in range(9):
+            assert shared_bsf_radius(np.inf) == np.inf
+        assert n_shares[0] == 1
+        assert shared_bsf_radius(np.inf) == 5.0
+        assert n_shares[0] == 2
+
+        # ... or whenever the offered radius improves
+        assert shared_bsf_radius(3.0) == 3.0
+        assert n_shares[0] == 3
+        assert shared_bsf_radius(3.0) == 3.0
+        assert n_shares[0] == 3
+
+
+def test_get_pool_executor():
+    assert core._get_pool_executor(1, workers=4) is None
+    assert core._get_pool_executor(4, workers=1) is None
+    with core._get_pool_executor(4, workers=2) as executor:
+        assert isinstance(executor, ProcessPoolExecutor)
+        assert executor._max_workers == 2
+
+    class Client:
+        def ncores(self):
+            return {"worker-0": 2, "worker-1": 2}
+
+    # The number of threads is capped at the number of cluster workers
+    with core._get_pool_executor(3, client=Client()) as executor:
+        assert isinstance(executor, ThreadPoolExecutor)
+        assert executor._max_workers == 2
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_get_pan_percentiles(dtype):
+    n_rows, n_cols = 7, 13
+    pan = np.random.choice([0.25, 0.5, 1.0, 2.0, np.inf], size=(n_rows, n_cols))
+    pan = pan.astype(dtype)
+    bfs_indices = np.random.permutation(n_rows)
+    n_processed = 5
+    norm = np.random.uniform(0.5, 2.0, n_rows)
+
+    for row_norm in [None, norm]:
+        idx = bfs_indices[:n_processed]
+        processed_pan = np.array(pan[idx])
+        processed_pan[processed_pan == np.inf] = np.nan
+        if row_norm is not None:
+            processed_pan[:] = np.minimum(
+                1.0, processed_pan * row_norm[:n_processed, np.newaxis]
+            )
+        l = processed_pan.size
+        ranks = np.empty(l, dtype=np.int64)
+        ranks[processed_pan.argsort(kind="mergesort", axis=None)] = np.arange(l)
+        ref = np.linspace(0, 1, l)[ranks].reshape(processed_pan.shape)
+
+        pos = np.array([3, 0, 4])
+        for max_values in [1, n_cols, 2 * n_cols + 1, None]:
+            comp = core._get_pan_percentiles(
+                pan, pos, bfs_indices, n_processed, row_norm, max_values=max_values
+            )
+            npt.assert_almost_equal(ref[pos], comp)
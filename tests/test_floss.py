@@ -92,6 +92,26 @@ def test_nnmark(I):
     npt.assert_almost_equal(ref, comp)
 
 
+@pytest.mark.parametrize("I", test_data)
+def test_iac(I):
+    width = I.shape[0]
+    ref = naive_iac(width)
+    comp = _iac(width)
+    npt.assert_almost_equal(ref, comp)
+
+
+def test_iac_1d_memoized():
+    width = 50
+    ref = _iac(width, bidirectional=False, n_iter=10, n_samples=100)
+    comp = _iac(width, bidirectional=False, n_iter=10, n_samples=100)
+    npt.assert_almost_equal(ref, comp)
+
+    # Modifying the returned IAC must not affect subsequent calls
+    comp[:] = 0.0
+    comp = _iac(width, bidirectional=False, n_iter=10, n_samples=100)
+    npt.assert_almost_equal(ref, comp)
+
+
 @pytest.mark.parametrize("I", test_data)
 def test_cac(I):
     L = 5
@@ -138,10 +158,10 @@ def test_fluss(I):
     npt.assert_almost_equal(ref_rea, comp_rea)
 
 
-def test_floss():
-    data = np.random.uniform(-1000, 1000, [64])
+@pytest.mark.parametrize("n_data, n", [(64, 30), (128, 20)])
+def test_floss(n_data, n):
+    data = np.random.uniform(-1000, 1000, [n_data])
     m = 5
-    n = 30
     old_data = data[:n]
 
     mp = naive_right_mp(old_data, m)
@@ -197,12 +217,62 @@ def test_floss():
         npt.assert_almost_equal(ref_T, comp_T)
 
 
-def test_aamp_floss():
+def test_floss_cac_1d_after_multiple_updates():
     data = np.random.uniform(-1000, 1000, [64])
     m = 5
     n = 30
     old_data = data[:n]
 
+    mp = naive_right_mp(old_data, m)
+    comp_mp = stump(old_data, m)
+    k = mp.shape[0]
+
+    rolling_Ts = core.rolling_window(data[1:], n)
+    L = 5
+    excl_factor = 1
+    custom_iac = _iac(k, bidirectional=False)
+    stream = floss(comp_mp, old_data, m, L, excl_factor, custom_iac=custom_iac)
+    last_idx = n - m + 1
+    excl_zone = int(np.ceil(m / 4))
+    zone_start = max(0, k - excl_zone)
+    for i, ref_T in enumerate(rolling_Ts):
+        mp[:, 1] = -1
+        mp[:, 2] = -1
+        mp[:] = np.roll(mp, -1, axis=0)
+        mp[-1, 0] = np.inf
+        mp[-1, 3] = last_idx + i
+
+        D = naive.distance_profile(ref_T[-m:], ref_T, m)
+        D[zone_start:] = np.inf
+
+        update_idx = np.argwhere(D < mp[:, 0]).flatten()
+        mp[update_idx, 0] = D[update_idx]
+        mp[update_idx, 3] = last_idx + i
+
+        ref_cac_1d = _cac(
+            mp[:, 3] - i - 1,
+            L,
+            bidirectional=False,
+            excl_factor=excl_factor,
+            custom_iac=custom_iac,
+        )
+
+        stream.update(ref_T[-1])
+        # The arc curve is only requested after some of the updates
+        if i % 7 == 0:
+            comp_cac_1d = stream.cac_1d_
+            npt.assert_almost_equal(ref_cac_1d, comp_cac_1d)
+
+    comp_cac_1d = stream.cac_1d_
+    npt.assert_almost_equal(ref_cac_1d, comp_cac_1d)
+
+
+@pytest.mark.parametrize("n_data, n", [(64, 30), (128, 20)])
+def test_aamp_floss(n_data, n):
+    data = np.random.uniform(-1000, 1000, [n_data])
+    m = 5
+    old_data = data[:n]
+
     mp = naive_right_mp(old_data, m, normalize=False)
     comp_mp = aamp(old_data, m)
     k = mp.shape[0]
@@ -1,8 +1,10 @@
 import numpy as np
 import numpy.testing as npt
 import pytest
+from unittest.mock import patch
 
-from stumpy import core, motifs, match
+from stumpy import core, motifs, match, match_many
+from stumpy.motifs import _PREPROCESSED_SERIES_CACHE
 
 import naive
 
@@ -14,6 +16,21 @@ def naive_match(Q, T, excl_zone, max_distance, max_matches=None):
     return naive.find_matches(D, excl_zone, max_distance, max_matches)
 
 
+def naive_match_many(Q, Ts, excl_zone, max_distance, max_matches=None):
+    m = Q.shape[0]
+    result = []
+    for i, T in enumerate(Ts):
+        if T.shape[0] < m:
+            continue
+        D = naive.distance_profile(Q, T, m)
+        for dist, idx in naive.find_matches(D, excl_zone, max_distance):
+            result.append([dist, i, idx])
+
+    result.sort(key=lambda x: x[0])
+
+    return np.array(result[:max_matches], dtype=object)
+
+
 test_data = [
     (
         np.array([0.0, 1.0, 0.0]),
@@ -247,3 +264,117 @@ def test_match_mean_stddev(Q, T):
     )
 
     npt.assert_almost_equal(left, right)
+
+
+@pytest.mark.parametrize("Q, T", test_data)
+def test_match_early_abandon(Q, T):
+    m = Q.shape[0]
+    excl_zone = int(np.ceil(m / 4))
+    T = T.copy()
+    T[1] = np.nan
+    T[-m:] = 1.0  # constant subsequences
+
+    for max_distance in [0.3, 3.0]:
+        left = naive_match(Q, T, excl_zone, max_distance=max_distance)
+
+        for early_abandon in [True, False, None]:
+            right = match(Q, T, max_distance=max_distance, early_abandon=early_abandon)
+
+            npt.assert_almost_equal(left, right)
+
+
+def test_match_early_abandon_unsupported():
+    Q = np.random.uniform(-1000, 1000, [8])
+    T = np.random.uniform(-1000, 1000, [64])
+
+    with pytest.raises(ValueError):
+        match(Q, T, max_distance=lambda D: 3.0, early_abandon=True)
+
+    with pytest.raises(ValueError):
+        match(
+            np.array([Q, Q]),
+            np.array([T, T]),
+            max_distance=3.0,
+            early_abandon=True,
+        )
+
+    left = match(Q, T, max_distance=lambda D: 3.0, early_abandon=False)
+    right = match(Q, T, max_distance=lambda D: 3.0, early_abandon=None)
+    npt.assert_almost_equal(left, right)
+
+
+def test_match_early_abandon_default(monkeypatch):
+    Q = np.random.uniform(-1000, 1000, [8])
+    T = np.random.uniform(-1000, 1000, [1024])
+
+    def fail(*args, **kwargs):  # pragma: no cover
+        raise AssertionError("Early abandoning must be opt-in")
+
+    monkeypatch.setattr(core, "_mass_early_abandon", fail)
+    left = match(Q, T, max_distance=0.3, early_abandon=False)
+    right = match(Q, T, max_distance=0.3)
+    npt.assert_almost_equal(left, right)
+
+
+def test_match_many():
+    m = 8
+    excl_zone = int(np.ceil(m / 4))
+    Q = np.random.uniform(-1000, 1000, [m])
+    Ts = [
+        np.random.uniform(-1000, 1000, [64]),
+        np.random.uniform(-1000, 1000, [m - 1]),
+        np.random.uniform(-1000, 1000, [m]),
+        np.random.uniform(-1000, 1000, [37]),
+    ]
+    Ts[3][[5, 20]] = np.nan
+    Ts[2] = Q.copy()
+    max_distance = 3.0
+
+    for max_matches in [None, 5]:
+        ref = naive_match_many(Q, Ts, excl_zone, max_distance, max_matches)
+        comp = match_many(Q, Ts, max_distance=max_distance, max_matches=max_matches)
+
+        npt.assert_almost_equal(ref, comp)
+
+
+def test_match_many_cache():
+    m = 8
+    excl_zone = int(np.ceil(m / 4))
+    Ts = [
+        np.random.uniform(-1000, 1000, [64]),
+        np.random.uniform(-1000, 1000, [37]),
+    ]
+    max_distance = 3.0
+
+    with patch.dict(_PREPROCESSED_SERIES_CACHE, clear=True):
+        with patch("stumpy.config.STUMPY_MATCH_MANY_CACHE_SIZE", 1):
+            for _ in range(3):
+                Q = np.random.uniform(-1000, 1000, [m])
+                ref = naive_match_many(Q, Ts, excl_zone, max_distance)
+                comp = match_many(Q, Ts, max_distance=max_distance)
+
+                npt.assert_almost_equal(ref, comp)
+                # The preprocessed time series are reused across queries
+                assert len(_PREPROCESSED_SERIES_CACHE) == 1
+
+            # A different (or no longer existing) collection replaces the entry
+            Ts = [T.copy() for T in Ts]
+            ref = naive_match_many(Q, Ts, excl_zone, max_distance)
+            comp = match_many(Q, Ts, max_distance=max_distance)
+
+            npt.assert_almost_equal(ref, comp)
+            assert len(_PREPROCESSED_SERIES_CACHE) == 1
+
+
+def test_match_many_max_distance_function():
+    Q = np.array([0.0, 1.0, 0.0])
+    Ts = [
+        np.array([0.0, 1.0, 0.0, -1.0, -1.0, 0.0, 1.0, 0.0, -0.5]),
+        np.array([0.1, 1.0, 2.0, 3.0, -1.0, 0.1, 1.0, 2.0, -0.5]),
+    ]
+    max_distance = 0.3
+
+    ref = match_many(Q, Ts, max_distance=max_distance)
+    comp = match_many(Q, Ts, max_distance=lambda D: max_distance)
+
+    npt.assert_almost_equal(ref, comp)
@@ -2,7 +2,7 @@ from functools import partial
 import math
 import numpy as np
 import numpy.testing as npt
-from stumpy import mpdist, mpdisted
+from stumpy import core, mpdist, mpdisted
 from stumpy.mpdist import (
     _mpdist,
     _compute_P_ABBA,
@@ -10,6 +10,7 @@ from stumpy.mpdist import (
 )
 from dask.distributed import Client, LocalCluster
 import pytest
+from unittest.mock import patch
 import naive
 
 
@@ -100,6 +101,82 @@ def test_mpdist_vect_k(T_A, T_B, k):
     npt.assert_almost_equal(ref_mpdist_vect, comp_mpdist_vect)
 
 
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_mpdist_vect_memory_budget(T_A, T_B):
+    m = 3
+    μ_Q, σ_Q = naive.compute_mean_std(T_A, m)
+    M_T, Σ_T = naive.compute_mean_std(T_B, m)
+    ref_mpdist_vect = _mpdist_vect(T_A, T_B, m, μ_Q, σ_Q, M_T, Σ_T)
+
+    # Force the distance matrix to be processed in many small blocks of columns
+    j = T_A.shape[0] - m + 1
+    for budget in [8 * j * (j + 1), 8 * j * (T_A.shape[0] + 1)]:
+        with patch("stumpy.config.STUMPY_MPDIST_MEMORY_BUDGET", budget):
+            comp_mpdist_vect = _mpdist_vect(T_A, T_B, m, μ_Q, σ_Q, M_T, Σ_T)
+
+        npt.assert_almost_equal(ref_mpdist_vect, comp_mpdist_vect)
+
+
+def test_mpdist_vect_memory_budget_random():
+    m = 5
+    np.random.seed(0)
+    T_B = np.random.rand(200)
+    for n_A in [m, 10, 25]:
+        T_A = np.random.rand(n_A)
+        T_B[np.random.randint(200)] = np.nan
+        μ_Q, σ_Q = naive.compute_mean_std(T_A, m)
+        M_T, Σ_T = naive.compute_mean_std(T_B, m)
+        j = T_A.shape[0] - m + 1
+        for k in [None, 0, j]:
+            ref_mpdist_vect = naive.mpdist_vect(T_A, T_B, m, k=k)
+            # Blocks that are narrower than, equal to, and wider than `j` columns
+            for b in [1, 2, max(1, j - 1), j, 3 * j + 1]:
+                budget = 8 * j * (2 * b + j - 1)
+                with patch("stumpy.config.STUMPY_MPDIST_MEMORY_BUDGET", budget):
+                    comp_mpdist_vect = _mpdist_vect(
+                        T_A, T_B, m, μ_Q, σ_Q, M_T, Σ_T, k=k
+                    )
+
+                npt.assert_almost_equal(ref_mpdist_vect, comp_mpdist_vect)
+
+
+def test_mpdist_vect_memory_budget_too_small():
+    m = 3
+    T_A = np.random.rand(20)
+    T_B = np.random.rand(100)
+    μ_Q, σ_Q = naive.compute_mean_std(T_A, m)
+    M_T, Σ_T = naive.compute_mean_std(T_B, m)
+    j = T_A.shape[0] - m + 1
+    with patch("stumpy.config.STUMPY_MPDIST_MEMORY_BUDGET", 8 * j * (j + 1) - 1):
+        with pytest.raises(ValueError):
+            _mpdist_vect(T_A, T_B, m, μ_Q, σ_Q, M_T, Σ_T)
+
+
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_mpdist_vect_T_fft(T_A, T_B):
+    m = 3
+    ref_mpdist_vect = naive.mpdist_vect(T_A, T_B, m)
+    μ_Q, σ_Q = naive.compute_mean_std(T_A, m)
+    M_T, Σ_T = naive.compute_mean_std(T_B, m)
+    T_fft, nfft = core._rfft_spectrum(T_B, m)
+    comp_mpdist_vect = _mpdist_vect(
+        T_A, T_B, m, μ_Q, σ_Q, M_T, Σ_T, T_fft=T_fft, nfft=nfft
+    )
+
+    npt.assert_almost_equal(ref_mpdist_vect, comp_mpdist_vect)
+
+    # The distance matrix is processed in blocks of `b` columns
+    j = T_A.shape[0] - m + 1
+    for b in [1, 4]:
+        budget = 8 * j * (j - 1 + 2 * b)
+        with patch("stumpy.config.STUMPY_MPDIST_MEMORY_BUDGET", budget):
+            comp_mpdist_vect = _mpdist_vect(
+                T_A, T_B, m, μ_Q, σ_Q, M_T, Σ_T, T_fft=T_fft, nfft=nfft
+            )
+
+        npt.assert_almost_equal(ref_mpdist_vect, comp_mpdist_vect)
+
+
 @pytest.mark.parametrize("T_A, T_B", test_data)
 def test_mpdist(T_A, T_B):
     m = 3
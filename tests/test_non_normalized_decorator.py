@@ -131,6 +131,24 @@ def test_scrump_plus_plus_full(T, m):
         npt.assert_almost_equal(ref.P_, comp.P_)
 
 
+@pytest.mark.parametrize("T, m", test_data)
+def test_scrump_save_load(T, m, tmp_path):
+    if T.ndim > 1:
+        T = T.copy()
+        T = T[0]
+
+    ref = stumpy.scraamp(T, m, percentage=0.1)
+    ref.update()
+    ref.save(tmp_path / "scraamp.npz")
+    comp = stumpy.scrump.load(tmp_path / "scraamp.npz")
+    assert isinstance(comp, stumpy.scraamp)
+
+    for i in range(10):
+        ref.update()
+        comp.update()
+        npt.assert_almost_equal(ref.P_, comp.P_)
+
+
 @pytest.mark.filterwarnings("ignore:\\s+Port 8787 is already in use:UserWarning")
 @pytest.mark.parametrize("T, m", test_data)
 def test_stumped(T, m, dask_cluster):
@@ -330,6 +348,19 @@ def test_match(T, m):
     npt.assert_almost_equal(ref, comp)
 
 
+@pytest.mark.parametrize("T, m", test_data)
+def test_match_many(T, m):
+    if T.ndim > 1:
+        T = T.copy()
+        T = T[0]
+
+    Q = T[:m]
+    Ts = [T, T[::-1]]
+    ref = stumpy.aamp_match_many(Q, Ts)
+    comp = stumpy.match_many(Q, Ts, normalize=False)
+    npt.assert_almost_equal(ref, comp)
+
+
 @pytest.mark.parametrize("T, m", test_data)
 def test_mmotifs(T, m):
     mps, indices = stumpy.maamp(T, m)
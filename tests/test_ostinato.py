@@ -2,6 +2,8 @@ import numpy as np
 import numpy.testing as npt
 from dask.distributed import Client, LocalCluster
 import stumpy
+from stumpy import core
+from stumpy.ostinato import _dask_ostinato, _ostinato
 import naive
 import pytest
 
@@ -43,6 +45,30 @@ def test_deterministic_ostinato(seed):
     npt.assert_almost_equal(ref_subseq_idx, comp_subseq_idx)
 
 
+@pytest.mark.parametrize("seed", [79, 109, 112, 133, 151, 161, 251, 275, 309, 355])
+def test_ostinato_n_candidates(seed):
+    # The number of candidates that are evaluated at once must not affect the result
+    m = 20
+    np.random.seed(seed)
+    Ts = [np.random.rand(n) for n in [64, 128, 256, 100]]
+    M_Ts = [None] * len(Ts)
+    Σ_Ts = [None] * len(Ts)
+    for i, T in enumerate(Ts):
+        Ts[i], M_Ts[i], Σ_Ts[i] = core.preprocess(T, m)
+
+    ref_radius, ref_Ts_idx, ref_subseq_idx = _ostinato(
+        Ts, m, M_Ts, Σ_Ts, n_candidates=1
+    )
+    for n_candidates in [2, 3, 8, 1000]:
+        comp_radius, comp_Ts_idx, comp_subseq_idx = _ostinato(
+            Ts, m, M_Ts, Σ_Ts, n_candidates=n_candidates
+        )
+
+        npt.assert_almost_equal(ref_radius, comp_radius)
+        npt.assert_almost_equal(ref_Ts_idx, comp_Ts_idx)
+        npt.assert_almost_equal(ref_subseq_idx, comp_subseq_idx)
+
+
 @pytest.mark.parametrize(
     "seed", np.random.choice(np.arange(10000), size=25, replace=False)
 )
@@ -77,3 +103,25 @@ def test_deterministic_ostinatoed(seed, dask_cluster):
         npt.assert_almost_equal(ref_radius, comp_radius)
         npt.assert_almost_equal(ref_Ts_idx, comp_Ts_idx)
         npt.assert_almost_equal(ref_subseq_idx, comp_subseq_idx)
+
+
+@pytest.mark.parametrize("seed", [79, 109, 112, 133, 151, 161, 251, 275, 309, 355])
+def test_dask_ostinato_many_series(seed, dask_cluster):
+    # More time series than workers so that each worker searches a range of series
+    with Client(dask_cluster) as dask_client:
+        m = 20
+        np.random.seed(seed)
+        Ts = [np.random.rand(n) for n in [64, 128, 256, 100, 80, 150, 64]]
+        M_Ts = [None] * len(Ts)
+        Σ_Ts = [None] * len(Ts)
+        for i, T in enumerate(Ts):
+            Ts[i], M_Ts[i], Σ_Ts[i] = core.preprocess(T, m)
+
+        ref_radius, ref_Ts_idx, ref_subseq_idx = _ostinato(Ts, m, M_Ts, Σ_Ts)
+        comp_radius, comp_Ts_idx, comp_subseq_idx = _dask_ostinato(
+            dask_client, Ts, m, M_Ts, Σ_Ts
+        )
+
+        npt.assert_almost_equal(ref_radius, comp_radius)
+        npt.assert_almost_equal(ref_Ts_idx, comp_Ts_idx)
+        npt.assert_almost_equal(ref_subseq_idx, comp_subseq_idx)
@@ -1,11 +1,13 @@
+import time
+
 import numpy as np
 import numpy.testing as npt
-from stumpy import scraamp, aamp, config
+from unittest.mock import patch
+from stumpy import core, scraamp, aamp, config
 from stumpy.scraamp import prescraamp
 import pytest
 import naive
 
-
 test_data = [
     (
         np.array([9, 8100, -60, 7], dtype=np.float64),
@@ -921,3 +923,138 @@ def test_prescraamp_A_B_join_larger_window_m_5_k_5(T_A, T_B):
 
             npt.assert_almost_equal(ref_P, comp_P)
             npt.assert_almost_equal(ref_I, comp_I)
+
+
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_scraamp_time_budget(T_A, T_B):
+    m = 3
+    zone = int(np.ceil(m / 4))
+
+    ref_mp = naive.aamp(T_B, m, exclusion_zone=zone)
+    ref_P = ref_mp[:, 0]
+    ref_I = ref_mp[:, 1]
+    ref_left_I = ref_mp[:, 2]
+    ref_right_I = ref_mp[:, 3]
+
+    approx = scraamp(T_B, m, ignore_trivial=True, percentage=0.1, pre_scraamp=False)
+    approx.update(time_budget=0.0)
+    npt.assert_almost_equal(0.0, approx.coverage_)
+
+    # A regular update continues where the time budgeted updates left off
+    approx.update()
+    coverage = approx.coverage_
+    assert 0.0 < coverage <= 1.0
+
+    coverage = approx.run_until(time.time() + 3600.0)
+    npt.assert_almost_equal(1.0, coverage)
+    comp_P = approx.P_
+    comp_I = approx.I_
+    comp_left_I = approx.left_I_
+    comp_right_I = approx.right_I_
+
+    naive.replace_inf(ref_P)
+    naive.replace_inf(comp_P)
+
+    npt.assert_almost_equal(ref_P, comp_P)
+    npt.assert_almost_equal(ref_I, comp_I)
+    npt.assert_almost_equal(ref_left_I, comp_left_I)
+    npt.assert_almost_equal(ref_right_I, comp_right_I)
+
+
+def test_scraamp_time_budget_probe(monkeypatch):
+    T = np.random.uniform(-1000, 1000, [256])
+    m = 3
+    probe_ndist = 100
+    monkeypatch.setattr("stumpy.config.STUMPY_TIME_BUDGET_PROBE_NDIST", probe_ndist)
+
+    approx = scraamp(T, m, percentage=0.1, pre_scraamp=False)
+    chunks = []
+    compute_diags = approx._compute_diags
+
+    def _compute_diags(start_idx, stop_idx):
+        chunks.append((start_idx, stop_idx))
+        compute_diags(start_idx, stop_idx)
+
+    monkeypatch.setattr(approx, "_compute_diags", _compute_diags)
+    coverage = approx.run_until(time.time() + 3600.0)
+    npt.assert_almost_equal(1.0, coverage)
+
+    # The throughput is probed with (at most) `probe_ndist` distances or, if it is
+    # longer, a single diagonal
+    start_idx, stop_idx = chunks[0]
+    ndist = approx._ndist_cumsum[stop_idx] - approx._ndist_cumsum[start_idx]
+    assert ndist <= max(probe_ndist, approx._ndist_counts[start_idx])
+
+
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_scraamp_save_load(T_A, T_B, tmp_path):
+    m = 3
+    for k in range(1, 3):
+        ref_approx = scraamp(T_B, m, percentage=0.1, pre_scraamp=True, k=k)
+        ref_approx.update()
+
+        fname = tmp_path / f"scraamp_{k}.npz"
+        ref_approx.save(fname)
+        comp_approx = scraamp.load(fname)
+
+        for _ in range(3):
+            ref_approx.update()
+            comp_approx.update()
+
+        npt.assert_almost_equal(ref_approx.coverage_, comp_approx.coverage_)
+        npt.assert_almost_equal(ref_approx.P_, comp_approx.P_)
+        npt.assert_almost_equal(ref_approx.I_, comp_approx.I_)
+        npt.assert_almost_equal(ref_approx.left_I_, comp_approx.left_I_)
+        npt.assert_almost_equal(ref_approx.right_I_, comp_approx.right_I_)
+
+
+def test_scraamp_save_load_suffix_atomic(tmp_path):
+    m = 3
+    T = np.random.uniform(-1000, 1000, [64]).astype(np.float64)
+    ref_approx = scraamp(T, m, percentage=0.1, pre_scraamp=True)
+    ref_approx.update()
+
+    # The `.npz` extension is appended by both `save` and `load`
+    fname = tmp_path / "ckpt"
+    ref_approx.save(fname)
+    comp_approx = scraamp.load(fname)
+    npt.assert_almost_equal(ref_approx.P_, comp_approx.P_)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ckpt.npz"]
+
+    # An interrupted save leaves the existing checkpoint intact
+    coverage = ref_approx.coverage_
+    ref_approx.update()
+    with patch("numpy.savez", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            ref_approx.save(fname)
+    comp_approx = scraamp.load(fname)
+    npt.assert_almost_equal(comp_approx.coverage_, coverage)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ckpt.npz"]
+
+
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_scraamp_from_preprocessed(T_A, T_B):
+    m = 3
+    T = T_B.copy()
+    T[1] = np.nan
+    T_cumsums = core._preprocess_cumsum(T)
+    T_preprocessed = core._preprocess_non_normalized_from_cumsum(
+        T_cumsums[0], m, *T_cumsums[1:]
+    )
+    for p in [1.0, 2.0, 3.0]:
+        seed = np.random.randint(100000)
+
+        np.random.seed(seed)
+        ref_approx = scraamp(T, m, percentage=0.1, pre_scraamp=True, p=p)
+        ref_approx.update()
+
+        np.random.seed(seed)
+        comp_approx = scraamp._from_preprocessed(
+            m, T_preprocessed, percentage=0.1, pre_scraamp=True, p=p
+        )
+        comp_approx.update()
+
+        npt.assert_almost_equal(ref_approx.P_, comp_approx.P_)
+        npt.assert_almost_equal(ref_approx.I_, comp_approx.I_)
+        npt.assert_almost_equal(ref_approx.left_I_, comp_approx.left_I_)
+        npt.assert_almost_equal(ref_approx.right_I_, comp_approx.right_I_)
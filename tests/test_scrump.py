@@ -1,11 +1,13 @@
+import time
+
 import numpy as np
 import numpy.testing as npt
-from stumpy import scrump, stump, config
-from stumpy.scrump import prescrump
+from unittest.mock import patch
+from stumpy import core, scrump, stump, config
+from stumpy.scrump import prescrump, _get_mean_std_from_diagonal
 import pytest
 import naive
 
-
 test_data = [
     (
         np.array([9, 8100, -60, 7], dtype=np.float64),
@@ -980,3 +982,227 @@ def test_prescrump_self_join_KNN_no_overlap():
 
             npt.assert_almost_equal(ref_P, comp_P)
             npt.assert_almost_equal(ref_I, comp_I)
+
+
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_scrump_interleaved_updates_and_reads(T_A, T_B):
+    m = 3
+    k = 2
+    seed = np.random.randint(100000)
+
+    np.random.seed(seed)
+    ref_approx = scrump(T_B, m, ignore_trivial=True, percentage=0.1, k=k)
+    np.random.seed(seed)
+    comp_approx = scrump(T_B, m, ignore_trivial=True, percentage=0.1, k=k)
+
+    for _ in range(5):
+        ref_approx.update()
+    ref_P = ref_approx.P_
+    ref_I = ref_approx.I_
+    ref_left_I = ref_approx.left_I_
+    ref_right_I = ref_approx.right_I_
+
+    # Reading the matrix profile after every update must not change the result
+    for _ in range(5):
+        comp_approx.update()
+        comp_P = comp_approx.P_
+        comp_I = comp_approx.I_
+        comp_left_I = comp_approx.left_I_
+        comp_right_I = comp_approx.right_I_
+
+    naive.replace_inf(ref_P)
+    naive.replace_inf(comp_P)
+    npt.assert_almost_equal(ref_P, comp_P)
+    npt.assert_almost_equal(ref_I, comp_I)
+    npt.assert_almost_equal(ref_left_I, comp_left_I)
+    npt.assert_almost_equal(ref_right_I, comp_right_I)
+
+
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_scrump_time_budget(T_A, T_B):
+    m = 3
+    zone = int(np.ceil(m / 4))
+
+    ref_mp = naive.stump(T_B, m, exclusion_zone=zone, row_wise=True)
+    ref_P = ref_mp[:, 0]
+    ref_I = ref_mp[:, 1]
+    ref_left_I = ref_mp[:, 2]
+    ref_right_I = ref_mp[:, 3]
+
+    approx = scrump(T_B, m, ignore_trivial=True, percentage=0.1, pre_scrump=False)
+    approx.update(time_budget=0.0)
+    npt.assert_almost_equal(0.0, approx.coverage_)
+
+    # A regular update continues where the time budgeted updates left off
+    approx.update()
+    coverage = approx.coverage_
+    assert 0.0 < coverage <= 1.0
+
+    coverage = approx.run_until(time.time() + 3600.0)
+    npt.assert_almost_equal(1.0, coverage)
+    comp_P = approx.P_
+    comp_I = approx.I_
+    comp_left_I = approx.left_I_
+    comp_right_I = approx.right_I_
+    # The per-thread Pearson correlations are freed once they are no longer needed
+    assert approx._ρ is None
+
+    naive.replace_inf(ref_P)
+    naive.replace_inf(comp_P)
+
+    npt.assert_almost_equal(ref_P, comp_P)
+    npt.assert_almost_equal(ref_I, comp_I)
+    npt.assert_almost_equal(ref_left_I, comp_left_I)
+    npt.assert_almost_equal(ref_right_I, comp_right_I)
+
+
+def test_scrump_time_budget_probe(monkeypatch):
+    T = np.random.uniform(-1000, 1000, [256])
+    m = 3
+    probe_ndist = 100
+    monkeypatch.setattr("stumpy.config.STUMPY_TIME_BUDGET_PROBE_NDIST", probe_ndist)
+
+    approx = scrump(T, m, percentage=0.1, pre_scrump=False)
+    chunks = []
+    compute_diags = approx._compute_diags
+
+    def _compute_diags(start_idx, stop_idx):
+        chunks.append((start_idx, stop_idx))
+        compute_diags(start_idx, stop_idx)
+
+    monkeypatch.setattr(approx, "_compute_diags", _compute_diags)
+    coverage = approx.run_until(time.time() + 3600.0)
+    npt.assert_almost_equal(1.0, coverage)
+
+    # The throughput is probed with (at most) `probe_ndist` distances or, if it is
+    # longer, a single diagonal
+    start_idx, stop_idx = chunks[0]
+    ndist = approx._ndist_cumsum[stop_idx] - approx._ndist_cumsum[start_idx]
+    assert ndist <= max(probe_ndist, approx._ndist_counts[start_idx])
+
+
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_scrump_save_load(T_A, T_B, tmp_path):
+    m = 3
+    for k in range(1, 3):
+        ref_approx = scrump(T_B, m, percentage=0.1, pre_scrump=True, k=k)
+        ref_approx.update()
+
+        fname = tmp_path / f"scrump_{k}.npz"
+        ref_approx.save(fname)
+        comp_approx = scrump.load(fname)
+
+        for _ in range(3):
+            ref_approx.update()
+            comp_approx.update()
+
+        npt.assert_almost_equal(ref_approx.coverage_, comp_approx.coverage_)
+        npt.assert_almost_equal(ref_approx.P_, comp_approx.P_)
+        npt.assert_almost_equal(ref_approx.I_, comp_approx.I_)
+        npt.assert_almost_equal(ref_approx.left_I_, comp_approx.left_I_)
+        npt.assert_almost_equal(ref_approx.right_I_, comp_approx.right_I_)
+
+
+def test_scrump_save_load_suffix_atomic(tmp_path):
+    m = 3
+    T = np.random.uniform(-1000, 1000, [64]).astype(np.float64)
+    ref_approx = scrump(T, m, percentage=0.1, pre_scrump=True)
+    ref_approx.update()
+
+    # The `.npz` extension is appended by both `save` and `load`
+    fname = tmp_path / "ckpt"
+    ref_approx.save(fname)
+    comp_approx = scrump.load(fname)
+    npt.assert_almost_equal(ref_approx.P_, comp_approx.P_)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ckpt.npz"]
+
+    # An interrupted save leaves the existing checkpoint intact
+    coverage = ref_approx.coverage_
+    ref_approx.update()
+    with patch("numpy.savez", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            ref_approx.save(fname)
+    comp_approx = scrump.load(fname)
+    npt.assert_almost_equal(comp_approx.coverage_, coverage)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ckpt.npz"]
+
+
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_scrump_plus_plus_nan_inf(T_A, T_B):
+    m = 3
+    zone = int(np.ceil(m / 4))
+    T = T_B.copy()
+    T[1] = np.nan
+    T[-2] = np.inf
+
+    for s in range(1, zone + 1):
+        seed = np.random.randint(100000)
+
+        np.random.seed(seed)
+        ref_P, ref_I = naive.prescrump(T, m, T, s=s, exclusion_zone=zone)
+        ref_P_aux, ref_I_aux, _, _ = naive.scrump(T, m, T, 1.0, zone, True, s)
+        naive.merge_topk_PI(ref_P, ref_P_aux, ref_I, ref_I_aux)
+
+        np.random.seed(seed)
+        approx = scrump(T, m, ignore_trivial=True, percentage=1.0, pre_scrump=True, s=s)
+        approx.update()
+        comp_P = approx.P_
+        comp_I = approx.I_
+
+        naive.replace_inf(ref_P)
+        naive.replace_inf(comp_P)
+        npt.assert_almost_equal(ref_P, comp_P)
+        npt.assert_almost_equal(ref_I, comp_I)
+
+
+def test_get_mean_std_from_diagonal():
+    m = 3
+    T = np.random.uniform(-1000, 1000, [64])
+    T[1] = np.nan
+    T[-2] = np.inf
+    T[10:20] = 5.0  # Constant subsequences
+
+    _, ref_M_T, ref_Σ_T = core.preprocess(T, m)
+    (
+        _,
+        M_T,
+        Σ_T_inverse,
+        _,
+        T_subseq_isfinite,
+        T_subseq_isconstant,
+    ) = core.preprocess_diagonal(T, m)
+    comp_M_T, comp_Σ_T = _get_mean_std_from_diagonal(
+        M_T, Σ_T_inverse, T_subseq_isfinite, T_subseq_isconstant
+    )
+
+    npt.assert_almost_equal(ref_M_T, comp_M_T)
+    mask = T_subseq_isfinite
+    npt.assert_almost_equal(ref_Σ_T[mask], comp_Σ_T[mask])
+
+
+@pytest.mark.parametrize("T_A, T_B", test_data)
+def test_scrump_from_preprocessed(T_A, T_B):
+    m = 3
+    T = T_B.copy()
+    T[1] = np.nan
+    T_cumsums = core._preprocess_cumsum(T)
+    T_preprocessed = core._preprocess_diagonal_from_cumsum(
+        T_cumsums[0], m, *T_cumsums[1:]
+    )
+    for k in range(1, 3):
+        seed = np.random.randint(100000)
+
+        np.random.seed(seed)
+        ref_approx = scrump(T, m, percentage=0.1, pre_scrump=True, k=k)
+        ref_approx.update()
+
+        np.random.seed(seed)
+        comp_approx = scrump._from_preprocessed(
+            m, T_preprocessed, percentage=0.1, pre_scrump=True, k=k
+        )
+        comp_approx.update()
+
+        npt.assert_almost_equal(ref_approx.P_, comp_approx.P_)
+        npt.assert_almost_equal(ref_approx.I_, comp_approx.I_)
+        npt.assert_almost_equal(ref_approx.left_I_, comp_approx.left_I_)
+        npt.assert_almost_equal(ref_approx.right_I_, comp_approx.right_I_)
@@ -0,0 +1,114 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from stumpy import match, search_index
+
+import naive
+
+test_data = [
+    (
+        np.array([0.0, 1.0, 0.0]),
+        np.array([0.0, 1.0, 0.0, -1.0, -1.0, 0.0, 1.0, 0.0, -0.5]),
+    ),
+    (
+        np.array([0.0, 1.0, 2.0]),
+        np.array([0.1, 1.0, 2.0, 3.0, -1.0, 0.1, 1.0, 2.0, -0.5]),
+    ),
+    (np.random.uniform(-1000, 1000, [8]), np.random.uniform(-1000, 1000, [64])),
+]
+
+
+def naive_match(Q, T, excl_zone, max_distance, max_matches=None):
+    m = Q.shape[0]
+    D = naive.distance_profile(Q, T, m)
+
+    return naive.find_matches(D, excl_zone, max_distance, max_matches)
+
+
+@pytest.mark.parametrize("Q, T", test_data)
+def test_search_index_match(Q, T):
+    m = Q.shape[0]
+    excl_zone = int(np.ceil(m / 4))
+    index = search_index(T, m_range=[m, m + 1], n_segments=2)
+
+    for max_distance in [0.3, 3.0]:
+        ref = naive_match(Q, T, excl_zone, max_distance)
+        for early_abandon in [True, False, None]:
+            comp = index.match(
+                Q, max_distance=max_distance, early_abandon=early_abandon
+            )
+            npt.assert_almost_equal(ref, comp)
+
+
+def test_search_index_match_nan_constant():
+    m = 8
+    Q = np.random.uniform(-1000, 1000, [m])
+    T = np.random.uniform(-1000, 1000, [64])
+    T[1] = np.nan
+    T[-m:] = 1.0  # constant subsequences
+    index = search_index(T, m_range=m)
+
+    for max_distance in [0.3, 3.0]:
+        ref = match(Q, T, max_distance=max_distance)
+        for early_abandon in [True, False]:
+            comp = index.match(
+                Q, max_distance=max_distance, early_abandon=early_abandon
+            )
+            npt.assert_almost_equal(ref, comp)
+
+
+def test_search_index_match_callable_max_distance():
+    m = 8
+    Q = np.random.uniform(-1000, 1000, [m])
+    T = np.random.uniform(-1000, 1000, [64])
+    index = search_index(T, m_range=m)
+    max_distance = lambda D: 3.0  # noqa: E731
+
+    ref = match(Q, T, max_distance=max_distance)
+    for early_abandon in [False, None]:
+        comp = index.match(Q, max_distance=max_distance, early_abandon=early_abandon)
+        npt.assert_almost_equal(ref, comp)
+
+    with pytest.raises(ValueError):
+        index.match(Q, max_distance=max_distance, early_abandon=True)
+
+
+def test_search_index_match_query_idx_max_matches():
+    T = np.random.rand(64)
+    m = 8
+    query_idx = 5
+    Q = T[query_idx : query_idx + m]
+    index = search_index(T, m_range=range(5, 10))
+
+    ref = match(Q, T, max_distance=5.0, max_matches=3, query_idx=query_idx)
+    comp = index.match(Q, max_distance=5.0, max_matches=3, query_idx=query_idx)
+    # The self-match distance is the square root of the FFT round-off error
+    npt.assert_almost_equal(ref, comp, decimal=6)
+
+
+def test_search_index_invalid_window_size():
+    T = np.random.rand(64)
+    index = search_index(T, m_range=[5, 6])
+
+    with pytest.raises(ValueError):
+        index.match(np.random.rand(7))
+
+
+@pytest.mark.parametrize("mmap_mode", [None, "r"])
+def test_search_index_save_load(tmp_path, mmap_mode):
+    T = np.random.rand(64)
+    T[10] = np.nan
+    m = 8
+    Q = np.random.rand(m)
+    ref_index = search_index(T, m_range=[m, m + 2])
+    ref_index.save(tmp_path)
+
+    comp_index = search_index.load(tmp_path, mmap_mode=mmap_mode)
+    npt.assert_almost_equal(ref_index.T_, comp_index.T_)
+    npt.assert_almost_equal(ref_index.m_range_, comp_index.m_range_)
+
+    for early_abandon in [True, False]:
+        ref = ref_index.match(Q, max_distance=3.0, early_abandon=early_abandon)
+        comp = comp_index.match(Q, max_distance=3.0, early_abandon=early_abandon)
+        npt.assert_almost_equal(ref, comp)
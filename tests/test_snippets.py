@@ -1,12 +1,16 @@
 import numpy as np
 
 import numpy.testing as npt
+from unittest.mock import patch
 from stumpy import config, snippets
-from stumpy.snippets import _get_all_profiles
+from stumpy.snippets import (
+    _get_all_profiles,
+    _get_cached_all_profiles,
+    _PROFILES_CACHE,
+)
 import pytest
 import naive
 
-
 test_data = [np.random.uniform(-1000, 1000, [64]).astype(np.float64)]
 s = [6, 7, 8]
 percentage = [0.7, 0.8, 0.9]
@@ -160,3 +164,43 @@ def test_mpdist_snippets_s(T, m, k, s):
     )
     npt.assert_almost_equal(ref_areas, cmp_areas, decimal=config.STUMPY_TEST_PRECISION)
     npt.assert_almost_equal(ref_regimes, cmp_regimes)
+
+
+@pytest.mark.parametrize("T", test_data)
+def test_mpdist_snippets_cache(T):
+    m = 8
+    with patch("stumpy.config.STUMPY_SNIPPETS_CACHE_SIZE", 1):
+        for k in [3, 1, 2]:
+            ref = naive.mpdist_snippets(T, m, k)
+            comp = snippets(T, m, k)
+
+            for ref_array, comp_array in zip(ref, comp):
+                npt.assert_almost_equal(
+                    ref_array, comp_array, decimal=config.STUMPY_TEST_PRECISION
+                )
+
+
+def test_get_cached_all_profiles():
+    T = np.random.uniform(-1000, 1000, [64])
+    m = 8
+    ref = _get_all_profiles(T, m)
+    with patch.dict(_PROFILES_CACHE, clear=True):
+        with patch("stumpy.config.STUMPY_SNIPPETS_CACHE_SIZE", 0):
+            comp = _get_cached_all_profiles(T, m, T_input=T)
+            npt.assert_almost_equal(ref, comp)
+            assert len(_PROFILES_CACHE) == 0
+
+        with patch("stumpy.config.STUMPY_SNIPPETS_CACHE_SIZE", 2):
+            comp = _get_cached_all_profiles(T, m, T_input=T)
+            npt.assert_almost_equal(ref, comp)
+            # The profiles are looked up by the identity of the time series
+            assert _get_cached_all_profiles(T, m, T_input=T) is comp
+
+            T_copy = T.copy()
+            assert _get_cached_all_profiles(T_copy, m, T_input=T_copy) is not comp
+            assert len(_PROFILES_CACHE) == 2
+
+            # The profiles of a time series that no longer exists are evicted
+            del T_copy
+            assert _get_cached_all_profiles(T, m, T_input=T) is comp
+            assert len(_PROFILES_CACHE) == 1